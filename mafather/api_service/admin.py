@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import User, UserChild, Session, SearchLog
+from .models import User, UserChild, Session, SearchLog, UploadedImage
 
 
 @admin.register(User)
@@ -95,3 +95,27 @@ class SearchLogAdmin(admin.ModelAdmin):
         ('기술정보', {'fields': ('ip_address', 'user_agent')}),
         ('시스템정보', {'fields': ('id', 'created_at')}),
     )
+
+
+@admin.register(UploadedImage)
+class UploadedImageAdmin(admin.ModelAdmin):
+    """업로드 이미지 관리자"""
+
+    list_display = ['image_preview', 'user', 'content_type', 'width', 'height', 'status', 'created_at']
+    list_filter = ['status', 'content_type', 'created_at']
+    search_fields = ['original', 'sha256', 'user__email']
+    ordering = ['-created_at']
+    readonly_fields = ['id', 'sha256', 'size', 'width', 'height', 'variants', 'error', 'created_at', 'last_uploaded_at', 'processed_at']
+
+    fieldsets = (
+        (None, {'fields': ('user', 'original', 'sha256', 'content_type')}),
+        ('변환정보', {'fields': ('status', 'width', 'height', 'size', 'variants', 'error')}),
+        ('시스템정보', {'fields': ('id', 'created_at', 'last_uploaded_at', 'processed_at')}),
+    )
+
+    def image_preview(self, obj):
+        urls = obj.variant_urls()
+        if urls:
+            return format_html('<img src="{}" style="max-height: 50px;" />', urls[0]['webp'])
+        return "-"
+    image_preview.short_description = '이미지 미리보기'
@@ -0,0 +1,64 @@
+"""
+자녀 월령(만 개월 수)과 연령 그룹 계산
+
+만 개월 수는 생일의 월 단위 기념일이 지났는지로 센다 (days // 30 근사 대신).
+기념일 날짜가 그 달에 없으면 말일로 본다 (1월 31일생은 2월 말일에 1개월).
+
+기록 하나를 저장할 때는 순수 Python 함수를, 여러 행을 한 번에 계산할 때는 NumPy datetime64 배열
+함수를 쓴다. NumPy는 배열 함수를 처음 호출할 때 불러온다 (웹 요청 경로에서는 필요 없음).
+"""
+import bisect
+import calendar
+
+# (이 개월 수 미만, 연령 그룹) - vectordb 모델의 AGE_GROUP_CHOICES와 같은 값
+AGE_GROUP_BOUNDS = (
+    (3, '0-3months'),
+    (6, '3-6months'),
+    (9, '6-9months'),
+    (12, '9-12months'),
+    (18, '12-18months'),
+    (24, '18-24months'),
+    (36, '24-36months'),
+    (48, '36-48months'),
+    (60, '48-60months'),
+)
+OLDEST_AGE_GROUP = '60months+'
+AGE_GROUPS = tuple(group for _, group in AGE_GROUP_BOUNDS) + (OLDEST_AGE_GROUP,)
+_UPPER_MONTHS = tuple(months for months, _ in AGE_GROUP_BOUNDS)
+
+
+def age_in_months(birth_date, on_date):
+    """on_date 기준 만 개월 수 (출생 전이면 음수)"""
+    months = (on_date.year - birth_date.year) * 12 + on_date.month - birth_date.month
+    days_in_month = calendar.monthrange(on_date.year, on_date.month)[1]
+    if on_date.day < min(birth_date.day, days_in_month):
+        months -= 1
+    return months
+
+
+def age_group(months):
+    """만 개월 수 → 연령 그룹 (출생 전 기록은 첫 그룹)"""
+    return AGE_GROUPS[bisect.bisect_right(_UPPER_MONTHS, months)]
+
+
+def age_in_months_array(birth_dates, on_dates):
+    """age_in_months의 배열 버전 (datetime64[D]로 바꿀 수 있는 값의 배열, 결과는 int64 배열)"""
+    import numpy as np
+
+    birth = np.asarray(birth_dates, dtype='datetime64[D]')
+    on = np.asarray(on_dates, dtype='datetime64[D]')
+    birth_month = birth.astype('datetime64[M]')
+    on_month = on.astype('datetime64[M]')
+    birth_day = (birth - birth_month).astype(np.int64) + 1
+    on_day = (on - on_month).astype(np.int64) + 1
+    days_in_month = ((on_month + 1).astype('datetime64[D]') - on_month).astype(np.int64)
+    months = (on_month - birth_month).astype(np.int64)
+    return months - (on_day < np.minimum(birth_day, days_in_month))
+
+
+def age_groups_array(months):
+    """age_group의 배열 버전 (연령 그룹 문자열 배열)"""
+    import numpy as np
+
+    index = np.searchsorted(np.asarray(_UPPER_MONTHS), np.asarray(months), side='right')
+    return np.asarray(AGE_GROUPS, dtype=object)[index]
@@ -0,0 +1,311 @@
+# api_service/images.py
+"""
+이미지 업로드 / 변환 파이프라인
+
+업로드 요청은 원본을 MEDIA_ROOT에 저장하고 UploadedImage(status=pending)만 만든 뒤 바로 응답한다.
+트랜잭션이 커밋되면 변환 작업을 프로세스 풀(IMAGE_PROCESS_WORKERS)에 넘기고, 워커는 원본을 한 번만
+디코딩해서 IMAGE_VARIANT_WIDTHS 너비별 WebP/JPEG 변환본을 만든다.
+
+- JPEG는 Pillow draft 모드로 디코딩 단계에서 1/2~1/8 크기로 줄여 읽는다 (가장 큰 변환본보다 작아지지 않는 범위).
+- 큰 너비부터 차례로 줄여 가며 저장해서 리사이즈 비용도 줄인다.
+- render_variants는 Django 모델에 의존하지 않는 함수라 spawn으로 만든 워커 프로세스에서도 그대로 실행된다.
+
+원본은 내용 해시(sha256) 경로에 한 번만 저장한다. 행은 업로드한 사용자별로 만들고, 다른 사용자가 같은 사진을
+올리면 새 행이 기존 원본 파일을 가리키며 변환도 다시 하지 않는다(먼저 변환된 행의 결과를 복사).
+참조하는 게시글/발달 기록 이미지가 모두 삭제된 행은 collect_orphan_images로 정리하고, 파일은 가리키는 행이
+하나도 남지 않았을 때 지운다.
+"""
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_FORMATS = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'WEBP': 'image/webp',
+    'GIF': 'image/gif',
+}
+
+EXIF_ORIENTATION = 0x0112
+# 90도 회전이 들어가는 EXIF 방향 값 (가로/세로가 바뀜)
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+WEBP_OPTIONS = {'quality': 80, 'method': 4}
+JPEG_OPTIONS = {'quality': 82, 'optimize': True, 'progressive': True}
+
+
+class ImageValidationError(ValueError):
+    """업로드할 수 없는 이미지"""
+
+
+def inspect_upload(file):
+    """
+    헤더만 읽어서 형식과 크기를 확인 (픽셀 디코딩 없음)
+
+    반환값: (MIME 타입, 너비, 높이). 허용하지 않는 파일이면 ImageValidationError
+    """
+    if file.size > settings.IMAGE_UPLOAD_MAX_BYTES:
+        raise ImageValidationError('이미지 파일이 너무 큽니다.')
+    try:
+        with Image.open(file) as img:
+            image_format, (width, height) = img.format, img.size
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ImageValidationError('이미지 파일이 아닙니다.') from e
+    finally:
+        file.seek(0)
+    if image_format not in ALLOWED_FORMATS:
+        raise ImageValidationError('지원하지 않는 이미지 형식입니다.')
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ImageValidationError('이미지 해상도가 너무 큽니다.')
+    return ALLOWED_FORMATS[image_format], width, height
+
+
+def content_hash(file):
+    """업로드 파일의 sha256 (청크 단위로 읽어서 파일 전체를 메모리에 올리지 않음)"""
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def _to_rgb(img):
+    """투명 배경은 흰색으로 채워서 RGB로 변환"""
+    if img.mode == 'RGB':
+        return img
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return img.convert('RGB')
+
+
+def render_variants(source_path, output_dir, widths):
+    """
+    원본 한 장으로 너비별 WebP/JPEG 변환본 생성 (워커 프로세스에서 실행)
+
+    원본보다 큰 너비는 원본 너비로 맞추고(확대하지 않음), 파일은 output_dir/<너비>.webp|jpg로 저장한다.
+    반환값: {'width', 'height', 'variants': [{'width', 'height', 'webp', 'jpeg'}, ...]} (파일 이름 기준)
+    """
+    with Image.open(source_path) as img:
+        orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        stored_width, stored_height = img.size
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            display_width, display_height = stored_height, stored_width
+        else:
+            display_width, display_height = stored_width, stored_height
+
+        targets = sorted({min(width, display_width) for width in widths}, reverse=True)
+        if img.format == 'JPEG':
+            # 가장 큰 변환본보다 작아지지 않는 범위에서 DCT 스케일링으로 축소 디코딩
+            scale = targets[0] / display_width
+            img.draft('RGB', (math.ceil(stored_width * scale), math.ceil(stored_height * scale)))
+        current = _to_rgb(ImageOps.exif_transpose(img))
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = []
+    for width in targets:
+        height = max(1, round(display_height * width / display_width))
+        if current.size != (width, height):
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        webp_name = f'{width}.webp'
+        jpeg_name = f'{width}.jpg'
+        current.save(os.path.join(output_dir, webp_name), 'WEBP', **WEBP_OPTIONS)
+        current.save(os.path.join(output_dir, jpeg_name), 'JPEG', **JPEG_OPTIONS)
+        variants.append({'width': width, 'height': height, 'webp': webp_name, 'jpeg': jpeg_name})
+
+    variants.reverse()
+    return {'width': display_width, 'height': display_height, 'variants': variants}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # fork는 요청 처리 스레드와 DB 연결까지 복제하므로 spawn으로 깨끗한 워커를 띄움
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _apply_result(image_id, variant_dir, result=None, error=None):
+    from .models import UploadedImage
+
+    if error is not None:
+        UploadedImage.objects.filter(id=image_id).update(status='failed', error=error[:2000])
+        return
+    variants = [
+        {
+            'width': variant['width'],
+            'height': variant['height'],
+            'webp': f"{variant_dir}/{variant['webp']}",
+            'jpeg': f"{variant_dir}/{variant['jpeg']}",
+        }
+        for variant in result['variants']
+    ]
+    UploadedImage.objects.filter(id=image_id).update(
+        status='ready',
+        width=result['width'],
+        height=result['height'],
+        variants=variants,
+        error='',
+        processed_at=timezone.now(),
+    )
+
+
+def _on_done(image_id, variant_dir, future):
+    # 프로세스 풀의 결과 처리 스레드에서 실행됨 (요청과 무관한 DB 연결을 씀)
+    try:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.exception('이미지 변환 실패: %s', image_id)
+            _apply_result(image_id, variant_dir, error=repr(e))
+        else:
+            _apply_result(image_id, variant_dir, result)
+    except Exception:
+        logger.exception('이미지 변환 결과 저장 실패: %s', image_id)
+    finally:
+        close_old_connections()
+
+
+def _copy_shared_result(image):
+    """같은 원본을 가리키는 다른 행이 이미 변환됐으면 그 결과를 복사 (복사했으면 True)"""
+    from .models import UploadedImage
+
+    if not image.sha256:
+        return False
+    done = UploadedImage.objects.filter(sha256=image.sha256, status='ready').exclude(id=image.id)
+    result = done.values('width', 'height', 'variants').first()
+    if result is None:
+        return False
+    UploadedImage.objects.filter(id=image.id).update(status='ready', error='', processed_at=timezone.now(), **result)
+    return True
+
+
+def process_image(image, inline=None):
+    """UploadedImage 변환 실행 (inline이거나 IMAGE_PROCESS_WORKERS가 0이면 현재 스레드에서, 아니면 프로세스 풀에서)"""
+    if _copy_shared_result(image):
+        return
+    storage = image.original.storage
+    args = (storage.path(image.original.name), storage.path(image.variant_dir), settings.IMAGE_VARIANT_WIDTHS)
+    if inline is None:
+        inline = settings.IMAGE_PROCESS_WORKERS <= 0
+    if inline:
+        try:
+            result = render_variants(*args)
+        except Exception as e:
+            logger.exception('이미지 변환 실패: %s', image.id)
+            _apply_result(image.id, image.variant_dir, error=repr(e))
+        else:
+            _apply_result(image.id, image.variant_dir, result)
+        return
+    try:
+        future = _get_executor().submit(render_variants, *args)
+    except BrokenExecutor:
+        # 워커가 비정상 종료된 풀은 다시 쓸 수 없으므로 다음 작업부터 새 풀을 만듦
+        logger.exception('이미지 변환 프로세스 풀 재시작')
+        _reset_executor()
+        future = _get_executor().submit(render_variants, *args)
+    future.add_done_callback(partial(_on_done, image.id, image.variant_dir))
+
+
+def schedule_processing(image):
+    """트랜잭션 커밋 후 변환 작업 등록"""
+    transaction.on_commit(lambda: process_image(image))
+
+
+def _live_references():
+    """삭제되지 않은 게시글/발달 기록에 붙어 있는 이미지 참조 조건"""
+    PostImage = apps.get_model('community_api_service', 'PostImage')
+    DevelopmentRecordImage = apps.get_model('vectordb', 'DevelopmentRecordImage')
+    post_refs = PostImage.objects.filter(
+        image=OuterRef('pk'), deleted_at__isnull=True, post__deleted_at__isnull=True
+    )
+    record_refs = DevelopmentRecordImage.objects.filter(
+        image=OuterRef('pk'), deleted_at__isnull=True, record__deleted_at__isnull=True
+    )
+    return Exists(post_refs) | Exists(record_refs)
+
+
+def _delete_files(image):
+    """삭제한 행의 파일 정리 (다른 사용자의 행이 같은 원본/변환본을 가리키면 남겨 둠)"""
+    from .models import UploadedImage
+
+    storage = image.original.storage
+    names = []
+    if not UploadedImage.objects.filter(original=image.original.name).exists():
+        names.append(image.original.name)
+    if image.sha256 and UploadedImage.objects.filter(sha256=image.sha256).exists():
+        variants = []
+    else:
+        variants = image.variants
+    for variant in variants:
+        names.extend((variant['webp'], variant['jpeg']))
+    for name in names:
+        if name:
+            storage.delete(name)
+    try:
+        os.rmdir(storage.path(image.variant_dir))
+    except OSError:
+        pass
+
+
+def collect_orphan_images(grace_hours=24, dry_run=False):
+    """
+    참조하는 행이 모두 (소프트) 삭제된 이미지의 파일과 행 삭제
+
+    업로드 직후 아직 게시글에 붙지 않은 이미지는 grace_hours 동안 남겨 둔다.
+    반환값: 삭제한(dry_run이면 삭제할) 이미지 수
+    """
+    from .models import UploadedImage
+
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    orphans = UploadedImage.objects.filter(last_uploaded_at__lt=cutoff).exclude(_live_references())
+    count = 0
+    for image in orphans.iterator():
+        count += 1
+        if dry_run:
+            continue
+        with transaction.atomic():
+            # 삭제 직전에 다시 확인 (그 사이 같은 사진이 다시 올라오거나 첨부된 경우)
+            locked = UploadedImage.objects.select_for_update().filter(id=image.id, last_uploaded_at__lt=cutoff)
+            if not locked.exclude(_live_references()).exists():
+                count -= 1
+                continue
+            locked.delete()
+            # 같은 원본을 가리키는 행 확인과 파일 삭제도 잠금을 쥔 채로 (업로드가 이 행을 갱신하려면 기다림)
+            _delete_files(image)
+    return count
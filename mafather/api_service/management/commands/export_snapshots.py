@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api_service.snapshots import TABLES, export_all, export_root
+
+
+class Command(BaseCommand):
+    help = '워터마크 이후 바뀐 행을 분석용 컬럼 파일(.npz, 일 단위 파티션)로 내보냅니다. 매일 밤 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tables', nargs='*', help=f"내보낼 테이블 (기본: 전부 - {', '.join(TABLES)})")
+
+    def handle(self, *args, **options):
+        unknown = set(options['tables']) - set(TABLES)
+        if unknown:
+            raise CommandError(f"알 수 없는 테이블: {', '.join(sorted(unknown))}")
+        for table, count in export_all(options['tables']).items():
+            self.stdout.write(f'{table}: {count}행')
+        self.stdout.write(self.style.SUCCESS(f'내보내기 완료: {export_root()}'))
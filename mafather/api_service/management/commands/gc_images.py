@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api_service.images import collect_orphan_images
+
+
+class Command(BaseCommand):
+    help = '참조하는 게시글/발달 기록 이미지가 모두 삭제된 업로드 이미지(원본, 변환본)를 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help='마지막 업로드 후 이 시간이 지나지 않은 이미지는 남겨 둠 (첨부 전 이미지 보호)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상 수만 출력')
+
+    def handle(self, *args, **options):
+        count = collect_orphan_images(options['grace_hours'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'정리 대상 이미지 {count}건')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'이미지 {count}건 정리 완료'))
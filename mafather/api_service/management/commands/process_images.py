@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api_service.images import process_image
+from api_service.models import UploadedImage
+
+
+class Command(BaseCommand):
+    help = '변환되지 않은(대기 중이거나 실패한) 업로드 이미지의 변환본을 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=10,
+            help='이 시간(분)보다 오래 대기 중인 이미지만 처리 (워커 재시작 등으로 유실된 작업)',
+        )
+        parser.add_argument('--include-failed', action='store_true', help='변환에 실패한 이미지도 다시 처리')
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['include_failed'] else ['pending']
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        images = UploadedImage.objects.filter(status__in=statuses, created_at__lt=cutoff).order_by('created_at')
+
+        processed = 0
+        for image in images.iterator():
+            process_image(image, inline=True)
+            processed += 1
+
+        failed = UploadedImage.objects.filter(status='failed', created_at__lt=cutoff).count()
+        self.stdout.write(self.style.SUCCESS(f'이미지 변환 {processed}건 처리 (실패 상태 {failed}건)'))
@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api_service.snapshots import TABLES, rollup
+
+
+class Command(BaseCommand):
+    help = '내보낸 분석 스냅샷 파일로 집계합니다 (운영 DB를 읽지 않음). 예) query_snapshots chat_messages --by role --sum tokens'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=list(TABLES))
+        parser.add_argument('--by', default='day', help="묶을 컬럼 (기본: day - 생성일)")
+        parser.add_argument('--sum', dest='value', help='합계를 낼 컬럼 (생략하면 행 수)')
+        parser.add_argument('--start', type=datetime.date.fromisoformat, help='시작 생성일 (YYYY-MM-DD)')
+        parser.add_argument('--end', type=datetime.date.fromisoformat, help='끝 생성일 (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        columns = {column for column, _, _ in TABLES[options['table']]['columns']}
+        for column in (options['by'], options['value']):
+            if column and column != 'day' and column not in columns:
+                raise CommandError(f'알 수 없는 컬럼: {column}')
+        result = rollup(options['table'], options['by'], value=options['value'],
+                        start=options['start'], end=options['end'])
+        for key, total in result.items():
+            self.stdout.write(f'{key}\t{total}')
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:26
+
+import api_service.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_service', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadedImage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('original', models.FileField(max_length=255, upload_to=api_service.models.original_image_path, verbose_name='원본 파일')),
+                ('content_type', models.CharField(max_length=50, verbose_name='MIME 타입')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='파일 크기')),
+                ('width', models.PositiveIntegerField(default=0, verbose_name='너비')),
+                ('height', models.PositiveIntegerField(default=0, verbose_name='높이')),
+                ('status', models.CharField(choices=[('pending', '변환 대기'), ('ready', '변환 완료'), ('failed', '변환 실패')], default='pending', max_length=20, verbose_name='변환 상태')),
+                ('variants', models.JSONField(blank=True, default=list, verbose_name='변환본')),
+                ('error', models.TextField(blank=True, default='', verbose_name='변환 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='변환 완료 시간')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_images', to=settings.AUTH_USER_MODEL, verbose_name='업로드한 사용자')),
+            ],
+            options={
+                'verbose_name': '업로드 이미지',
+                'verbose_name_plural': '업로드 이미지들',
+                'db_table': 'uploaded_images',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='uploaded_im_status_463d5a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_service', '0002_uploaded_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedimage',
+            name='last_uploaded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='마지막 업로드 시간'),
+        ),
+        migrations.AddField(
+            model_name='uploadedimage',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True, verbose_name='내용 해시'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-19 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_service', '0003_uploaded_image_sha256'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadedimage',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='내용 해시'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedimage',
+            index=models.Index(fields=['sha256'], name='uploaded_im_sha256_75c0cf_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='uploadedimage',
+            constraint=models.UniqueConstraint(fields=('user', 'sha256'), name='uploaded_images_user_sha256_uniq'),
+        ),
+    ]
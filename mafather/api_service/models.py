@@ -1,7 +1,9 @@
+import os
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.utils import timezone
+from . import age
 
 
 class CustomUserManager(BaseUserManager):
@@ -118,9 +120,7 @@ class UserChild(models.Model):
     @property
     def age_months(self):
         """개월 수 계산"""
-        today = timezone.now().date()
-        age_days = (today - self.birth_date).days
-        return age_days // 30  # 대략적인 개월 수
+        return age.age_in_months(self.birth_date, timezone.localdate())  # 만 개월 수
 
 
 class Session(models.Model):
@@ -183,3 +183,79 @@ class SearchLog(models.Model):
 
     def __str__(self):
         return f"{self.query} ({self.search_type})"
+
+
+def original_image_path(instance, filename):
+    """원본 이미지 저장 경로 (내용 해시 기준 images/blobs/ab/<sha256>.<확장자>)"""
+    ext = os.path.splitext(filename)[1].lower() or '.jpg'
+    if instance.sha256:
+        return f'images/blobs/{instance.sha256[:2]}/{instance.sha256}{ext}'
+    now = timezone.now()
+    return f'images/original/{now:%Y/%m}/{instance.id}{ext}'
+
+
+class UploadedImage(models.Model):
+    """
+    업로드된 원본 이미지와 변환본(WebP/JPEG, 고정 너비) 정보
+
+    행은 업로드한 사용자별로 하나씩 만들고(사용자, 내용 해시로 유일), 원본 파일과 변환본은
+    내용 해시(sha256)별로 한 번만 저장해서 같은 사진을 올린 사용자들의 행이 함께 가리킨다.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', '변환 대기'),
+        ('ready', '변환 완료'),
+        ('failed', '변환 실패'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name='uploaded_images', verbose_name='업로드한 사용자')
+    original = models.FileField(upload_to=original_image_path, max_length=255, verbose_name='원본 파일')
+    sha256 = models.CharField(max_length=64, blank=True, null=True, verbose_name='내용 해시')
+    content_type = models.CharField(max_length=50, verbose_name='MIME 타입')
+    size = models.PositiveIntegerField(default=0, verbose_name='파일 크기')
+    width = models.PositiveIntegerField(default=0, verbose_name='너비')
+    height = models.PositiveIntegerField(default=0, verbose_name='높이')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='변환 상태')
+    # [{"width": 320, "height": 240, "webp": "<저장소 경로>", "jpeg": "<저장소 경로>"}, ...] (너비 오름차순)
+    variants = models.JSONField(default=list, blank=True, verbose_name='변환본')
+    error = models.TextField(blank=True, default='', verbose_name='변환 오류')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')
+    # 같은 내용이 다시 업로드된 시간 (고아 정리 유예 기준)
+    last_uploaded_at = models.DateTimeField(default=timezone.now, verbose_name='마지막 업로드 시간')
+    processed_at = models.DateTimeField(blank=True, null=True, verbose_name='변환 완료 시간')
+
+    class Meta:
+        db_table = 'uploaded_images'
+        verbose_name = '업로드 이미지'
+        verbose_name_plural = '업로드 이미지들'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['sha256']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'sha256'], name='uploaded_images_user_sha256_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.original.name} ({self.status})"
+
+    @property
+    def variant_dir(self):
+        """변환본 저장 경로"""
+        if self.sha256:
+            return f'images/variants/{self.sha256[:2]}/{self.sha256}'
+        return f'images/variants/{self.id}'
+
+    def variant_urls(self):
+        """변환본 URL 목록 (변환 전이면 빈 목록)"""
+        storage = self.original.storage
+        return [
+            {
+                'width': variant['width'],
+                'height': variant['height'],
+                'webp': storage.url(variant['webp']),
+                'jpeg': storage.url(variant['jpeg']),
+            }
+            for variant in self.variants
+        ]
@@ -1,7 +1,19 @@
 from rest_framework import serializers
-from .models import User
+from .models import User, UploadedImage
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'name', 'email'] 
\ No newline at end of file
+        fields = ['id', 'name', 'email']
+
+class UploadedImageSerializer(serializers.ModelSerializer):
+    original = serializers.FileField(read_only=True, use_url=True)
+    variants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadedImage
+        fields = ['id', 'status', 'original', 'content_type', 'size', 'width', 'height', 'variants', 'created_at']
+        read_only_fields = fields
+
+    def get_variants(self, obj):
+        return obj.variant_urls()
@@ -0,0 +1,302 @@
+"""
+분석용 컬럼 스냅샷 내보내기 / 조회
+
+분석 쿼리가 운영 DB와 경쟁하지 않도록, 매일 밤 바뀐 행만 읽어서(워터마크 이후) 타입이 있는
+컬럼 파일로 내보낸다 (manage.py export_snapshots). 분석은 파일만 읽는다 (load / rollup, manage.py query_snapshots).
+
+저장 형식
+    <ANALYTICS_EXPORT_ROOT>/<테이블>/day=YYYY-MM-DD/part-<실행 시각>-<번호>.npz
+    - 컬럼마다 NumPy 배열 하나 (np.savez_compressed). UUID는 32자 hex bytes, 시간은 datetime64[us] (UTC),
+      선택지 필드는 int16 코드 (모델 choices 순서, 알 수 없는 값/NULL은 -1)
+    - 파티션은 생성일(UTC) 기준이라 같은 행이 수정되어 다시 내보내져도 같은 날짜 디렉터리에 쌓이고,
+      load()가 id별로 워터마크가 가장 늦은 버전만 남긴다.
+    - 본문 텍스트는 내보내지 않고 길이만 내보낸다.
+
+워터마크는 <ANALYTICS_EXPORT_ROOT>/_watermarks.json에 테이블별로 저장한다. 진행 중인 트랜잭션이
+나중에 커밋되면서 예전 시간의 행이 생길 수 있으므로 (현재 - ANALYTICS_EXPORT_LAG_SECONDS)까지만 내보낸다.
+파일을 다 쓴 뒤 워터마크를 저장하므로 중간에 실패하면 다음 실행에서 다시 내보내고 중복은 load()에서 정리된다.
+
+좋아요는 삭제가 물리 삭제라서 생성 이벤트만 남고, 게시글의 좋아요 수는 updated_at을 바꾸지 않아서
+게시글 스냅샷의 카운터는 마지막으로 내보낸 시점 값이다.
+"""
+import datetime
+import io
+import json
+import os
+import tempfile
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Length
+from django.utils import timezone
+
+WATERMARK_FILE = '_watermarks.json'
+
+# 테이블별 내보내기 정의: (컬럼 이름, 종류, 식) - 식이 없으면 모델 필드
+TABLES = {
+    'posts': {
+        'model': 'community_api_service.Post',
+        'watermark': 'updated_at',
+        'columns': (
+            ('id', 'uuid', None),
+            ('user_id', 'uuid', None),
+            ('category_id', 'uuid', None),
+            ('post_type', 'choice', None),
+            ('status', 'choice', None),
+            ('is_anonymous', 'bool', None),
+            ('is_solved', 'bool', None),
+            ('view_count', 'int', None),
+            ('like_count', 'int', None),
+            ('comment_count', 'int', None),
+            ('content_length', 'int', Length('content')),
+            ('deleted', 'bool', ExpressionWrapper(Q(deleted_at__isnull=False), output_field=BooleanField())),
+            ('created_at', 'datetime', None),
+            ('updated_at', 'datetime', None),
+        ),
+    },
+    'likes': {
+        'model': 'community_api_service.Like',
+        'watermark': 'created_at',
+        'columns': (
+            ('id', 'uuid', None),
+            ('user_id', 'uuid', None),
+            ('target_id', 'uuid', None),
+            ('target_type', 'choice', None),
+            ('created_at', 'datetime', None),
+        ),
+    },
+    'chat_messages': {
+        'model': 'chatbot.ChatMessage',
+        'watermark': 'created_at',
+        'columns': (
+            ('id', 'uuid', None),
+            ('session_id', 'uuid', None),
+            ('role', 'choice', None),
+            ('tokens', 'int', None),
+            ('content_length', 'int', Length('content')),
+            ('created_at', 'datetime', None),
+        ),
+    },
+    'development_records': {
+        'model': 'vectordb.DevelopmentRecord',
+        'watermark': 'updated_at',
+        'columns': (
+            ('id', 'uuid', None),
+            ('user_id', 'uuid', None),
+            ('child_id', 'uuid', None),
+            ('date', 'date', None),
+            ('age_group', 'choice', None),
+            ('development_area', 'choice', None),
+            ('record_type', 'choice', None),
+            ('deleted', 'bool', ExpressionWrapper(Q(deleted_at__isnull=False), output_field=BooleanField())),
+            ('created_at', 'datetime', None),
+            ('updated_at', 'datetime', None),
+        ),
+    },
+}
+
+_DTYPES = {
+    'uuid': 'S32',
+    'bool': 'bool',
+    'int': 'int64',
+    'choice': 'int16',
+    'date': 'datetime64[D]',
+    'datetime': 'datetime64[us]',
+}
+
+
+def export_root():
+    return settings.ANALYTICS_EXPORT_ROOT
+
+
+def _model(table):
+    return apps.get_model(TABLES[table]['model'])
+
+
+def categories(table, column):
+    """선택지 컬럼의 코드 → 값 목록 (코드는 이 목록의 위치)"""
+    return [value for value, _ in _model(table)._meta.get_field(column).choices]
+
+
+def read_watermarks(root=None):
+    path = os.path.join(root or export_root(), WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return {table: datetime.datetime.fromisoformat(value) for table, value in json.load(f).items()}
+
+
+def _write_watermarks(watermarks, root):
+    _atomic_write(
+        os.path.join(root, WATERMARK_FILE),
+        json.dumps({table: value.isoformat() for table, value in watermarks.items()}, indent=2).encode(),
+    )
+
+
+def _atomic_write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _to_utc(value):
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None) if value is not None else None
+
+
+def _converter(table, column, kind):
+    if kind == 'uuid':
+        return lambda value: value.hex.encode() if value is not None else b''
+    if kind == 'choice':
+        codes = {value: code for code, value in enumerate(categories(table, column))}
+        return lambda value: codes.get(value, -1)
+    if kind == 'datetime':
+        return _to_utc
+    return None
+
+
+def _columns_to_arrays(table, rows):
+    import numpy as np
+
+    arrays = {}
+    for index, (column, kind, _) in enumerate(TABLES[table]['columns']):
+        convert = _converter(table, column, kind)
+        values = [row[index] for row in rows]
+        if convert is not None:
+            values = [convert(value) for value in values]
+        arrays[column] = np.asarray(values, dtype=_DTYPES[kind])
+    return arrays
+
+
+def _write_part(table, day, rows, run_id, seq, root):
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **_columns_to_arrays(table, rows))
+    path = os.path.join(root, table, f'day={day.isoformat()}', f'part-{run_id}-{seq:04d}.npz')
+    _atomic_write(path, buffer.getvalue())
+    return path
+
+
+def export_table(table, until=None, root=None):
+    """워터마크 이후 바뀐 행을 내보내고 (내보낸 행 수, 새 워터마크) 반환"""
+    root = root or export_root()
+    spec = TABLES[table]
+    watermark_field = spec['watermark']
+    if until is None:
+        until = timezone.now() - datetime.timedelta(seconds=settings.ANALYTICS_EXPORT_LAG_SECONDS)
+    since = read_watermarks(root).get(table)
+
+    rows = _model(table).objects.filter(**{f'{watermark_field}__lte': until})
+    if since is not None:
+        rows = rows.filter(**{f'{watermark_field}__gt': since})
+    expressions = {column: expression for column, _, expression in spec['columns'] if expression is not None}
+    names = [column for column, _, _ in spec['columns']]
+    rows = rows.annotate(**expressions).order_by(watermark_field).values_list(*names)
+
+    run_id = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+    created_index = names.index('created_at')
+    max_rows = settings.ANALYTICS_EXPORT_ROWS_PER_FILE
+    buffers = defaultdict(list)
+    seq = 0
+    exported = 0
+    for row in rows.iterator(chunk_size=5000):
+        day = _to_utc(row[created_index]).date()
+        buffers[day].append(row)
+        if len(buffers[day]) >= max_rows:
+            _write_part(table, day, buffers.pop(day), run_id, seq, root)
+            seq += 1
+        exported += 1
+    for day, day_rows in sorted(buffers.items()):
+        _write_part(table, day, day_rows, run_id, seq, root)
+        seq += 1
+
+    watermarks = read_watermarks(root)
+    watermarks[table] = until
+    _write_watermarks(watermarks, root)
+    return exported, until
+
+
+def export_all(tables=None, root=None):
+    """모든(또는 지정한) 테이블 내보내기 → {테이블: 내보낸 행 수}"""
+    until = timezone.now() - datetime.timedelta(seconds=settings.ANALYTICS_EXPORT_LAG_SECONDS)
+    return {table: export_table(table, until=until, root=root)[0] for table in tables or TABLES}
+
+
+def _partition_days(table, root):
+    directory = os.path.join(root, table)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        datetime.date.fromisoformat(name[len('day='):]) for name in os.listdir(directory) if name.startswith('day=')
+    )
+
+
+def load(table, start=None, end=None, root=None):
+    """
+    [start, end] 생성일 파티션의 컬럼 배열 dict (id별 최신 버전만)
+
+    start/end는 date (생략하면 처음/끝까지)
+    """
+    import numpy as np
+
+    root = root or export_root()
+    parts = []
+    for day in _partition_days(table, root):
+        if (start and day < start) or (end and day > end):
+            continue
+        directory = os.path.join(root, table, f'day={day.isoformat()}')
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.npz'):
+                with np.load(os.path.join(directory, name)) as data:
+                    parts.append({column: data[column] for column in data.files})
+
+    columns = [column for column, _, _ in TABLES[table]['columns']]
+    if not parts:
+        return {column: np.array([], dtype=_DTYPES[kind]) for column, kind, _ in TABLES[table]['columns']}
+    data = {column: np.concatenate([part[column] for part in parts]) for column in columns}
+
+    # 같은 행의 여러 버전 중 워터마크가 가장 늦은 것만 (id, 워터마크 순 정렬 후 id별 마지막)
+    order = np.lexsort((data[TABLES[table]['watermark']], data['id']))
+    ids = data['id'][order]
+    last = np.ones(len(ids), dtype=bool)
+    last[:-1] = ids[:-1] != ids[1:]
+    keep = order[last]
+    return {column: values[keep] for column, values in data.items()}
+
+
+def rollup(table, by, value=None, start=None, end=None, root=None):
+    """
+    by 컬럼별 행 수 (value를 주면 그 컬럼의 합계) → {키: 값}
+
+    by는 'day'(생성일, UTC), 선택지 컬럼(값으로 바꿔서), 그 밖의 컬럼
+    예) rollup('chat_messages', 'role', value='tokens'), rollup('posts', 'day')
+    """
+    import numpy as np
+
+    data = load(table, start=start, end=end, root=root)
+    kinds = {column: kind for column, kind, _ in TABLES[table]['columns']}
+    keys = data['created_at'].astype('datetime64[D]') if by == 'day' else data[by]
+    if not len(keys):
+        return {}
+    unique, inverse = np.unique(keys, return_inverse=True)
+    weights = data[value].astype(np.float64) if value else None
+    totals = np.bincount(inverse, weights=weights, minlength=len(unique))
+
+    if by == 'day':
+        labels = [key.item() for key in unique]
+    elif kinds.get(by) == 'choice':
+        names = categories(table, by)
+        labels = [names[key] if 0 <= key < len(names) else None for key in unique.tolist()]
+    elif kinds.get(by) == 'uuid':
+        labels = [key.decode() for key in unique.tolist()]
+    else:
+        labels = unique.tolist()
+    return {label: int(total) for label, total in zip(labels, totals)}
@@ -1,3 +1,335 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from chatbot.models import ChatMessage, ChatSession
+from community_api_service.models import Category, Like, Post, PostImage
+from vectordb.models import DevelopmentRecord, DevelopmentRecordImage
+from . import age, snapshots
+from .images import collect_orphan_images, render_variants
+from .models import UploadedImage, User, UserChild
+
+
+def make_image(size=(2000, 1500), image_format='JPEG', orientation=None):
+    """테스트용 이미지 바이트"""
+    img = Image.new('RGB', size, (200, 120, 40))
+    buffer = io.BytesIO()
+    kwargs = {}
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        kwargs['exif'] = exif
+    img.save(buffer, image_format, **kwargs)
+    return buffer.getvalue()
+
+
+class ImagePipelineTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            IMAGE_PROCESS_WORKERS=0,
+            IMAGE_VARIANT_WIDTHS=(320, 640, 1280),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, content, name='photo.jpg'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse('image-upload'),
+                {'image': SimpleUploadedFile(name, content, content_type='image/jpeg')},
+                format='multipart',
+            )
+
+    def test_render_variants_uses_draft_and_exif_orientation(self):
+        """draft 디코딩, EXIF 회전, 확대 없음 테스트"""
+        source = f'{self.media_root}/rotated.jpg'
+        with open(source, 'wb') as f:
+            f.write(make_image((1600, 800), orientation=6))
+
+        result = render_variants(source, f'{self.media_root}/out', (320, 640, 1280))
+
+        # 90도 회전이라 세로 사진이 되고, 원본 너비(800)보다 큰 변환본은 원본 너비로 맞춤
+        self.assertEqual((result['width'], result['height']), (800, 1600))
+        self.assertEqual([v['width'] for v in result['variants']], [320, 640, 800])
+        self.assertEqual([v['height'] for v in result['variants']], [640, 1280, 1600])
+        with Image.open(f"{self.media_root}/out/{result['variants'][0]['webp']}") as img:
+            self.assertEqual((img.format, img.size), ('WEBP', (320, 640)))
+        with Image.open(f"{self.media_root}/out/{result['variants'][0]['jpeg']}") as img:
+            self.assertEqual((img.format, img.size), ('JPEG', (320, 640)))
+
+    def test_upload_creates_variants(self):
+        """업로드 후 변환본 생성과 게시글 첨부 테스트"""
+        response = self.upload(make_image())
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+
+        image = UploadedImage.objects.get(id=response.data['id'])
+        self.assertEqual(image.status, 'ready')
+        self.assertEqual([v['width'] for v in image.variants], [320, 640, 1280])
+        for variant in image.variants:
+            self.assertTrue(image.original.storage.exists(variant['webp']))
+            self.assertTrue(image.original.storage.exists(variant['jpeg']))
+
+        response = self.client.get(reverse('image-detail', args=[image.id]))
+        self.assertEqual(response.data['status'], 'ready')
+        self.assertTrue(response.data['variants'][0]['webp'].endswith('/320.webp'))
+
+        category = Category.objects.create(name='테스트 카테고리', post_type='story')
+        response = self.client.post(reverse('post-create'), {
+            'title': '사진 게시글',
+            'content': '내용',
+            'category_id': str(category.id),
+            'post_type': 'story',
+            'image_ids': [str(image.id)],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(str(PostImage.objects.get(image=image).post_id), response.data['id'])
+
+        response = self.client.get(reverse('post-list'))
+        variants = response.data[0]['images'][0]['variants']
+        self.assertEqual([v['width'] for v in variants], [320, 640, 1280])
+
+    def test_get_image_owner_only(self):
+        """다른 사용자의 업로드 이미지는 조회할 수 없는지 테스트"""
+        response = self.upload(make_image((400, 300)))
+        url = reverse('image-detail', args=[response.data['id']])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        other = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rejects_invalid_upload(self):
+        """이미지가 아니거나 너무 큰 파일 거부 테스트"""
+        response = self.upload(b'not an image', name='photo.txt')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.settings(IMAGE_MAX_PIXELS=1000):
+            response = self.upload(make_image((100, 100)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UploadedImage.objects.exists())
+
+    def test_duplicate_upload_reuses_blob(self):
+        """같은 사진은 원본/변환본을 공유하되 행은 사용자별로 만들어지는지 테스트"""
+        content = make_image((800, 600))
+        first = self.upload(content)
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        image = UploadedImage.objects.get(id=first.data['id'])
+        self.assertIn(image.sha256, image.original.name)
+
+        # 본인이 다시 올리면 기존 행을 그대로 반환
+        with mock.patch('api_service.views.schedule_processing') as schedule:
+            again = self.upload(content, name='again.jpg')
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data['id'], first.data['id'])
+        schedule.assert_not_called()
+
+        # 다른 사용자는 처음 올린 것과 같은 응답으로 본인 행을 받고, 파일 저장과 변환은 하지 않음
+        other = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        self.client.force_authenticate(user=other)
+        with mock.patch('api_service.images.render_variants') as render:
+            second = self.upload(content, name='same.jpg')
+        render.assert_not_called()
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.data['status'], 'pending')
+        self.assertNotEqual(second.data['id'], first.data['id'])
+        copy = UploadedImage.objects.get(id=second.data['id'])
+        self.assertEqual(copy.user, other)
+        self.assertEqual(copy.original.name, image.original.name)
+        self.assertEqual(copy.status, 'ready')
+        self.assertEqual(copy.variants, image.variants)
+        blob_dir = os.path.dirname(image.original.path)
+        self.assertEqual(os.listdir(blob_dir), [os.path.basename(image.original.name)])
+
+        # 다른 사용자의 이미지 ID로는 게시글에 첨부할 수 없음
+        category = Category.objects.create(name='테스트 카테고리', post_type='story')
+        response = self.client.post(reverse('post-create'), {
+            'title': '사진 게시글',
+            'content': '내용',
+            'category_id': str(category.id),
+            'post_type': 'story',
+            'image_ids': [first.data['id']],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # 첨부되지 않은 본인 행이 정리돼도 다른 사용자의 행이 가리키는 파일은 남음
+        post = Post.objects.create(user=other, category=category, title='제목', content='내용', post_type='story')
+        PostImage.objects.create(post=post, image=copy, image_url=copy.original.url)
+        UploadedImage.objects.update(last_uploaded_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(collect_orphan_images(), 1)
+        self.assertEqual(list(UploadedImage.objects.values_list('id', flat=True)), [copy.id])
+        self.assertTrue(copy.original.storage.exists(copy.original.name))
+        self.assertTrue(copy.original.storage.exists(copy.variants[0]['webp']))
+
+    def test_upload_protects_shared_blob_from_gc(self):
+        """다른 사용자가 같은 사진을 올리면 고아였던 원본 행도 정리 유예가 갱신되는지 테스트"""
+        content = make_image((640, 480))
+        old = UploadedImage.objects.get(id=self.upload(content).data['id'])
+        UploadedImage.objects.update(last_uploaded_at=timezone.now() - timedelta(days=2))
+
+        other = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        self.client.force_authenticate(user=other)
+        copy = UploadedImage.objects.get(id=self.upload(content).data['id'])
+
+        self.assertEqual(collect_orphan_images(), 0)
+        self.assertTrue(UploadedImage.objects.filter(id=old.id).exists())
+        self.assertTrue(copy.original.storage.exists(copy.original.name))
+        self.assertTrue(copy.original.storage.exists(copy.variants[0]['webp']))
+
+    def test_orphan_gc(self):
+        """참조 행이 모두 삭제된 이미지만 정리되는지 테스트"""
+        shared = UploadedImage.objects.get(id=self.upload(make_image((400, 300))).data['id'])
+        orphan = UploadedImage.objects.get(id=self.upload(make_image((300, 200))).data['id'])
+        recent = UploadedImage.objects.get(id=self.upload(make_image((200, 100))).data['id'])
+        UploadedImage.objects.exclude(id=recent.id).update(last_uploaded_at=timezone.now() - timedelta(days=2))
+
+        category = Category.objects.create(name='테스트 카테고리', post_type='story')
+        post = Post.objects.create(user=self.user, category=category, title='제목', content='내용', post_type='story')
+        post_image = PostImage.objects.create(post=post, image=shared, image_url=shared.original.url)
+        child = UserChild.objects.create(user=self.user, name='아이', birth_date=date(2024, 1, 1))
+        record = DevelopmentRecord.objects.create(
+            user=self.user, child=child, date=date(2025, 1, 1), age_group='12-18months',
+            title='기록', description='내용'
+        )
+        record_image = DevelopmentRecordImage.objects.create(record=record, image=shared, image_url=shared.original.url)
+        orphan_record_image = DevelopmentRecordImage.objects.create(record=record, image=orphan, image_url=orphan.original.url)
+        orphan_record_image.soft_delete()
+
+        self.assertEqual(collect_orphan_images(dry_run=True), 1)
+        self.assertEqual(collect_orphan_images(), 1)
+        self.assertFalse(UploadedImage.objects.filter(id=orphan.id).exists())
+        self.assertFalse(orphan.original.storage.exists(orphan.original.name))
+        self.assertFalse(os.path.exists(orphan.original.storage.path(orphan.variant_dir)))
+
+        # 게시글 쪽 참조만 삭제돼도 발달 기록이 참조하고 있으면 유지
+        post_image.soft_delete()
+        self.assertEqual(collect_orphan_images(), 0)
+        record_image.soft_delete()
+        self.assertEqual(collect_orphan_images(), 1)
+        self.assertEqual(list(UploadedImage.objects.values_list('id', flat=True)), [recent.id])
+
+
+class AgeTestCase(TestCase):
+    def test_age_in_months(self):
+        """만 개월 수 계산 (말일생 처리 포함) 테스트"""
+        cases = [
+            (date(2024, 3, 15), date(2024, 4, 14), 0),
+            (date(2024, 3, 15), date(2024, 4, 15), 1),
+            (date(2024, 1, 31), date(2024, 2, 28), 0),
+            (date(2024, 1, 31), date(2024, 2, 29), 1),
+            (date(2023, 12, 31), date(2025, 1, 30), 12),
+            (date(2024, 5, 10), date(2024, 5, 1), -1),
+        ]
+        for birth_date, on_date, months in cases:
+            self.assertEqual(age.age_in_months(birth_date, on_date), months, (birth_date, on_date))
+        self.assertEqual(
+            age.age_in_months_array([c[0] for c in cases], [c[1] for c in cases]).tolist(),
+            [c[2] for c in cases],
+        )
+
+    def test_array_matches_scalar(self):
+        """배열 계산이 기록 하나씩 계산한 결과와 같은지 테스트"""
+        birth_dates = [date(2020, 1, 1) + timedelta(days=i * 7) for i in range(300)]
+        on_dates = [birth + timedelta(days=i * 13 % 2200) for i, birth in enumerate(birth_dates)]
+        months = age.age_in_months_array(birth_dates, on_dates)
+        self.assertEqual(months.tolist(), [age.age_in_months(b, o) for b, o in zip(birth_dates, on_dates)])
+        self.assertEqual(age.age_groups_array(months).tolist(), [age.age_group(m) for m in months.tolist()])
+
+    def test_age_group(self):
+        """연령 그룹 경계 테스트"""
+        self.assertEqual(age.age_group(-1), '0-3months')
+        self.assertEqual(age.age_group(2), '0-3months')
+        self.assertEqual(age.age_group(3), '3-6months')
+        self.assertEqual(age.age_group(17), '12-18months')
+        self.assertEqual(age.age_group(59), '48-60months')
+        self.assertEqual(age.age_group(60), '60months+')
+
+
+class SnapshotExportTestCase(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(ANALYTICS_EXPORT_ROOT=self.root, ANALYTICS_EXPORT_LAG_SECONDS=0)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        category = Category.objects.create(name='질문', post_type='question')
+        self.posts = [
+            Post.objects.create(user=self.user, category=category, title=f'글 {i}', content='내용' * (i + 1),
+                                post_type='question')
+            for i in range(3)
+        ]
+        Like.objects.create(user=self.user, target_id=self.posts[0].id, target_type='post')
+        session = ChatSession.objects.create(user=self.user, title='상담', category='sleep')
+        ChatMessage.objects.create(session=session, role='user', content='질문', tokens=10)
+        ChatMessage.objects.create(session=session, role='assistant', content='답변입니다', tokens=32)
+        child = UserChild.objects.create(user=self.user, name='첫째', birth_date=date(2024, 1, 1))
+        DevelopmentRecord.objects.create(user=self.user, child=child, date=date(2024, 6, 1), title='기록',
+                                         description='내용', development_area='language')
+
+    def test_export_and_load(self):
+        """컬럼 파일 내보내기와 타입/파티션 테스트"""
+        self.assertEqual(snapshots.export_all(), {
+            'posts': 3, 'likes': 1, 'chat_messages': 2, 'development_records': 1,
+        })
+        day = timezone.now().date()  # UTC 기준 파티션
+        self.assertTrue(os.path.isdir(os.path.join(self.root, 'posts', f'day={day.isoformat()}')))
+
+        posts = snapshots.load('posts')
+        self.assertEqual(posts['id'].dtype.str, '|S32')
+        self.assertEqual(str(posts['created_at'].dtype), 'datetime64[us]')
+        self.assertEqual(sorted(posts['content_length'].tolist()), [2, 4, 6])
+        self.assertEqual(set(posts['id'].tolist()), {post.id.hex.encode() for post in self.posts})
+
+        records = snapshots.load('development_records')
+        areas = snapshots.categories('development_records', 'development_area')
+        self.assertEqual(areas[records['development_area'][0]], 'language')
+        age_groups = snapshots.categories('development_records', 'age_group')
+        self.assertEqual(age_groups[records['age_group'][0]], '3-6months')
+
+        self.assertEqual(snapshots.rollup('chat_messages', 'role', value='tokens'), {'user': 10, 'assistant': 32})
+        self.assertEqual(snapshots.rollup('posts', 'day'), {day: 3})
+        self.assertEqual(snapshots.load('posts', start=day + timedelta(days=1))['id'].tolist(), [])
+
+    def test_incremental_export(self):
+        """워터마크 이후 바뀐 행만 내보내고 load에서 최신 버전만 남기는지 테스트"""
+        snapshots.export_all()
+        self.assertEqual(snapshots.export_all(), {
+            'posts': 0, 'likes': 0, 'chat_messages': 0, 'development_records': 0,
+        })
+
+        self.posts[0].soft_delete()
+        self.assertEqual(snapshots.export_table('posts')[0], 1)
+        posts = snapshots.load('posts')
+        self.assertEqual(len(posts['id']), 3)
+        deleted = dict(zip(posts['id'].tolist(), posts['deleted'].tolist()))
+        self.assertTrue(deleted[self.posts[0].id.hex.encode()])
+        self.assertEqual(sum(deleted.values()), 1)
+
+        out = io.StringIO()
+        call_command('query_snapshots', 'posts', '--by', 'deleted', stdout=out)
+        self.assertEqual(out.getvalue().splitlines(), ['False\t2', 'True\t1'])
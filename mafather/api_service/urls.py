@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('images/', views.upload_image, name='image-upload'),
+    path('images/<uuid:image_id>/', views.get_image, name='image-detail'),
+]
@@ -1,3 +1,71 @@
-from django.shortcuts import render
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .images import ImageValidationError, content_hash, inspect_upload, schedule_processing
+from .models import UploadedImage
+from .serializers import UploadedImageSerializer
 
-# Create your views here.
+
+def _reuse_image(image):
+    """본인이 이미 올린 같은 내용의 이미지 반환 (변환 실패 상태였으면 다시 변환)"""
+    if image.status == 'failed':
+        schedule_processing(image)
+        return Response(UploadedImageSerializer(image).data, status=202)
+    return Response(UploadedImageSerializer(image).data, status=200)
+
+# 이미지 업로드 API (원본 저장 후 변환은 백그라운드에서 진행, 202 응답)
+# 본인이 같은 내용의 이미지를 이미 올렸으면 기존 이미지를 200으로 반환
+# 다른 사용자가 올린 적이 있으면 원본 파일만 공유하고 본인 행을 새로 만듦 (응답은 처음 올린 경우와 같음)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def upload_image(request):
+    file = request.FILES.get('image')
+    if file is None:
+        return Response({"error": "image 파일이 필요합니다."}, status=400)
+    try:
+        content_type, width, height = inspect_upload(file)
+    except ImageValidationError as e:
+        return Response({"error": str(e)}, status=400)
+
+    sha256 = content_hash(file)
+    # 같은 내용의 행을 먼저 갱신해서 공유할 원본이 고아 정리(collect_orphan_images)로 지워지지 않게 함
+    # (정리 중인 행이면 정리가 끝날 때까지 기다리고, 이미 지워졌으면 아래에서 새로 저장)
+    UploadedImage.objects.filter(sha256=sha256).update(last_uploaded_at=timezone.now())
+    mine = UploadedImage.objects.filter(user=request.user, sha256=sha256).first()
+    if mine is not None:
+        return _reuse_image(mine)
+
+    shared = UploadedImage.objects.filter(sha256=sha256).only('original').first()
+    image = UploadedImage(
+        user=request.user,
+        original=shared.original.name if shared is not None else file,
+        sha256=sha256,
+        content_type=content_type,
+        size=file.size,
+        width=width,
+        height=height,
+    )
+    try:
+        with transaction.atomic():
+            image.save()
+    except IntegrityError:
+        # 같은 사용자가 같은 사진을 동시에 올린 경우: 새로 저장한 파일은 지우고 먼저 저장된 행을 사용
+        if shared is None:
+            image.original.delete(save=False)
+        return _reuse_image(UploadedImage.objects.get(user=request.user, sha256=sha256))
+    schedule_processing(image)
+    return Response(UploadedImageSerializer(image).data, status=202)
+
+# 업로드 이미지 조회 API (변환 상태 확인용, 본인이 올린 이미지만)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_image(request, image_id):
+    try:
+        image = UploadedImage.objects.get(id=image_id, user=request.user)
+    except UploadedImage.DoesNotExist:
+        return Response({"error": "이미지를 찾을 수 없습니다."}, status=404)
+    return Response(UploadedImageSerializer(image).data)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import ChatSession, ChatMessage
+from .models import ChatSession, ChatMessage, ChatMessageArchive, TokenUsage
 
 
 class ChatMessageInline(admin.TabularInline):
@@ -29,7 +29,7 @@ class ChatSessionAdmin(admin.ModelAdmin):
         (None, {'fields': ('user', 'title', 'category')}),
         ('세션 정보', {'fields': ('status', 'session_token')}),
         ('통계', {'fields': ('total_tokens', 'message_count', 'duration_minutes')}),
-        ('시간 정보', {'fields': ('last_message_at', 'created_at', 'updated_at')}),
+        ('시간 정보', {'fields': ('last_message_at', 'archived_at', 'created_at', 'updated_at')}),
         ('시스템정보', {'fields': ('id', 'deleted_at')}),
     )
 
@@ -69,3 +69,35 @@ class ChatMessageAdmin(admin.ModelAdmin):
     def content_preview(self, obj):
         return obj.content[:100] + '...' if len(obj.content) > 100 else obj.content
     content_preview.short_description = '내용 미리보기'
+
+
+@admin.register(ChatMessageArchive)
+class ChatMessageArchiveAdmin(admin.ModelAdmin):
+    """채팅 메시지 보관본 관리자 (archive_chat_messages 명령으로 생성)"""
+
+    list_display = ['session', 'codec', 'message_count', 'raw_size', 'stored_size', 'last_message_at', 'created_at']
+    list_filter = ['codec', 'created_at']
+    search_fields = ['session__title', 'session__user__name']
+    ordering = ['-created_at']
+    exclude = ['data']
+    readonly_fields = ['session', 'codec', 'message_count', 'raw_size', 'first_message_at', 'last_message_at', 'created_at']
+
+    def stored_size(self, obj):
+        return len(obj.data)
+    stored_size.short_description = '압축 후 크기'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TokenUsage)
+class TokenUsageAdmin(admin.ModelAdmin):
+    """LLM 토큰 사용량 관리자 (rollup_token_usage 명령으로 갱신)"""
+
+    list_display = ['date', 'user', 'category', 'model', 'prompt_tokens', 'completion_tokens', 'calls']
+    list_filter = ['date', 'category', 'model']
+    search_fields = ['user__name', 'user__email']
+    ordering = ['-date', 'category']
+    readonly_fields = [
+        'date', 'user', 'session', 'category', 'model', 'prompt_tokens', 'completion_tokens', 'calls', 'updated_at'
+    ]
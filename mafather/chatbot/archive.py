@@ -0,0 +1,167 @@
+# chatbot/archive.py
+"""
+오래된 채팅 메시지 보관
+
+chat_messages는 상담의 모든 턴이 본문과 메타데이터째 쌓이는 가장 큰 테이블이다.
+끝났거나 만료된 세션 중 마지막 메시지가 CHAT_ARCHIVE_AFTER_DAYS일보다 오래된 세션은
+메시지를 세션당 한 행의 압축 JSON(chat_message_archives)으로 옮기고 chat_messages에서 지운다
+(manage.py archive_chat_messages). 핫 테이블과 그 인덱스는 최근 대화 크기로 유지된다.
+
+압축은 zstandard 패키지가 있으면 zstd, 없으면 표준 라이브러리 zlib을 쓴다.
+보관본마다 codec을 저장하므로 섞여 있어도 읽을 수 있다 (zstd 보관본을 읽으려면 zstandard 필요).
+
+조회(messages / chatbot.history)는 보관본을 풀어서 아직 chat_messages에 남은 메시지와 합쳐
+돌려주므로 호출하는 쪽은 보관 여부를 몰라도 된다. 풀어낸 메시지는 저장하지 않은 ChatMessage
+인스턴스라서 읽기 전용으로만 쓴다. 보관 후 새 메시지가 붙으면 다음 실행에서 보관본에 합쳐진다.
+"""
+import datetime
+import json
+import uuid
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChatMessage, ChatMessageArchive, ChatSession
+
+ARCHIVABLE_STATUSES = ('completed', 'expired')
+FIELDS = ('id', 'role', 'content', 'tokens', 'metadata', 'created_at')
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def compress(raw):
+    """bytes → (codec, 압축한 bytes)"""
+    zstandard = _zstd()
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return 'zlib', zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress(codec, data):
+    data = bytes(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'zstd':
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError('zstd 보관본을 읽으려면 zstandard 패키지가 필요합니다.')
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f'알 수 없는 압축 방식입니다: {codec}')
+
+
+def _json_default(value):
+    # DjangoJSONEncoder는 시간을 밀리초로 자르므로 커서 비교가 어긋나지 않게 마이크로초까지 남김
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} 값은 JSON으로 바꿀 수 없습니다.')
+
+
+def _encode(rows):
+    return json.dumps(rows, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _decode(archive):
+    return json.loads(decompress(archive.codec, archive.data))
+
+
+def _to_message(session, row):
+    return ChatMessage(
+        id=uuid.UUID(row['id']),
+        session=session,
+        role=row['role'],
+        content=row['content'],
+        tokens=row['tokens'],
+        metadata=row['metadata'],
+        created_at=parse_datetime(row['created_at']),
+    )
+
+
+def messages(session):
+    """세션의 전체 메시지 (보관본 + 남은 메시지, 시간순 목록)"""
+    hot = list(ChatMessage.objects.filter(session=session).order_by('created_at', 'id'))
+    if session.archived_at is None:
+        return hot
+    archive = ChatMessageArchive.objects.filter(session=session).first()
+    archived = [_to_message(session, row) for row in _decode(archive)] if archive else []
+    return sorted(archived + hot, key=lambda message: (message.created_at, message.id))
+
+
+def candidates(before=None):
+    """보관 대상 세션 (끝났거나 만료됐고, before 이전이 마지막 메시지이고, chat_messages에 메시지가 남은 세션)"""
+    if before is None:
+        before = timezone.now() - datetime.timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS)
+    return ChatSession.objects.filter(
+        Exists(ChatMessage.objects.filter(session=OuterRef('pk'))),
+        status__in=ARCHIVABLE_STATUSES,
+        last_message_at__lt=before,
+    )
+
+
+def archive_session(session_id):
+    """세션 하나의 메시지를 보관본으로 옮기고 옮긴 메시지 수 반환"""
+    with transaction.atomic():
+        session = ChatSession.objects.select_for_update().filter(pk=session_id).first()
+        if session is None:
+            return 0
+        hot = list(ChatMessage.objects.filter(session=session).order_by('created_at', 'id').values(*FIELDS))
+        if not hot:
+            return 0
+        # JSON으로 한 번 바꿔서 UUID/시간을 보관본과 같은 문자열 형식으로 맞춤
+        rows = json.loads(_encode(hot))
+        archive = ChatMessageArchive.objects.filter(session=session).first()
+        if archive is not None:
+            rows = _decode(archive) + rows
+        raw = _encode(rows)
+        codec, data = compress(raw)
+        ChatMessageArchive.objects.update_or_create(
+            session=session,
+            defaults={
+                'codec': codec,
+                'data': data,
+                'message_count': len(rows),
+                'raw_size': len(raw),
+                'first_message_at': parse_datetime(rows[0]['created_at']),
+                'last_message_at': parse_datetime(rows[-1]['created_at']),
+            },
+        )
+        # 읽은 메시지만 지움 (QuerySet.delete라서 세션의 메시지 수/미리보기는 그대로 남음)
+        moved = ChatMessage.objects.filter(session=session, id__in=[row['id'] for row in hot]).delete()[0]
+        ChatSession.objects.filter(pk=session.pk).update(archived_at=timezone.now())
+    return moved
+
+
+def archive_old_sessions(before=None, batch_size=None, limit=None):
+    """보관 대상 세션을 batch_size개씩 보관하고 (세션 수, 메시지 수) 반환"""
+    batch_size = batch_size or settings.CHAT_ARCHIVE_BATCH_SIZE
+    sessions = 0
+    moved = 0
+    skipped = set()
+    while limit is None or sessions < limit:
+        size = batch_size if limit is None else min(batch_size, limit - sessions)
+        batch = list(
+            candidates(before).exclude(pk__in=skipped).order_by('last_message_at', 'id').values_list('id', flat=True)[:size]
+        )
+        if not batch:
+            break
+        for session_id in batch:
+            count = archive_session(session_id)
+            if count:
+                sessions += 1
+                moved += count
+            else:
+                skipped.add(session_id)
+    return sessions, moved
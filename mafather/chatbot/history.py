@@ -0,0 +1,63 @@
+# chatbot/history.py
+"""
+채팅 세션 목록 / 메시지 기록 페이지네이션
+
+세션 목록은 최근 대화순(-last_message_at, -id)이고, 메시지 수와 마지막 메시지 미리보기는
+ChatSession에 비정규화된 값을 그대로 쓴다 (세션마다 메시지를 COUNT하거나 조회하지 않음).
+메시지 기록은 최신 페이지부터 이전 메시지 방향으로 넘기고, 한 페이지 안에서는 시간순으로 돌려준다.
+둘 다 OFFSET 대신 (시간, ID) keyset 커서라서 페이지가 깊어져도 인덱스 범위 조회 한 번이다.
+보관된 세션(chatbot.archive)은 보관본을 풀어서 같은 커서로 넘긴다.
+"""
+from django.db.models import Q
+
+from mafather import cursors
+
+from . import archive
+from .models import ChatMessage, ChatSession
+
+
+def session_queryset(user):
+    return ChatSession.objects.filter(user=user, deleted_at__isnull=True)
+
+
+def session_page(sessions, cursor, page_size):
+    """최근 대화순 한 페이지 → (세션 목록, 다음 커서)"""
+    sessions = sessions.order_by('-last_message_at', '-id')
+    if cursor:
+        last_message_at, session_id = cursors.decode(cursor)
+        sessions = sessions.filter(
+            Q(last_message_at__lt=last_message_at) | Q(last_message_at=last_message_at, id__lt=session_id)
+        )
+    items = list(sessions[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        last = items[page_size - 1]
+        next_cursor = cursors.encode(last.last_message_at, last.id)
+    return items[:page_size], next_cursor
+
+
+def message_page(session, cursor, page_size):
+    """
+    cursor 이전 메시지 한 페이지 → (시간순 메시지 목록, 더 이전 페이지 커서)
+
+    커서가 없으면 가장 최근 메시지들
+    """
+    before = cursors.decode(cursor) if cursor else None
+    if session.archived_at is None:
+        messages = ChatMessage.objects.filter(session=session).order_by('-created_at', '-id')
+        if before:
+            created_at, message_id = before
+            messages = messages.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+        items = list(messages[:page_size + 1])
+    else:
+        items = [
+            message for message in reversed(archive.messages(session))
+            if before is None or (message.created_at, message.id) < before
+        ][:page_size + 1]
+    previous_cursor = None
+    if len(items) > page_size:
+        oldest = items[page_size - 1]
+        previous_cursor = cursors.encode(oldest.created_at, oldest.id)
+    items = items[:page_size]
+    items.reverse()
+    return items, previous_cursor
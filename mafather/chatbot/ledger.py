@@ -0,0 +1,291 @@
+# chatbot/ledger.py
+"""
+LLM 토큰 사용량 장부와 사용자별 한도
+
+LLM을 호출할 때마다 DB 행을 쓰지 않고 카운터만 올린다 (record_usage).
+- 한도 카운터: 사용자별 일/월 토큰 합계. check_quota()는 키 두 개만 읽는다 (O(1)).
+- 미반영 카운터: (날짜, 세션, 모델)별 프롬프트/응답 토큰과 호출 수.
+  rollup()이 주기적으로 꺼내서 token_usages 일별 집계 테이블에 더한다 (manage.py rollup_token_usage).
+  꺼낸 카운터는 DB 커밋이 끝난 뒤에 지우고, 실패하면 미반영 카운터에 다시 더한다.
+  탈퇴한(삭제된) 사용자의 사용량은 기록할 곳이 없으므로 버린다.
+  카테고리별 비용 보고서(manage.py token_report)는 이 집계 테이블만 읽는다.
+
+REDIS_URL이 있으면 Redis에, 없으면 프로세스 메모리에 카운터를 둔다 (개발/테스트용, 워커마다 따로 셈).
+날짜 경계는 TIME_ZONE 기준이다.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api_service.models import User
+from .models import ChatSession, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'tokens:pending'
+TAKEN_KEY_PREFIX = f'{PENDING_KEY}:taken:'
+DAY_TTL_SECONDS = 2 * 24 * 60 * 60
+MONTH_TTL_SECONDS = 32 * 24 * 60 * 60
+# 꺼낸 뒤 이 시간이 지나도 남아 있는 카운터는 rollup이 중간에 죽은 것으로 보고 미반영 카운터로 되돌림
+TAKEN_RECOVER_SECONDS = 10 * 60
+
+# KEYS[1]: 미반영 해시, KEYS[2]: 꺼낸 해시 → 꺼낸 해시의 필드/값 목록 (미반영분이 없으면 빈 목록)
+TAKE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {}
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+# KEYS[1]: 미반영 해시, KEYS[2]: 꺼낸 해시 → 꺼낸 값을 미반영 해시에 다시 더하고 꺼낸 해시 삭제
+RESTORE_SCRIPT = """
+local values = redis.call('HGETALL', KEYS[2])
+for i = 1, #values, 2 do
+    redis.call('HINCRBY', KEYS[1], values[i], values[i + 1])
+end
+redis.call('DEL', KEYS[2])
+return #values / 2
+"""
+
+
+class QuotaExceeded(Exception):
+    """토큰 한도 초과"""
+
+    def __init__(self, period, limit, used):
+        self.period = period
+        self.limit = limit
+        self.used = used
+        super().__init__(f'{period} 토큰 한도({limit})를 넘었습니다. (사용 {used})')
+
+
+def _quota_keys(user_id, today):
+    return (
+        f'tokens:user:{user_id}:day:{today:%Y%m%d}',
+        f'tokens:user:{user_id}:month:{today:%Y%m}',
+    )
+
+
+def _pending_field(today, session, model):
+    return f'{today.isoformat()}|{session.id}|{session.user_id}|{session.category}|{model}'
+
+
+class MemoryStore:
+    """프로세스 메모리 카운터 (만료 시간은 무시, 키에 날짜가 들어 있어 새 기간은 새 키)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._pending = Counter()
+
+    def add(self, quota_keys, pending_field, prompt_tokens, completion_tokens):
+        total = prompt_tokens + completion_tokens
+        with self._lock:
+            for key in quota_keys:
+                self._counters[key] += total
+            self._pending[(pending_field, 'p')] += prompt_tokens
+            self._pending[(pending_field, 'c')] += completion_tokens
+            self._pending[(pending_field, 'n')] += 1
+
+    def get_many(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def take_pending(self):
+        """미반영 카운터를 꺼냄 → (토큰, {(키, 종류): 값})"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        return None, dict(pending)
+
+    def ack_pending(self, token):
+        """DB에 반영한 카운터 정리 (메모리는 꺼낼 때 이미 비움)"""
+
+    def restore_pending(self, token, pending):
+        with self._lock:
+            self._pending.update(pending)
+
+
+class RedisStore:
+    """Redis 카운터 (한도는 INCRBY + EXPIRE, 미반영분은 해시 하나에 HINCRBY)"""
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(TAKE_SCRIPT)
+        self._restore = self._redis.register_script(RESTORE_SCRIPT)
+
+    def add(self, quota_keys, pending_field, prompt_tokens, completion_tokens):
+        total = prompt_tokens + completion_tokens
+        pipe = self._redis.pipeline(transaction=False)
+        for key, ttl in zip(quota_keys, (DAY_TTL_SECONDS, MONTH_TTL_SECONDS)):
+            pipe.incrby(key, total)
+            pipe.expire(key, ttl)
+        pipe.hincrby(PENDING_KEY, f'{pending_field}|p', prompt_tokens)
+        pipe.hincrby(PENDING_KEY, f'{pending_field}|c', completion_tokens)
+        pipe.hincrby(PENDING_KEY, f'{pending_field}|n', 1)
+        pipe.execute()
+
+    def get_many(self, keys):
+        return [int(value or 0) for value in self._redis.mget(keys)]
+
+    def take_pending(self):
+        """
+        미반영 카운터를 꺼냄 → (토큰, {(키, 종류): 값})
+
+        이름 바꾸기와 읽기를 스크립트 하나로 하고, 꺼낸 해시는 ack_pending(DB 커밋 후)까지 남겨 둔다.
+        그동안 들어오는 사용량은 새 해시에 쌓이고, rollup이 중간에 죽어도 꺼낸 해시는 다음 rollup이 되돌린다.
+        """
+        self._recover_taken()
+        taken = f'{TAKEN_KEY_PREFIX}{int(time.time())}:{uuid.uuid4().hex}'
+        values = self._take(keys=[PENDING_KEY, taken])
+        if not values:
+            return None, {}
+        pending = {}
+        for field, value in zip(values[::2], values[1::2]):
+            key, _, kind = field.decode().rpartition('|')
+            pending[(key, kind)] = int(value)
+        return taken, pending
+
+    def ack_pending(self, token):
+        if token:
+            self._redis.delete(token)
+
+    def restore_pending(self, token, pending):
+        if token:
+            self._restore(keys=[PENDING_KEY, token])
+
+    def _recover_taken(self):
+        cutoff = time.time() - TAKEN_RECOVER_SECONDS
+        for key in self._redis.scan_iter(match=f'{TAKEN_KEY_PREFIX}*'):
+            taken_at = key.decode()[len(TAKEN_KEY_PREFIX):].split(':', 1)[0]
+            if taken_at.isdigit() and int(taken_at) < cutoff:
+                logger.warning('반영되지 않은 토큰 사용량 되돌림: %s', key.decode())
+                self._restore(keys=[PENDING_KEY, key])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RedisStore(settings.REDIS_URL) if settings.REDIS_URL else MemoryStore()
+    return _store
+
+
+def reset_store():
+    """카운터 저장소를 새로 만듦 (테스트용)"""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def usage(user_id):
+    """(오늘 사용량, 이번 달 사용량)"""
+    day, month = get_store().get_many(_quota_keys(user_id, timezone.localdate()))
+    return day, month
+
+
+def check_quota(user_id, estimated_tokens=0):
+    """LLM 호출 전에 확인. 한도를 넘으면 QuotaExceeded (한도가 0/None이면 무제한)"""
+    day, month = usage(user_id)
+    for period, used, limit in (
+        ('일일', day, settings.LLM_DAILY_TOKEN_QUOTA),
+        ('월간', month, settings.LLM_MONTHLY_TOKEN_QUOTA),
+    ):
+        if limit and used + estimated_tokens > limit:
+            raise QuotaExceeded(period, limit, used)
+
+
+def record_usage(session, prompt_tokens, completion_tokens, model):
+    """LLM 호출 한 번의 토큰 사용량 기록 (DB를 쓰지 않음)"""
+    today = timezone.localdate()
+    get_store().add(
+        _quota_keys(session.user_id, today),
+        _pending_field(today, session, model),
+        int(prompt_tokens),
+        int(completion_tokens),
+    )
+
+
+def _apply(date, session_id, user_id, category, model, prompt_tokens, completion_tokens, calls):
+    lookup = {'date': date, 'session_id': session_id, 'model': model}
+    if session_id is None:
+        # 세션이 지워진 사용량은 (날짜, 사용자, 카테고리, 모델)별 한 행에 모음 (다른 사용자 행과 섞이지 않게)
+        lookup.update(user_id=user_id, category=category)
+    increments = {
+        'prompt_tokens': F('prompt_tokens') + prompt_tokens,
+        'completion_tokens': F('completion_tokens') + completion_tokens,
+        'calls': F('calls') + calls,
+        'updated_at': timezone.now(),
+    }
+    if TokenUsage.objects.filter(**lookup).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            TokenUsage.objects.create(
+                **{'user_id': user_id, 'category': category, **lookup},
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, calls=calls,
+            )
+    except IntegrityError:
+        # 다른 rollup이 동시에 행을 만든 경우
+        TokenUsage.objects.filter(**lookup).update(**increments)
+
+
+def rollup():
+    """미반영 카운터를 token_usages에 더하고 반영한 (날짜, 세션, 모델) 수 반환"""
+    store = get_store()
+    token, pending = store.take_pending()
+    if not pending:
+        return 0
+    totals = {}
+    for (key, kind), value in pending.items():
+        totals.setdefault(key, Counter())[kind] += value
+
+    try:
+        with transaction.atomic():
+            session_ids, user_ids = set(), set()
+            for key in totals:
+                _, session_id, user_id, _ = key.split('|', 3)
+                session_ids.add(session_id)
+                user_ids.add(user_id)
+            live_sessions = {
+                str(session_id) for session_id in
+                ChatSession.objects.filter(id__in=session_ids).values_list('id', flat=True)
+            }
+            live_users = {str(user_id) for user_id in User.objects.filter(id__in=user_ids).values_list('id', flat=True)}
+            applied = 0
+            for key, counts in totals.items():
+                date, session_id, user_id, category, model = key.split('|', 4)
+                if user_id not in live_users:
+                    # 탈퇴한 사용자: 행을 만들면 외래 키 오류로 배치 전체가 실패하므로 버림
+                    logger.warning('삭제된 사용자의 토큰 사용량 버림: %s (%s토큰)', key, counts['p'] + counts['c'])
+                    continue
+                _apply(
+                    date, session_id if session_id in live_sessions else None, user_id, category, model,
+                    counts['p'], counts['c'], counts['n'],
+                )
+                applied += 1
+    except Exception:
+        # DB 반영에 실패하면 다음 rollup에서 다시 시도하도록 카운터를 되돌림
+        store.restore_pending(token, pending)
+        raise
+    store.ack_pending(token)
+    return applied
+
+
+def token_cost(model, prompt_tokens, completion_tokens):
+    """LLM_TOKEN_PRICES(100만 토큰당 USD) 기준 비용"""
+    prices = settings.LLM_TOKEN_PRICES.get(model) or settings.LLM_TOKEN_PRICES['default']
+    return (prompt_tokens * prices['prompt'] + completion_tokens * prices['completion']) / 1_000_000
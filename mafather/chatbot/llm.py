@@ -0,0 +1,105 @@
+# chatbot/llm.py
+"""
+LLM 연동 진입점 (LangChain / OpenAI / tiktoken)
+
+langchain, openai, tiktoken은 불러오는 데만 수 초와 수백 MB가 들어서 모듈 최상단에서 import하지 않는다.
+커뮤니티 트래픽만 받는 워커도 같은 URLconf를 불러오므로, chatbot/vectordb 코드는 이 모듈의 함수만 쓰고
+실제 패키지는 처음 호출할 때 불러온다. 모델 클라이언트와 tiktoken 인코딩은 프로세스마다 한 번 만들어 재사용한다.
+(mafather.tests.StartupImportTestCase가 앱을 불러온 뒤 이 패키지들이 없는지 확인한다)
+
+    from chatbot import llm
+    answer = llm.chat(session, [('system', '...'), ('user', '...')])
+
+chat()은 호출 전에 턴 빈도 제한(mafather.throttling 'chat_turn')과 토큰 한도를 확인하고
+호출 후 사용량을 기록한다 (chatbot.ledger).
+"""
+import functools
+
+from django.conf import settings
+
+from mafather import throttling
+
+from . import ledger
+
+# 모델 이름으로 인코딩을 찾지 못할 때 (새 모델 등)
+FALLBACK_ENCODING = 'o200k_base'
+# 메시지마다 붙는 역할/구분 토큰과 응답 시작 토큰 (OpenAI chat 형식 기준 근사치)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+@functools.lru_cache(maxsize=None)
+def encoding(model=None):
+    """모델의 tiktoken 인코딩 (처음 호출할 때 불러와서 캐시)"""
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model or settings.LLM_CHAT_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+
+
+def count_tokens(text, model=None):
+    return len(encoding(model).encode(text))
+
+
+def count_message_tokens(messages, model=None):
+    """[(역할, 내용), ...] 프롬프트의 토큰 수 추정"""
+    enc = encoding(model)
+    return sum(TOKENS_PER_MESSAGE + len(enc.encode(content)) for _, content in messages) + TOKENS_PER_REPLY
+
+
+@functools.lru_cache(maxsize=None)
+def chat_model(model=None, temperature=None):
+    """LangChain 채팅 모델 (모델/온도별로 한 번만 만듦)"""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model or settings.LLM_CHAT_MODEL,
+        temperature=settings.LLM_TEMPERATURE if temperature is None else temperature,
+        api_key=settings.OPENAI_API_KEY,
+        timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def embeddings(model=None):
+    """LangChain 임베딩 모델 (vectordb 검색용)"""
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model=model or settings.LLM_EMBEDDING_MODEL,
+        api_key=settings.OPENAI_API_KEY,
+        timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+    )
+
+
+def _usage(response, prompt_tokens, model):
+    """응답 메타데이터의 토큰 사용량 (없으면 직접 셈)"""
+    usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+    if usage.get('prompt_tokens') is not None and usage.get('completion_tokens') is not None:
+        return usage['prompt_tokens'], usage['completion_tokens']
+    return prompt_tokens, count_tokens(response.content, model)
+
+
+def chat(session, messages, model=None, temperature=None):
+    """
+    세션의 LLM 응답 본문
+
+    messages: [(역할, 내용), ...] - 역할은 'system', 'user', 'assistant'
+    너무 자주 부르면 rest_framework Throttled, 한도를 넘으면 ledger.QuotaExceeded
+    """
+    throttling.check('chat_turn', session.user_id)
+    model = model or settings.LLM_CHAT_MODEL
+    prompt_tokens = count_message_tokens(messages, model)
+    ledger.check_quota(session.user_id, estimated_tokens=prompt_tokens)
+    response = chat_model(model, temperature).invoke(list(messages))
+    ledger.record_usage(session, *_usage(response, prompt_tokens, model), model)
+    return response.content
+
+
+def embed(texts, model=None):
+    """텍스트 목록의 임베딩 벡터 목록"""
+    return embeddings(model).embed_documents(list(texts))
@@ -0,0 +1,28 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from chatbot.archive import archive_old_sessions, candidates
+
+
+class Command(BaseCommand):
+    help = '끝났거나 만료된 오래된 채팅 세션의 메시지를 압축 보관본으로 옮기고 chat_messages에서 지웁니다. 매일 밤 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.CHAT_ARCHIVE_AFTER_DAYS,
+            help='마지막 메시지가 이 일수보다 오래된 세션 보관',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.CHAT_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--limit', type=int, help='이번 실행에서 보관할 최대 세션 수')
+        parser.add_argument('--dry-run', action='store_true', help='보관 대상 세션 수만 출력')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - datetime.timedelta(days=options['days'])
+        if options['dry_run']:
+            self.stdout.write(f'보관 대상 세션 {candidates(before).count()}개')
+            return
+        sessions, messages = archive_old_sessions(before, options['batch_size'], options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'세션 {sessions}개의 메시지 {messages}개 보관'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from chatbot.ledger import rollup
+
+
+class Command(BaseCommand):
+    help = 'Redis/메모리에 쌓인 LLM 토큰 사용량을 token_usages 일별 집계 테이블에 반영합니다. 몇 분마다 실행합니다.'
+
+    def handle(self, *args, **options):
+        count = rollup()
+        self.stdout.write(self.style.SUCCESS(f'토큰 사용량 {count}건 반영'))
@@ -0,0 +1,45 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+
+from chatbot.ledger import token_cost
+from chatbot.models import TokenUsage
+
+
+class Command(BaseCommand):
+    help = '상담 카테고리별 LLM 토큰 사용량과 비용 보고서 (token_usages 집계 테이블만 읽음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=datetime.date.fromisoformat, help='시작 날짜 (기본: 이번 달 1일)')
+        parser.add_argument('--end', type=datetime.date.fromisoformat, help='끝 날짜 (기본: 오늘)')
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.localdate()
+        start = options['start'] or end.replace(day=1)
+        rows = (
+            TokenUsage.objects
+            .filter(date__range=(start, end))
+            .values('category', 'model')
+            .annotate(prompt=Sum('prompt_tokens'), completion=Sum('completion_tokens'), calls=Sum('calls'))
+            .order_by('category', 'model')
+        )
+        categories = {}
+        for row in rows:
+            totals = categories.setdefault(row['category'], {'calls': 0, 'prompt': 0, 'completion': 0, 'cost': 0.0})
+            totals['calls'] += row['calls']
+            totals['prompt'] += row['prompt']
+            totals['completion'] += row['completion']
+            totals['cost'] += token_cost(row['model'], row['prompt'], row['completion'])
+
+        self.stdout.write(f'{start} ~ {end}')
+        self.stdout.write(f"{'카테고리':<12}{'호출':>8}{'프롬프트':>14}{'응답':>14}{'비용(USD)':>12}")
+        total_cost = 0.0
+        for category, totals in sorted(categories.items(), key=lambda item: -item[1]['cost']):
+            total_cost += totals['cost']
+            self.stdout.write(
+                f"{category:<12}{totals['calls']:>8,}{totals['prompt']:>14,}{totals['completion']:>14,}"
+                f"{totals['cost']:>12.4f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f'합계 비용 {total_cost:.4f} USD'))
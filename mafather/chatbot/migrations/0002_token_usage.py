@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenUsage',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField(verbose_name='사용 날짜')),
+                ('category', models.CharField(choices=[('general', '일반 상담'), ('development', '발달 상담'), ('health', '건강 상담'), ('behavior', '행동 상담'), ('nutrition', '영양 상담'), ('education', '교육 상담'), ('sleep', '수면 상담'), ('emergency', '응급 상담')], max_length=50, verbose_name='상담 카테고리')),
+                ('model', models.CharField(max_length=100, verbose_name='모델')),
+                ('prompt_tokens', models.BigIntegerField(default=0, verbose_name='프롬프트 토큰 수')),
+                ('completion_tokens', models.BigIntegerField(default=0, verbose_name='응답 토큰 수')),
+                ('calls', models.IntegerField(default=0, verbose_name='호출 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='token_usages', to='chatbot.chatsession', verbose_name='세션')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='token_usages', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '토큰 사용량',
+                'verbose_name_plural': '토큰 사용량들',
+                'db_table': 'token_usages',
+                'indexes': [models.Index(fields=['date', 'category'], name='token_usage_date_2aa1f6_idx'), models.Index(fields=['user', 'date'], name='token_usage_user_id_d22b22_idx')],
+                'unique_together': {('date', 'session', 'model')},
+            },
+        ),
+    ]
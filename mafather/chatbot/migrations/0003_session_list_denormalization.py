@@ -0,0 +1,54 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_session_messages(apps, schema_editor):
+    """기존 세션의 메시지 수/마지막 메시지 미리보기 채우기"""
+    ChatSession = apps.get_model('chatbot', 'ChatSession')
+    ChatMessage = apps.get_model('chatbot', 'ChatMessage')
+    for session in ChatSession.objects.filter(messages__isnull=False).distinct().iterator():
+        messages = ChatMessage.objects.filter(session_id=session.pk)
+        last = messages.order_by('-created_at', '-id').first()
+        content = ' '.join(last.content.split())
+        session.message_count = messages.count()
+        session.last_message_preview = content if len(content) <= 200 else content[:197] + '...'
+        session.last_message_at = last.created_at
+        session.save(update_fields=['message_count', 'last_message_preview', 'last_message_at'])
+    ChatSession.objects.filter(last_message_at__isnull=True).update(last_message_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_token_usage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chatmessage',
+            name='chat_messag_session_70d2c0_idx',
+        ),
+        migrations.AddField(
+            model_name='chatsession',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=200, verbose_name='마지막 메시지 미리보기'),
+        ),
+        migrations.AddField(
+            model_name='chatsession',
+            name='message_count',
+            field=models.IntegerField(default=0, verbose_name='메시지 수'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', 'created_at', 'id'], name='chat_messages_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['user', 'deleted_at', '-last_message_at', '-id'], name='chat_sessions_recent_idx'),
+        ),
+        migrations.RunPython(backfill_session_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0003_session_list_denormalization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatsession',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='보관 시간'),
+        ),
+        migrations.CreateModel(
+            name='ChatMessageArchive',
+            fields=[
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='chatbot.chatsession', verbose_name='세션')),
+                ('codec', models.CharField(choices=[('zstd', 'Zstandard'), ('zlib', 'zlib')], max_length=10, verbose_name='압축 방식')),
+                ('data', models.BinaryField(verbose_name='압축한 메시지 목록')),
+                ('message_count', models.IntegerField(verbose_name='메시지 수')),
+                ('raw_size', models.IntegerField(verbose_name='압축 전 크기')),
+                ('first_message_at', models.DateTimeField(blank=True, null=True, verbose_name='첫 메시지 시간')),
+                ('last_message_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 메시지 시간')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='보관 시간')),
+            ],
+            options={
+                'verbose_name': '채팅 메시지 보관본',
+                'verbose_name_plural': '채팅 메시지 보관본들',
+                'db_table': 'chat_message_archives',
+                'indexes': [models.Index(fields=['last_message_at'], name='chat_messag_last_me_6037ec_idx')],
+            },
+        ),
+    ]
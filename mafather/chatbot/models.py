@@ -1,5 +1,6 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 from api_service.models import User
 
@@ -32,6 +33,11 @@ class ChatSession(models.Model):
     total_tokens = models.IntegerField(default=0, verbose_name='총 사용 토큰 수')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active', verbose_name='상태')
     last_message_at = models.DateTimeField(blank=True, null=True, verbose_name='마지막 메시지 시간')
+    # 세션 목록용 비정규화 필드 (ChatMessage 저장/삭제 시 갱신)
+    message_count = models.IntegerField(default=0, verbose_name='메시지 수')
+    last_message_preview = models.CharField(max_length=200, blank=True, default='', verbose_name='마지막 메시지 미리보기')
+    # 메시지를 chat_message_archives로 옮긴 시간 (chatbot.archive)
+    archived_at = models.DateTimeField(blank=True, null=True, verbose_name='보관 시간')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정 시간')
     deleted_at = models.DateTimeField(blank=True, null=True, verbose_name='삭제 시간')
@@ -44,11 +50,19 @@ class ChatSession(models.Model):
         indexes = [
             models.Index(fields=['user']),
             models.Index(fields=['status']),
+            # 세션 목록 (사용자별 최근 대화순 keyset 페이지네이션)
+            models.Index(fields=['user', 'deleted_at', '-last_message_at', '-id'], name='chat_sessions_recent_idx'),
         ]
 
     def __str__(self):
         return f"{self.user.name} - {self.title} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        # 메시지가 없는 새 세션도 목록 정렬(-last_message_at)에 들어가도록 생성 시간으로 채움
+        if self._state.adding and self.last_message_at is None:
+            self.last_message_at = timezone.now()
+        super().save(*args, **kwargs)
+
     def soft_delete(self):
         """소프트 삭제"""
         self.deleted_at = timezone.now()
@@ -56,9 +70,9 @@ class ChatSession(models.Model):
         self.save()
 
     def add_tokens(self, token_count):
-        """토큰 사용량 추가"""
+        """토큰 사용량 추가 (동시에 저장되는 메시지가 서로 덮어쓰지 않도록 DB에서 더함)"""
+        ChatSession.objects.filter(pk=self.pk).update(total_tokens=F('total_tokens') + token_count)
         self.total_tokens += token_count
-        self.save(update_fields=['total_tokens'])
 
     def update_last_message_time(self):
         """마지막 메시지 시간 업데이트"""
@@ -70,11 +84,6 @@ class ChatSession(models.Model):
         self.status = 'completed'
         self.save(update_fields=['status'])
 
-    @property
-    def message_count(self):
-        """메시지 수"""
-        return self.messages.count()
-
     @property
     def duration_minutes(self):
         """세션 지속 시간 (분)"""
@@ -107,7 +116,8 @@ class ChatMessage(models.Model):
         verbose_name_plural = '채팅 메시지들'
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['session']),
+            # 세션별 메시지를 시간순으로 (이전 메시지 커서 페이지네이션)
+            models.Index(fields=['session', 'created_at', 'id'], name='chat_messages_session_idx'),
             models.Index(fields=['created_at']),
         ]
 
@@ -116,11 +126,36 @@ class ChatMessage(models.Model):
         return f"[{self.get_role_display()}] {content_preview}"
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # 메시지 저장 시 세션의 토큰 수와 마지막 메시지 시간 업데이트
-        if self.tokens > 0:
-            self.session.add_tokens(self.tokens)
-        self.session.update_last_message_time()
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                # 새 메시지면 세션의 메시지 수/토큰 수/마지막 메시지 정보를 UPDATE 한 번으로 갱신
+                ChatSession.objects.filter(pk=self.session_id).update(
+                    message_count=F('message_count') + 1,
+                    total_tokens=F('total_tokens') + self.tokens,
+                    last_message_at=self.created_at,
+                    last_message_preview=self.preview(),
+                    updated_at=timezone.now(),
+                )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            last = ChatMessage.objects.filter(session_id=self.session_id).order_by('-created_at', '-id').first()
+            ChatSession.objects.filter(pk=self.session_id).update(
+                message_count=F('message_count') - 1,
+                last_message_at=last.created_at if last else F('created_at'),
+                last_message_preview=last.preview() if last else '',
+                updated_at=timezone.now(),
+            )
+        return result
+
+    def preview(self):
+        """세션 목록에 보여줄 앞부분"""
+        content = ' '.join(self.content.split())
+        limit = ChatSession._meta.get_field('last_message_preview').max_length
+        return content if len(content) <= limit else content[:limit - 3] + '...'
 
     @property
     def is_user_message(self):
@@ -130,4 +165,66 @@ class ChatMessage(models.Model):
     @property
     def is_assistant_message(self):
         """어시스턴트 메시지 여부"""
-        return self.role == 'assistant'
\ No newline at end of file
+        return self.role == 'assistant'
+
+class ChatMessageArchive(models.Model):
+    """오래된 세션의 메시지 보관본 (세션당 한 행, 압축한 JSON, chatbot.archive 참고)"""
+
+    CODEC_CHOICES = [
+        ('zstd', 'Zstandard'),
+        ('zlib', 'zlib'),
+    ]
+
+    session = models.OneToOneField(
+        ChatSession, on_delete=models.CASCADE, primary_key=True, related_name='archive', verbose_name='세션'
+    )
+    codec = models.CharField(max_length=10, choices=CODEC_CHOICES, verbose_name='압축 방식')
+    data = models.BinaryField(verbose_name='압축한 메시지 목록')
+    message_count = models.IntegerField(verbose_name='메시지 수')
+    raw_size = models.IntegerField(verbose_name='압축 전 크기')
+    first_message_at = models.DateTimeField(blank=True, null=True, verbose_name='첫 메시지 시간')
+    last_message_at = models.DateTimeField(blank=True, null=True, verbose_name='마지막 메시지 시간')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='보관 시간')
+
+    class Meta:
+        db_table = 'chat_message_archives'
+        verbose_name = '채팅 메시지 보관본'
+        verbose_name_plural = '채팅 메시지 보관본들'
+        indexes = [
+            # 기간 단위 보관 정책 (오래된 보관본 정리/이동)
+            models.Index(fields=['last_message_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id} - {self.message_count}개 ({self.codec})"
+
+class TokenUsage(models.Model):
+    """LLM 토큰 사용량 일별 집계 (chatbot.ledger가 Redis/메모리 카운터에서 주기적으로 옮겨 옴)"""
+
+    id = models.BigAutoField(primary_key=True)
+    date = models.DateField(verbose_name='사용 날짜')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='token_usages', verbose_name='사용자')
+    # 세션이 지워져도 비용 기록은 남김 (카테고리는 기록 시점 값을 복사)
+    session = models.ForeignKey(
+        ChatSession, on_delete=models.SET_NULL, blank=True, null=True,
+        related_name='token_usages', verbose_name='세션'
+    )
+    category = models.CharField(max_length=50, choices=ChatSession.CATEGORY_CHOICES, verbose_name='상담 카테고리')
+    model = models.CharField(max_length=100, verbose_name='모델')
+    prompt_tokens = models.BigIntegerField(default=0, verbose_name='프롬프트 토큰 수')
+    completion_tokens = models.BigIntegerField(default=0, verbose_name='응답 토큰 수')
+    calls = models.IntegerField(default=0, verbose_name='호출 수')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정 시간')
+
+    class Meta:
+        db_table = 'token_usages'
+        verbose_name = '토큰 사용량'
+        verbose_name_plural = '토큰 사용량들'
+        unique_together = ['date', 'session', 'model']
+        indexes = [
+            models.Index(fields=['date', 'category']),
+            models.Index(fields=['user', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.category} {self.model} - {self.prompt_tokens + self.completion_tokens}"
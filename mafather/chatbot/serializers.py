@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from .models import ChatMessage, ChatSession
+
+class ChatSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChatSession
+        fields = [
+            'id', 'title', 'category', 'status', 'message_count', 'last_message_preview',
+            'last_message_at', 'total_tokens', 'created_at',
+        ]
+
+class ChatMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChatMessage
+        fields = ['id', 'role', 'content', 'tokens', 'created_at']
@@ -1,3 +1,338 @@
-from django.test import TestCase
+import datetime
+import importlib.util
+import io
+import unittest
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_service.models import User
+from . import archive, ledger, llm
+from .models import ChatMessage, ChatMessageArchive, ChatSession, TokenUsage
+
+
+@override_settings(REDIS_URL=None, LLM_DAILY_TOKEN_QUOTA=1000, LLM_MONTHLY_TOKEN_QUOTA=1500)
+class TokenLedgerTestCase(TestCase):
+    def setUp(self):
+        ledger.reset_store()
+        self.addCleanup(ledger.reset_store)
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.session = ChatSession.objects.create(user=self.user, title='수면 상담', category='sleep')
+        self.other_session = ChatSession.objects.create(user=self.user, title='영양 상담', category='nutrition')
+
+    def test_quota(self):
+        """일/월 한도 확인 테스트"""
+        ledger.check_quota(self.user.id, estimated_tokens=1000)
+        with self.assertNumQueries(0):
+            ledger.record_usage(self.session, 600, 200, 'gpt-4o-mini')
+        self.assertEqual(ledger.usage(self.user.id), (800, 800))
+
+        ledger.check_quota(self.user.id, estimated_tokens=200)
+        with self.assertRaises(ledger.QuotaExceeded) as cm:
+            ledger.check_quota(self.user.id, estimated_tokens=201)
+        self.assertEqual((cm.exception.period, cm.exception.limit, cm.exception.used), ('일일', 1000, 800))
+
+        # 다음 날은 일일 한도가 새로 시작하지만 월간 한도는 이어짐
+        today = timezone.localdate()
+        tomorrow = today + datetime.timedelta(days=1)
+        if tomorrow.month == today.month:
+            with mock.patch('django.utils.timezone.localdate', return_value=tomorrow):
+                self.assertEqual(ledger.usage(self.user.id), (0, 800))
+                with self.assertRaises(ledger.QuotaExceeded) as cm:
+                    ledger.check_quota(self.user.id, estimated_tokens=701)
+                self.assertEqual(cm.exception.period, '월간')
+
+    def test_rollup(self):
+        """카운터를 일별 집계 테이블로 옮기는지 테스트"""
+        ledger.record_usage(self.session, 100, 50, 'gpt-4o-mini')
+        ledger.record_usage(self.session, 200, 70, 'gpt-4o-mini')
+        ledger.record_usage(self.other_session, 10, 5, 'gpt-4o')
+        self.assertEqual(ledger.rollup(), 2)
+        self.assertEqual(ledger.rollup(), 0)
+
+        usage = TokenUsage.objects.get(session=self.session)
+        self.assertEqual(
+            (usage.category, usage.prompt_tokens, usage.completion_tokens, usage.calls),
+            ('sleep', 300, 120, 2),
+        )
+
+        ledger.record_usage(self.session, 1, 1, 'gpt-4o-mini')
+        ledger.rollup()
+        usage.refresh_from_db()
+        self.assertEqual((usage.prompt_tokens, usage.calls), (301, 3))
+
+        # 세션이 지워져도 사용량은 남김
+        ledger.record_usage(self.other_session, 10, 5, 'gpt-4o')
+        self.other_session.delete()
+        ledger.rollup()
+        orphan = TokenUsage.objects.filter(session__isnull=True)
+        self.assertEqual([(row.category, row.prompt_tokens) for row in orphan], [('nutrition', 20)])
+
+        # 다른 사용자의 지워진 세션 사용량과는 섞이지 않음
+        other_user = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        other_user_session = ChatSession.objects.create(user=other_user, title='영양 상담', category='nutrition')
+        ledger.record_usage(other_user_session, 7, 3, 'gpt-4o')
+        other_user_session.delete()
+        ledger.rollup()
+        orphan = TokenUsage.objects.filter(session__isnull=True).order_by('prompt_tokens')
+        self.assertEqual(
+            [(row.user_id, row.prompt_tokens) for row in orphan],
+            [(other_user.id, 7), (self.user.id, 20)],
+        )
+
+    def test_rollup_failure_keeps_counters(self):
+        """DB 반영에 실패하면 카운터를 되돌려서 다음 rollup에서 반영하는지 테스트"""
+        ledger.record_usage(self.session, 100, 50, 'gpt-4o-mini')
+        with mock.patch.object(ledger, '_apply', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                ledger.rollup()
+        self.assertFalse(TokenUsage.objects.exists())
+        self.assertEqual(ledger.rollup(), 1)
+        self.assertEqual(TokenUsage.objects.get().prompt_tokens, 100)
+
+    def test_rollup_drops_deleted_users(self):
+        """탈퇴한 사용자의 미반영 사용량 때문에 다른 사용량 반영이 막히지 않는지 테스트"""
+        gone = User.objects.create_user(email='gone@example.com', password='x', name='Gone')
+        gone_session = ChatSession.objects.create(user=gone, title='수면 상담', category='sleep')
+        ledger.record_usage(gone_session, 100, 50, 'gpt-4o-mini')
+        ledger.record_usage(self.session, 10, 5, 'gpt-4o-mini')
+        gone.delete()
+
+        with self.assertLogs('chatbot.ledger', 'WARNING'):
+            self.assertEqual(ledger.rollup(), 1)
+        self.assertEqual(ledger.rollup(), 0)
+        self.assertEqual(list(TokenUsage.objects.values_list('user_id', 'prompt_tokens')), [(self.user.id, 10)])
+
+    @override_settings(LLM_TOKEN_PRICES={
+        'default': {'prompt': 1.0, 'completion': 2.0},
+        'gpt-4o': {'prompt': 10.0, 'completion': 20.0},
+    })
+    def test_token_report(self):
+        """카테고리별 비용 보고서 테스트"""
+        ledger.record_usage(self.session, 1_000_000, 500_000, 'gpt-4o-mini')  # 1 + 1 USD
+        ledger.record_usage(self.other_session, 100_000, 100_000, 'gpt-4o')  # 1 + 2 USD
+        call_command('rollup_token_usage', stdout=io.StringIO())
+        out = io.StringIO()
+        call_command('token_report', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[2].startswith('nutrition'))
+        self.assertTrue(lines[2].endswith('3.0000'))
+        self.assertTrue(lines[3].startswith('sleep'))
+        self.assertIn('합계 비용 5.0000 USD', lines[-1])
+
+    def test_message_tokens_added_atomically(self):
+        """메시지 토큰이 세션 합계에 DB 연산으로 더해지는지 테스트"""
+        stale = ChatSession.objects.get(id=self.session.id)
+        ChatMessage.objects.create(session=self.session, role='user', content='질문', tokens=10)
+        ChatMessage.objects.create(session=stale, role='assistant', content='답변', tokens=30)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.total_tokens, 40)
+
+
+@override_settings(CHAT_SESSION_PAGE_SIZE=2, CHAT_MESSAGE_PAGE_SIZE=3)
+class ChatHistoryTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.session = ChatSession.objects.create(user=self.user, title='수면 상담', category='sleep')
+
+    def test_denormalized_fields(self):
+        """메시지 추가/삭제 시 세션의 메시지 수와 미리보기가 갱신되는지 테스트"""
+        self.assertIsNotNone(self.session.last_message_at)
+        first = ChatMessage.objects.create(session=self.session, role='user', content='밤에   자주\n깨요', tokens=5)
+        second = ChatMessage.objects.create(session=self.session, role='assistant', content='가' * 300, tokens=7)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.message_count, 2)
+        self.assertEqual(self.session.total_tokens, 12)
+        self.assertEqual(self.session.last_message_at, second.created_at)
+        self.assertEqual(len(self.session.last_message_preview), 200)
+        self.assertTrue(self.session.last_message_preview.endswith('...'))
+
+        second.delete()
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.message_count, 1)
+        self.assertEqual(self.session.last_message_preview, '밤에 자주 깨요')
+        self.assertEqual(self.session.last_message_at, first.created_at)
+
+        first.delete()
+        self.session.refresh_from_db()
+        self.assertEqual((self.session.message_count, self.session.last_message_preview), (0, ''))
+        self.assertEqual(self.session.last_message_at, self.session.created_at)
+
+    def test_session_list(self):
+        """세션 목록이 최근 대화순으로 커서 페이지네이션 되는지 테스트"""
+        other = ChatSession.objects.create(user=self.user, title='영양 상담', category='nutrition')
+        deleted = ChatSession.objects.create(user=self.user, title='삭제됨', category='general')
+        deleted.soft_delete()
+        ChatMessage.objects.create(session=self.session, role='user', content='최근 질문')
+        newest = ChatSession.objects.create(user=self.user, title='놀이 상담', category='play')
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123', name='Other')
+        ChatSession.objects.create(user=other_user, title='남의 세션', category='sleep')
+
+        url = reverse('chat-session-list')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['results']], [str(newest.id), str(self.session.id)])
+        self.assertEqual(response.data['results'][1]['message_count'], 1)
+        self.assertEqual(response.data['results'][1]['last_message_preview'], '최근 질문')
+
+        response = self.client.get(url, {'cursor': response.data['next_cursor']})
+        self.assertEqual([item['id'] for item in response.data['results']], [str(other.id)])
+        self.assertIsNone(response.data['next_cursor'])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'invalid'}).status_code, 400)
+
+    def test_message_history(self):
+        """최근 메시지부터 이전 메시지로 페이지를 넘기는지 테스트"""
+        base = timezone.now()
+        messages = []
+        for index in range(7):
+            message = ChatMessage.objects.create(session=self.session, role='user', content=f'메시지 {index}')
+            ChatMessage.objects.filter(id=message.id).update(created_at=base + datetime.timedelta(seconds=index))
+            messages.append(str(message.id))
+
+        url = reverse('chat-message-list', args=[self.session.id])
+        pages = []
+        cursor = None
+        while True:
+            with self.assertNumQueries(2):
+                response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            pages.append([item['id'] for item in response.data['results']])
+            cursor = response.data['previous_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(pages, [messages[4:], messages[1:4], messages[:1]])
+
+    def test_other_users_session(self):
+        """다른 사용자의 세션 메시지는 조회할 수 없는지 테스트"""
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123', name='Other')
+        self.client.force_authenticate(user=other_user)
+        response = self.client.get(reverse('chat-message-list', args=[self.session.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CHAT_MESSAGE_PAGE_SIZE=3, CHAT_ARCHIVE_AFTER_DAYS=30)
+class ChatArchiveTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.old = timezone.now() - datetime.timedelta(days=60)
+        self.session = self._session('completed', self.old)
+        self.messages = []
+        for index in range(5):
+            message = ChatMessage.objects.create(
+                session=self.session, role='user' if index % 2 == 0 else 'assistant',
+                content=f'메시지 {index} ' * 20, tokens=index, metadata={'index': index},
+            )
+            created_at = self.old + datetime.timedelta(seconds=index, microseconds=123457)
+            ChatMessage.objects.filter(id=message.id).update(created_at=created_at)
+            self.messages.append(str(message.id))
+        ChatSession.objects.filter(id=self.session.id).update(last_message_at=created_at)
+
+    def _session(self, status, last_message_at):
+        session = ChatSession.objects.create(user=self.user, title='상담', category='sleep', status=status)
+        ChatSession.objects.filter(id=session.id).update(last_message_at=last_message_at)
+        return session
+
+    def test_archive_old_sessions(self):
+        """오래된 끝난 세션만 보관되고 메시지가 핫 테이블에서 지워지는지 테스트"""
+        active = self._session('active', self.old)
+        ChatMessage.objects.create(session=active, role='user', content='진행 중')
+        ChatSession.objects.filter(id=active.id).update(last_message_at=self.old)
+        recent = ChatSession.objects.create(user=self.user, title='최근', category='sleep', status='completed')
+        ChatMessage.objects.create(session=recent, role='user', content='최근 대화')
+
+        out = io.StringIO()
+        call_command('archive_chat_messages', '--dry-run', stdout=out)
+        self.assertIn('보관 대상 세션 1개', out.getvalue())
+
+        call_command('archive_chat_messages', stdout=io.StringIO())
+        self.assertFalse(ChatMessage.objects.filter(session=self.session).exists())
+        self.assertEqual(ChatMessage.objects.count(), 2)
+        self.session.refresh_from_db()
+        self.assertIsNotNone(self.session.archived_at)
+        self.assertEqual(self.session.message_count, 5)
+
+        stored = ChatMessageArchive.objects.get(session=self.session)
+        self.assertEqual(stored.message_count, 5)
+        self.assertLess(len(stored.data), stored.raw_size)
+
+        messages = archive.messages(self.session)
+        self.assertEqual([str(message.id) for message in messages], self.messages)
+        self.assertEqual(messages[4].metadata, {'index': 4})
+        self.assertEqual(messages[4].created_at, ChatSession.objects.get(id=self.session.id).last_message_at)
+
+    def test_messages_appended_after_archive(self):
+        """보관 후 추가된 메시지도 함께 조회되고 다음 보관 때 합쳐지는지 테스트"""
+        archive.archive_session(self.session.id)
+        self.session.refresh_from_db()
+        late = ChatMessage.objects.create(session=self.session, role='user', content='추가 질문')
+        self.assertEqual([str(message.id) for message in archive.messages(self.session)], self.messages + [str(late.id)])
+
+        self.assertEqual(archive.archive_session(self.session.id), 1)
+        stored = ChatMessageArchive.objects.get(session=self.session)
+        self.assertEqual(stored.message_count, 6)
+        self.assertEqual(len(archive.messages(self.session)), 6)
+
+    def test_archived_message_history(self):
+        """보관된 세션도 같은 커서로 페이지를 넘기는지 테스트"""
+        archive.archive_session(self.session.id)
+        url = reverse('chat-message-list', args=[self.session.id])
+        response = self.client.get(url)
+        self.assertEqual([item['id'] for item in response.data['results']], self.messages[2:])
+        response = self.client.get(url, {'cursor': response.data['previous_cursor']})
+        self.assertEqual([item['id'] for item in response.data['results']], self.messages[:2])
+        self.assertIsNone(response.data['previous_cursor'])
+
+    def test_codecs(self):
+        """압축/해제가 zstd 또는 zlib로 되는지 테스트"""
+        raw = '안녕하세요 '.encode() * 100
+        codec, data = archive.compress(raw)
+        self.assertIn(codec, ('zstd', 'zlib'))
+        self.assertEqual(archive.decompress(codec, data), raw)
+        with mock.patch.object(archive, '_zstd', return_value=None):
+            codec, data = archive.compress(raw)
+            self.assertEqual(codec, 'zlib')
+            self.assertEqual(archive.decompress(codec, data), raw)
+
+
+@unittest.skipUnless(importlib.util.find_spec('tiktoken'), 'tiktoken이 설치되지 않음')
+@override_settings(REDIS_URL=None, LLM_DAILY_TOKEN_QUOTA=1000, LLM_MONTHLY_TOKEN_QUOTA=0)
+class LLMFacadeTestCase(TestCase):
+    def setUp(self):
+        ledger.reset_store()
+        self.addCleanup(ledger.reset_store)
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.session = ChatSession.objects.create(user=self.user, title='수면 상담', category='sleep')
+
+    def test_encoding_cached(self):
+        """tiktoken 인코딩을 한 번만 만드는지 테스트"""
+        self.assertIs(llm.encoding('gpt-4o-mini'), llm.encoding('gpt-4o-mini'))
+        self.assertIs(llm.encoding('unknown-model'), llm.encoding('unknown-model'))
+        self.assertGreater(llm.count_tokens('아기가 밤에 자주 깨요'), 0)
+
+    def test_chat_records_usage(self):
+        """LLM 호출 전 한도 확인, 호출 후 사용량 기록 테스트"""
+        response = mock.Mock(content='낮잠 시간을 확인해 보세요.', response_metadata={
+            'token_usage': {'prompt_tokens': 120, 'completion_tokens': 30},
+        })
+        model = mock.Mock()
+        model.invoke.return_value = response
+        messages = [('system', '육아 상담사입니다.'), ('user', '아기가 밤에 자주 깨요')]
+        with mock.patch.object(llm, 'chat_model', return_value=model):
+            self.assertEqual(llm.chat(self.session, messages, model='gpt-4o-mini'), response.content)
+            model.invoke.assert_called_once_with(messages)
+            self.assertEqual(ledger.usage(self.user.id), (150, 150))
+
+            with override_settings(LLM_DAILY_TOKEN_QUOTA=160):
+                with self.assertRaises(ledger.QuotaExceeded):
+                    llm.chat(self.session, messages, model='gpt-4o-mini')
+            self.assertEqual(model.invoke.call_count, 1)
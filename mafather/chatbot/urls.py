@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('sessions/', views.get_sessions, name='chat-session-list'),
+    path('sessions/<uuid:session_id>/messages/', views.get_messages, name='chat-message-list'),
+]
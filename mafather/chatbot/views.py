@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from django.conf import settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from mafather.db_router import read_from_replica
+from . import history
+from .serializers import ChatMessageSerializer, ChatSessionSerializer
 
-# Create your views here.
+# 내 채팅 세션 목록 API (최근 대화순, keyset 커서 페이지네이션)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_sessions(request):
+    sessions = history.session_queryset(request.user)
+    category = request.query_params.get('category')
+    if category:
+        sessions = sessions.filter(category=category)
+    try:
+        items, next_cursor = history.session_page(
+            sessions, request.query_params.get('cursor'), settings.CHAT_SESSION_PAGE_SIZE
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response({"results": ChatSessionSerializer(items, many=True).data, "next_cursor": next_cursor})
+
+# 채팅 메시지 기록 API (최근 페이지부터 cursor로 이전 메시지, 페이지 안은 시간순)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_messages(request, session_id):
+    session = history.session_queryset(request.user).filter(id=session_id).first()
+    if session is None:
+        return Response({"error": "채팅 세션을 찾을 수 없습니다."}, status=404)
+    try:
+        items, previous_cursor = history.message_page(
+            session, request.query_params.get('cursor'), settings.CHAT_MESSAGE_PAGE_SIZE
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response({"results": ChatMessageSerializer(items, many=True).data, "previous_cursor": previous_cursor})
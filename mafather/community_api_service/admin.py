@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Category, Post, Comment, PostImage, Like
+from .models import Category, Post, PostCounter, Comment, PostImage, Like, Notification
 
 
 class PostImageInline(admin.TabularInline):
@@ -45,13 +45,13 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ['post_type', 'status', 'category', 'is_anonymous', 'is_pinned', 'is_solved', 'created_at']
     search_fields = ['title', 'content', 'user__name', 'user__email']
     ordering = ['-is_pinned', '-created_at']
-    readonly_fields = ['id', 'view_count', 'like_count', 'comment_count', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'view_count', 'like_count', 'comment_count', 'hot_score', 'created_at', 'updated_at']
     inlines = [PostImageInline]
     
     fieldsets = (
         (None, {'fields': ('user', 'category', 'post_type', 'title', 'content')}),
         ('상태 및 옵션', {'fields': ('status', 'is_anonymous', 'is_solved', 'is_pinned')}),
-        ('통계', {'fields': ('view_count', 'like_count', 'comment_count')}),
+        ('통계', {'fields': ('view_count', 'like_count', 'comment_count', 'hot_score')}),
         ('시스템정보', {'fields': ('id', 'created_at', 'updated_at', 'deleted_at')}),
     )
 
@@ -59,6 +59,16 @@ class PostAdmin(admin.ModelAdmin):
         return super().get_queryset(request).filter(deleted_at__isnull=True)
 
 
+@admin.register(PostCounter)
+class PostCounterAdmin(admin.ModelAdmin):
+    """게시글 수 집계 관리자 (게시글 저장 시 자동 갱신)"""
+
+    list_display = ['category', 'post_type', 'post_count', 'unsolved_count', 'updated_at']
+    list_filter = ['post_type']
+    ordering = ['post_type', 'category__order']
+    readonly_fields = ['category', 'post_type', 'post_count', 'unsolved_count', 'updated_at']
+
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     """댓글 관리자"""
@@ -97,9 +107,10 @@ class PostImageAdmin(admin.ModelAdmin):
     search_fields = ['post__title', 'alt_text']
     ordering = ['post', 'order']
     readonly_fields = ['id', 'created_at']
+    raw_id_fields = ['image']
     
     fieldsets = (
-        (None, {'fields': ('post', 'image_url', 'alt_text', 'order')}),
+        (None, {'fields': ('post', 'image', 'image_url', 'alt_text', 'order')}),
         ('시스템정보', {'fields': ('id', 'created_at', 'deleted_at')}),
     )
 
@@ -139,3 +150,17 @@ class LikeAdmin(admin.ModelAdmin):
                 return f"댓글: {content}"
         return "대상을 찾을 수 없음"
     target_preview.short_description = '대상 미리보기'
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    """알림 관리자 (dispatch_notifications 명령으로 생성)"""
+
+    list_display = ['recipient', 'kind', 'target_type', 'actor_count', 'is_read', 'updated_at']
+    list_filter = ['kind', 'target_type', 'is_read']
+    search_fields = ['recipient__name', 'recipient__email']
+    ordering = ['-updated_at']
+    readonly_fields = [
+        'id', 'recipient', 'kind', 'target_type', 'target_id', 'post', 'actor_count',
+        'recent_actor_ids', 'last_actor', 'created_at', 'updated_at',
+    ]
@@ -0,0 +1,256 @@
+# community_api_service/autocomplete.py
+"""
+검색어 자동완성
+
+인기 검색어(SearchLog.query)와 게시글 제목(Post.title)으로 메모리 내 압축 접두사 트라이
+(radix trie)를 만들고, 각 노드에 상위 k개 추천어를 미리 계산해 둔다.
+키는 한글 자모 단위로 분해해서 저장하므로 입력 중인 음절('하' -> '한글')도 매칭된다.
+조회는 접두사 길이만큼만 트리를 따라 내려가므로 DB를 전혀 사용하지 않는다.
+"""
+import logging
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.utils import timezone
+
+from api_service.models import SearchLog
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+# 한글 음절 분해 테이블 (겹받침, 이중모음은 기본 자모로 풀어서 부분 입력도 매칭되게 함)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+JUNGSEONG = [
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ',
+    'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ',
+]
+JONGSEONG = [
+    '', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ',
+    'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ', 'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+# 단독으로 입력된 호환 자모 중 겹자모
+COMPAT_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_term(text):
+    """검색어 정규화 (앞뒤 공백 제거, 연속 공백 축소, 소문자화)"""
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def to_jamo(text):
+    """문자열을 자모 단위 키로 변환"""
+    parts = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            parts.append(CHOSEONG[index // 588])
+            parts.append(JUNGSEONG[(index % 588) // 28])
+            parts.append(JONGSEONG[index % 28])
+        else:
+            parts.append(COMPAT_JAMO.get(char, char))
+    return ''.join(parts)
+
+
+class _Node:
+    """트라이 노드 (label: 부모로부터의 간선 문자열, top: (가중치, 추천어) 내림차순 목록)"""
+
+    __slots__ = ('label', 'children', 'top')
+
+    def __init__(self, label='', children=None, top=()):
+        self.label = label
+        self.children = children if children is not None else {}
+        self.top = top
+
+
+class PrefixTrie:
+    """
+    상위 k개 추천어를 노드마다 미리 계산해 두는 압축 접두사 트라이
+
+    가중치는 증가만 하므로 삽입 경로의 노드들만 갱신하면 top 목록이 항상 정확하다.
+    노드의 top 목록과 자식 연결은 새 객체로 교체하는 방식으로만 바꾸기 때문에
+    백그라운드 갱신 중에도 조회 스레드는 락 없이 읽을 수 있다.
+    """
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.root = _Node()
+        self.weights = {}
+
+    def __len__(self):
+        return len(self.weights)
+
+    def add(self, term, weight=1):
+        """추천어 가중치 누적 (없으면 새로 삽입)"""
+        term = normalize_term(term)
+        if not term:
+            return
+        total = self.weights.get(term, 0) + weight
+        self.weights[term] = total
+        entry = (total, term)
+
+        node = self.root
+        self._offer(node, entry)
+        key = to_jamo(term)
+        while key:
+            child = node.children.get(key[0])
+            if child is None:
+                node.children[key[0]] = _Node(key, top=(entry,))
+                return
+
+            label = child.label
+            common = _common_prefix_length(label, key)
+            if common < len(label):
+                # 간선 분할: 중간 노드를 완성한 뒤 한 번에 부모에 연결
+                rest = _Node(label[common:], child.children, child.top)
+                middle = _Node(label[:common], {rest.label[0]: rest}, child.top)
+                node.children[key[0]] = middle
+                child = middle
+
+            self._offer(child, entry)
+            node = child
+            key = key[common:]
+
+    def suggest(self, prefix, limit=None):
+        """접두사로 시작하는 추천어 목록 (가중치 내림차순)"""
+        limit = self.top_k if limit is None else min(limit, self.top_k)
+        key = to_jamo(normalize_term(prefix))
+        node = self.root
+        while key:
+            child = node.children.get(key[0])
+            if child is None:
+                return []
+            label = child.label
+            if key.startswith(label):
+                key = key[len(label):]
+                node = child
+            elif label.startswith(key):
+                node = child
+                break
+            else:
+                return []
+        return [term for _, term in node.top[:limit]]
+
+    def _offer(self, node, entry):
+        weight, term = entry
+        top = [item for item in node.top if item[1] != term]
+        if len(top) >= self.top_k and weight <= top[-1][0]:
+            return
+        top.append(entry)
+        top.sort(key=lambda item: (-item[0], item[1]))
+        node.top = tuple(top[:self.top_k])
+
+
+def _common_prefix_length(a, b):
+    length = min(len(a), len(b))
+    for i in range(length):
+        if a[i] != b[i]:
+            return i
+    return length
+
+
+class AutocompleteIndex:
+    """
+    DB에서 트라이를 만들고 백그라운드에서 갱신하는 인덱스
+
+    - 증분 갱신: 마지막 갱신 이후 생성된 검색 로그와 게시글만 읽어서 기존 트라이에 누적
+    - 전체 재구축: 삭제된 게시글과 기간이 지난 검색 로그를 정리하기 위해 주기적으로 새로 만들어 교체
+    """
+
+    def __init__(self):
+        self.trie = None
+        self.watermark = None
+        self.built_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def suggest(self, prefix, limit=None):
+        self.ensure_ready()
+        return self.trie.suggest(prefix, limit)
+
+    def ensure_ready(self):
+        """최초 조회 시 동기적으로 한 번 구축하고, 설정에 따라 백그라운드 갱신 스레드 시작"""
+        if self.trie is None:
+            self.rebuild()
+        if settings.AUTOCOMPLETE_BACKGROUND_REFRESH and self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name='autocomplete-refresh', daemon=True
+                    )
+                    self._thread.start()
+
+    def rebuild(self):
+        """트라이 전체 재구축 후 교체"""
+        with self._lock:
+            now = timezone.now()
+            trie = PrefixTrie(top_k=settings.AUTOCOMPLETE_TOP_K)
+            since = now - timedelta(days=settings.AUTOCOMPLETE_SEARCH_LOG_DAYS)
+            self._load(trie, search_log_since=since, post_since=None, until=now)
+            self.trie = trie
+            self.watermark = now
+            self.built_at = now
+
+    def refresh(self):
+        """마지막 갱신 이후 추가된 데이터만 기존 트라이에 반영"""
+        if self.trie is None:
+            self.rebuild()
+            return
+        with self._lock:
+            now = timezone.now()
+            self._load(self.trie, search_log_since=self.watermark, post_since=self.watermark, until=now)
+            self.watermark = now
+
+    def _load(self, trie, search_log_since, post_since, until):
+        search_logs = (
+            SearchLog.objects
+            .filter(created_at__gt=search_log_since, created_at__lte=until, results_count__gt=0)
+            .values('query')
+            .annotate(hits=Count('id'))
+        )
+        for row in search_logs.iterator():
+            trie.add(row['query'], row['hits'] * settings.AUTOCOMPLETE_SEARCH_LOG_WEIGHT)
+
+        posts = Post.objects.filter(
+            deleted_at__isnull=True, status='published', created_at__lte=until
+        )
+        if post_since is not None:
+            posts = posts.filter(created_at__gt=post_since)
+        for title in posts.values_list('title', flat=True).iterator():
+            trie.add(title, settings.AUTOCOMPLETE_POST_TITLE_WEIGHT)
+
+    def _run(self):
+        while True:
+            time.sleep(settings.AUTOCOMPLETE_REFRESH_SECONDS)
+            try:
+                age = timezone.now() - self.built_at
+                if age.total_seconds() >= settings.AUTOCOMPLETE_FULL_REBUILD_SECONDS:
+                    self.rebuild()
+                else:
+                    self.refresh()
+            except Exception:
+                logger.exception('자동완성 인덱스 갱신 실패')
+            finally:
+                # 이 스레드가 연 DB 연결은 다음 주기까지 붙잡고 있지 않음
+                connections.close_all()
+
+
+autocomplete_index = AutocompleteIndex()
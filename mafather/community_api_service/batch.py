@@ -0,0 +1,121 @@
+# community_api_service/batch.py
+"""
+모바일 동기화용 게시글/댓글 일괄 조회
+
+앱이 로컬 캐시에 있는 ID 목록을 한 번에 보내면 상세 조회 API와 같은 형식으로 돌려준다.
+캐시 복원은 새 조회가 아니므로 조회수는 올리지 않는다.
+
+updated_since를 함께 보내면 (delta 모드) 그 이후 수정된 행만 전체 본문으로 보내고,
+나머지 행은 본문 없이 좋아요 수 같은 카운터만 보낸다 (좋아요는 updated_at을 바꾸지 않음).
+어느 경우든 없거나 삭제된 ID는 missing으로 알려서 앱이 캐시에서 지우게 한다.
+다음 요청의 updated_since로는 응답의 server_time을 쓰면 된다 (조회 전에 잰 시간).
+"""
+import uuid
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+
+from . import feed
+from .models import Comment, Post
+from .serializers import CommentSerializer
+
+
+def parse_request(data):
+    """요청 본문 → (ID 목록, updated_since). 잘못된 값이면 ValueError"""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids 목록이 필요합니다.')
+    max_ids = settings.COMMUNITY_BATCH_MAX_IDS
+    if len(ids) > max_ids:
+        raise ValueError(f'한 번에 최대 {max_ids}개까지 조회할 수 있습니다.')
+    try:
+        # 순서를 유지하면서 중복 제거
+        ids = list(dict.fromkeys(uuid.UUID(str(value)) for value in ids))
+    except ValueError as e:
+        raise ValueError('잘못된 ID가 있습니다.') from e
+
+    since = data.get('updated_since')
+    if since:
+        parsed = parse_datetime(str(since))
+        if parsed is None:
+            raise ValueError('updated_since는 ISO 8601 형식이어야 합니다.')
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        since = parsed
+    return ids, since or None
+
+
+def _response(ids, items, unchanged, server_time):
+    found = {item['id'] for item in items} | {item['id'] for item in unchanged or ()}
+    order = {str(id_): index for index, id_ in enumerate(ids)}
+    items.sort(key=lambda item: order[item['id']])
+    data = {
+        'results': items,
+        'missing': [str(id_) for id_ in ids if str(id_) not in found],
+        'server_time': serializers.DateTimeField().to_representation(server_time),
+    }
+    if unchanged is not None:
+        data['unchanged'] = unchanged
+    return data
+
+
+def fetch_posts(posts, ids, since):
+    """posts: views.post_queryset()"""
+    server_time = timezone.now()
+    unchanged = None
+    if since is not None:
+        changed = []
+        unchanged = []
+        versions = Post.objects.filter(id__in=ids, deleted_at__isnull=True).values_list(
+            'id', 'updated_at', 'like_count', 'comment_count', 'view_count'
+        )
+        for post_id, updated_at, like_count, comment_count, view_count in versions:
+            if updated_at > since:
+                changed.append(post_id)
+            else:
+                unchanged.append({
+                    'id': str(post_id),
+                    'like_count': like_count,
+                    'comment_count': comment_count,
+                    'view_count': view_count,
+                })
+        ids_to_fetch = changed
+    else:
+        ids_to_fetch = ids
+    items = feed.serialize_feed(posts.filter(id__in=ids_to_fetch)) if ids_to_fetch else []
+    return _response(ids, items, unchanged, server_time)
+
+
+def fetch_comments(comments, ids, since):
+    """
+    comments: views.comment_queryset()
+
+    답글이 달리거나 수정/삭제된 댓글도 바뀐 것으로 본다 (답글 포함해서 응답하므로)
+    """
+    server_time = timezone.now()
+    live = {'deleted_at__isnull': True, 'post__deleted_at__isnull': True}
+    unchanged = None
+    if since is not None:
+        changed = []
+        unchanged = []
+        versions = (
+            Comment.objects
+            .filter(id__in=ids, **live)
+            .annotate(reply_updated_at=Max('replies__updated_at'))
+            .values_list('id', 'updated_at', 'reply_updated_at', 'like_count')
+        )
+        for comment_id, updated_at, reply_updated_at, like_count in versions:
+            if updated_at > since or (reply_updated_at is not None and reply_updated_at > since):
+                changed.append(comment_id)
+            else:
+                unchanged.append({'id': str(comment_id), 'like_count': like_count})
+        ids_to_fetch = changed
+    else:
+        ids_to_fetch = ids
+    items = []
+    if ids_to_fetch:
+        items = list(CommentSerializer(comments.filter(id__in=ids_to_fetch, **live), many=True).data)
+    return _response(ids, items, unchanged, server_time)
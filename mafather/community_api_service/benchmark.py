@@ -0,0 +1,138 @@
+# community_api_service/benchmark.py
+"""
+벤치마크 명령(bench_community, bench_render) 공용 도구
+
+별도의 테스트 DB를 만들고 지우는 일, 사용자/게시글/댓글/좋아요 시드 데이터 생성, 현재 커밋 조회를 담당한다.
+
+    old_name, temp_dir = benchmark.setup_database()
+    try:
+        users, posts, comments, like_count = benchmark.seed(random.Random(42), 50, 500, 2000, 2000)
+    finally:
+        benchmark.teardown_database(old_name, temp_dir)
+"""
+import os
+import subprocess
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from api_service.models import User
+from .models import Category, Post, PostCounter, Comment, Like
+
+
+# 테스트 DB
+
+def setup_database():
+    """벤치마크용 테스트 DB 생성 → (원래 DB 이름, 임시 디렉터리 또는 None)"""
+    setup_test_environment(debug=False)
+    connection = connections['default']
+    temp_dir = None
+    if connection.vendor == 'sqlite':
+        # 메모리 DB는 스레드 간 쓰기에서 테이블 잠금이 잦아 임시 파일 DB 사용
+        temp_dir = tempfile.mkdtemp(prefix='bench_')
+        connection.settings_dict['TEST']['NAME'] = os.path.join(temp_dir, 'bench.sqlite3')
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    for alias in connections:
+        if alias != 'default':
+            connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+    return old_name, temp_dir
+
+
+def teardown_database(old_name, temp_dir):
+    """setup_database로 만든 테스트 DB 삭제"""
+    connections.close_all()
+    connections['default'].creation.destroy_test_db(old_name, verbosity=0)
+    teardown_test_environment()
+    if temp_dir:
+        os.rmdir(temp_dir)
+
+
+# 시드 데이터
+
+def seed(rnd, users, posts, comments, likes):
+    """bulk_create로 시드 데이터 생성 → (사용자, 게시글, 댓글 목록, 좋아요 수)"""
+    now = timezone.now()
+    password = make_password('benchmark')
+
+    user_rows = [
+        User(email=f'bench{i}@example.com', name=f'벤치 사용자 {i}', password=password)
+        for i in range(users)
+    ]
+    User.objects.bulk_create(user_rows, batch_size=500)
+
+    categories = [
+        Category(name=f'{label} {i}', post_type=post_type, order=i)
+        for post_type, label in Category.POST_TYPE_CHOICES
+        for i in range(2)
+    ]
+    Category.objects.bulk_create(categories)
+
+    post_rows = []
+    for i in range(posts):
+        category = rnd.choice(categories)
+        post_rows.append(Post(
+            user=rnd.choice(user_rows),
+            category=category,
+            post_type=category.post_type,
+            title=f'벤치마크 게시글 {i}',
+            content='육아 이야기 ' * rnd.randint(5, 50),
+            is_solved=False if category.post_type == 'question' else None,
+            view_count=rnd.randint(0, 500),
+        ))
+
+    comment_rows = []
+    for i in range(comments):
+        post = rnd.choice(post_rows)
+        parents = [c for c in comment_rows[-20:] if c.post is post and c.parent is None]
+        parent = rnd.choice(parents) if parents and rnd.random() < 0.3 else None
+        comment_rows.append(Comment(
+            user=rnd.choice(user_rows),
+            post=post,
+            parent=parent,
+            depth=1 if parent else 0,
+            content=f'벤치마크 댓글 {i}',
+        ))
+        post.comment_count += 1
+
+    like_rows = []
+    seen = set()
+    targets = [('post', post) for post in post_rows] + [('comment', comment) for comment in comment_rows]
+    attempts = 0
+    while len(like_rows) < likes and targets and attempts < likes * 5:
+        attempts += 1
+        user = rnd.choice(user_rows)
+        target_type, target = rnd.choice(targets)
+        key = (user.id, target.id)
+        if key in seen:
+            continue
+        seen.add(key)
+        like_rows.append(Like(user=user, target_id=target.id, target_type=target_type))
+        target.like_count += 1
+
+    # 생성 시간을 흩어서 정렬/필터가 현실적인 분포를 갖도록 함 (auto_now_add라 bulk_create 후 갱신)
+    Post.objects.bulk_create(post_rows, batch_size=500)
+    Comment.objects.bulk_create(comment_rows, batch_size=500)
+    Like.objects.bulk_create(like_rows, batch_size=500)
+    for post in post_rows:
+        post.created_at = now - timedelta(minutes=rnd.randint(0, 60 * 24 * 30))
+    Post.objects.bulk_update(post_rows, ['created_at'], batch_size=500)
+    PostCounter.rebuild()  # bulk_create는 save()를 거치지 않음
+
+    return user_rows, post_rows, comment_rows, len(like_rows)
+
+
+def git_commit():
+    """현재 커밋 (짧은 해시), git이 없으면 None"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
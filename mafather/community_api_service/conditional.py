@@ -0,0 +1,88 @@
+# community_api_service/conditional.py
+"""
+게시글/댓글 상세 조회의 조건부 요청(ETag) 처리
+
+ETag는 직렬화 없이 values_list 한 번으로 만든다.
+- 게시글: (updated_at, like_count, comment_count)
+- 댓글: (updated_at, like_count) + 삭제되지 않은 답글의 (개수, 최근 수정 시간, 좋아요 합계)
+
+응답 본문 중 조회수(view_count)와 작성자/카테고리/이미지 정보는 ETag에 넣지 않는다 (weak ETag).
+If-None-Match가 맞아서 304를 돌려줄 때는 조회수도 올리지 않는다. 같은 클라이언트가 이미 본 글을
+다시 확인하는 요청이라 새 조회로 보지 않으며, 덕분에 304 응답은 쓰기 없이 읽기 쿼리 하나로 끝난다.
+
+Last-Modified는 보내지 않는다. 좋아요/답글 변경은 updated_at을 바꾸지 않아서
+If-Modified-Since만 보내는 클라이언트가 오래된 본문을 계속 쓰게 되기 때문이다.
+"""
+from django.db.models import Count, Max, Q, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .models import Comment, Post
+
+
+def make_etag(*parts):
+    values = []
+    for part in parts:
+        if part is None:
+            values.append('')
+        elif hasattr(part, 'timestamp'):
+            values.append(format(int(part.timestamp() * 1_000_000), 'x'))
+        else:
+            values.append(str(part))
+    return 'W/"%s"' % '-'.join(values)
+
+
+def _post_versions(post_id):
+    return Post.objects.filter(id=post_id, deleted_at__isnull=True).values_list(
+        'updated_at', 'like_count', 'comment_count'
+    )
+
+
+def _comment_versions(post_id, comment_id):
+    live_replies = Q(replies__deleted_at__isnull=True)
+    return (
+        Comment.objects
+        .filter(id=comment_id, post_id=post_id, deleted_at__isnull=True, post__deleted_at__isnull=True)
+        .annotate(
+            reply_count=Count('replies', filter=live_replies),
+            reply_updated_at=Max('replies__updated_at', filter=live_replies),
+            reply_like_count=Sum('replies__like_count', filter=live_replies),
+        )
+        .values_list('updated_at', 'like_count', 'reply_count', 'reply_updated_at', 'reply_like_count')
+    )
+
+
+def post_etag(post_id):
+    """게시글 ETag (없거나 삭제됐으면 None)"""
+    row = _post_versions(post_id).first()
+    return make_etag(*row) if row else None
+
+
+async def apost_etag(post_id):
+    row = await _post_versions(post_id).afirst()
+    return make_etag(*row) if row else None
+
+
+def comment_etag(post_id, comment_id):
+    """댓글 ETag (답글 포함, 없거나 삭제됐으면 None)"""
+    row = _comment_versions(post_id, comment_id).first()
+    return make_etag(*row) if row else None
+
+
+async def acomment_etag(post_id, comment_id):
+    row = await _comment_versions(post_id, comment_id).afirst()
+    return make_etag(*row) if row else None
+
+
+def not_modified(request, etag):
+    """If-None-Match가 ETag와 맞으면 304 응답, 아니면 None"""
+    if etag is None:
+        return None
+    return get_conditional_response(request, etag=etag)
+
+
+def with_etag(response, etag):
+    """ETag를 붙이고 매번 재검증하도록 설정"""
+    if etag is not None and response.status_code == 200:
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,96 @@
+# community_api_service/consumers.py
+import asyncio
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from .events import FEED_GROUP, post_group
+from .models import Post
+
+
+class CommunityEventConsumer(AsyncJsonWebsocketConsumer):
+    """
+    커뮤니티 이벤트 구독 기본 클래스
+
+    coalesce_key가 있는 이벤트(좋아요 수, 댓글 수)는 구독자마다
+    COMMUNITY_EVENT_COALESCE_SECONDS 간격으로 키별 마지막 값만 보낸다.
+    좋아요가 몰려도 구독자 한 명에게 가는 메시지는 초당 몇 개로 제한된다.
+    """
+
+    # 고정된 그룹을 구독하는 consumer는 이 목록만 지정 (channels의 groups 속성과는 별개)
+    subscribe_groups = ()
+
+    async def get_group_names(self):
+        """구독할 그룹 목록 (None이면 연결 거부, 기본은 subscribe_groups)"""
+        return list(self.subscribe_groups)
+
+    async def connect(self):
+        self.group_names = []
+        self._pending = {}
+        self._flush_task = None
+        self._last_flush = 0.0
+
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        group_names = await self.get_group_names()
+        if group_names is None:
+            await self.close(code=4404)
+            return
+
+        self.group_names = group_names
+        for group in group_names:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for group in self.group_names:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # 클라이언트 → 서버 메시지는 사용하지 않음
+        pass
+
+    async def community_event(self, message):
+        event = {'type': message['event'], 'data': message['data']}
+        key = message.get('coalesce_key')
+        if key is None:
+            await self.send_json(event)
+            return
+
+        self._pending[key] = event
+        if self._flush_task is None:
+            loop = asyncio.get_running_loop()
+            interval = settings.COMMUNITY_EVENT_COALESCE_SECONDS
+            delay = max(0.0, self._last_flush + interval - loop.time())
+            self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay):
+        if delay:
+            await asyncio.sleep(delay)
+        self._last_flush = asyncio.get_running_loop().time()
+        self._flush_task = None
+        pending, self._pending = self._pending, {}
+        for event in pending.values():
+            await self.send_json(event)
+
+
+class PostEventConsumer(CommunityEventConsumer):
+    """게시글 단위 이벤트 (새 댓글, 좋아요 수, 댓글 수)"""
+
+    async def get_group_names(self):
+        post_id = self.scope['url_route']['kwargs']['post_id']
+        if not await Post.objects.filter(id=post_id, deleted_at__isnull=True).aexists():
+            return None
+        return [post_group(post_id)]
+
+
+class FeedEventConsumer(CommunityEventConsumer):
+    """피드 이벤트 (게시글별 좋아요 수, 댓글 수)"""
+
+    subscribe_groups = (FEED_GROUP,)
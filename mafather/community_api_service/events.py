@@ -0,0 +1,87 @@
+# community_api_service/events.py
+"""
+커뮤니티 실시간 이벤트 발행
+
+댓글/좋아요 쓰기 경로에서 호출되며, 트랜잭션이 커밋된 뒤에만 채널 레이어로 보낸다.
+직렬화가 필요한 이벤트(comment.created)는 data를 함수로 넘겨서 커밋 후, 채널 레이어가 있을 때만 만든다.
+- post.<게시글 ID> 그룹: comment.created, like.changed, comment_count
+- feed 그룹: 게시글 단위 like.changed, comment_count
+
+like.changed / comment_count 는 coalesce_key가 있어 구독자 쪽(consumers.py)에서
+짧은 구간 동안 마지막 값만 보내도록 합쳐진다.
+"""
+import logging
+
+import orjson
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from mafather.renderers import dumps
+
+logger = logging.getLogger(__name__)
+
+FEED_GROUP = 'feed'
+EVENT_MESSAGE_TYPE = 'community.event'
+
+
+def post_group(post_id):
+    return f'post.{post_id}'
+
+
+def _send(groups, event, data, coalesce_key=None):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        message = {
+            'type': EVENT_MESSAGE_TYPE,
+            'event': event,
+            'data': data() if callable(data) else data,
+            'coalesce_key': coalesce_key,
+        }
+        for group in groups:
+            async_to_sync(channel_layer.group_send)(group, message)
+    except Exception:
+        # 실시간 알림 실패가 쓰기 요청을 실패시키지 않도록 기록만 함
+        logger.exception('커뮤니티 이벤트 발행 실패: %s', event)
+
+
+def _publish(groups, event, data, coalesce_key=None):
+    transaction.on_commit(lambda: _send(groups, event, data, coalesce_key))
+
+
+def publish_comment_created(comment):
+    """새 댓글 이벤트 (직렬화는 쓰기 트랜잭션 밖에서)"""
+    def data():
+        # 런타임 import로 순환 참조 방지
+        from .serializers import CommentSerializer
+
+        # 방금 만든 댓글은 답글이 없으므로 답글 조회 없이 빈 목록 사용
+        comment.live_replies = []
+        # 채널 레이어(msgpack)로 보낼 수 있도록 UUID/시간 값을 JSON 기본 타입으로 변환
+        return orjson.loads(dumps(CommentSerializer(comment).data))
+
+    _publish([post_group(comment.post_id)], 'comment.created', data)
+
+
+def publish_comment_count(post_id, comment_count):
+    """게시글 댓글 수 변경 이벤트"""
+    data = {'post_id': str(post_id), 'comment_count': comment_count}
+    _publish(
+        [post_group(post_id), FEED_GROUP], 'comment_count', data,
+        coalesce_key=f'comment_count:{post_id}',
+    )
+
+
+def publish_like_changed(target_type, target_id, post_id, like_count):
+    """좋아요 수 변경 이벤트 (게시글 좋아요는 피드에도 전달)"""
+    data = {
+        'target_type': target_type,
+        'target_id': str(target_id),
+        'post_id': str(post_id),
+        'like_count': like_count,
+    }
+    groups = [post_group(post_id)]
+    if target_type == 'post':
+        groups.append(FEED_GROUP)
+    _publish(groups, 'like.changed', data, coalesce_key=f'like:{target_type}:{target_id}')
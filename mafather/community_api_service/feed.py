@@ -0,0 +1,167 @@
+# community_api_service/feed.py
+"""
+게시글 목록(피드) 읽기 전용 직렬화
+
+PostSerializer(posts, many=True)는 게시글마다 필드 객체를 돌며 to_representation을 호출하고
+중첩 serializer(Category/User/PostImage)도 같은 과정을 거쳐서 목록 응답의 CPU 시간 대부분을 차지한다.
+여기서는 .values() 행과 게시글 ID로 한 번에 가져온 이미지, 캐시해 둔 카테고리로 dict를 바로 만든다.
+출력 형식(키 순서, 날짜 형식 포함)은 PostSerializer와 같아야 한다 (tests.FeedSerializerParityTestCase).
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .models import Category, PostImage
+
+CATEGORY_CACHE_KEY = 'community:feed:categories'
+CATEGORY_CACHE_SECONDS = 300
+
+POST_FIELDS = (
+    'id', 'title', 'content', 'category_id', 'post_type', 'status', 'is_anonymous', 'is_solved',
+    'is_pinned', 'user_id', 'user__name', 'user__email', 'created_at', 'updated_at',
+    'view_count', 'like_count', 'comment_count', 'hot_score',
+)
+IMAGE_FIELDS = ('id', 'post_id', 'image_url', 'alt_text', 'order', 'image__variants')
+CATEGORY_FIELDS = ('id', 'name', 'post_type', 'color', 'icon')
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _datetime_formatter():
+    """
+    DRF DateTimeField와 같은 형식/시간대로 변환하는 함수
+
+    DateTimeField.to_representation은 값마다 현재 시간대를 다시 찾아서 느리므로 목록 단위로 한 번만 찾는다.
+    DB에서 읽은 aware datetime(ISO 8601 출력)이 아니면 DRF 필드에 그대로 맡긴다.
+    """
+    if not settings.USE_TZ or api_settings.DATETIME_FORMAT != ISO_8601:
+        return _datetime_field.to_representation
+    current_timezone = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if value is None or value.tzinfo is None:
+            return _datetime_field.to_representation(value)
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return format_datetime
+
+
+def feed_rows(posts):
+    """게시글 queryset을 피드용 .values() 행 목록으로 (필터/정렬/슬라이스는 호출한 쪽에서)"""
+    return list(posts.prefetch_related(None).values(*POST_FIELDS))
+
+
+async def afeed_rows(posts):
+    return [row async for row in posts.prefetch_related(None).values(*POST_FIELDS)]
+
+
+def _image_rows(post_ids):
+    return PostImage.objects.filter(post_id__in=post_ids).values(*IMAGE_FIELDS)
+
+
+def _group_images(image_rows):
+    images = defaultdict(list)
+    for row in image_rows:
+        images[row['post_id']].append({
+            'id': str(row['id']),
+            'image_url': row['image_url'],
+            'alt_text': row['alt_text'],
+            'order': row['order'],
+            'variants': [
+                {
+                    'width': variant['width'],
+                    'height': variant['height'],
+                    'webp': default_storage.url(variant['webp']),
+                    'jpeg': default_storage.url(variant['jpeg']),
+                }
+                for variant in row['image__variants'] or ()
+            ],
+        })
+    return images
+
+
+def _category_dict(row):
+    return {
+        'id': str(row['id']),
+        'name': row['name'],
+        'post_type': row['post_type'],
+        'color': row['color'],
+        'icon': row['icon'],
+    }
+
+
+def _categories(category_ids):
+    categories = cache.get(CATEGORY_CACHE_KEY)
+    if categories is None or not category_ids <= categories.keys():
+        categories = {row['id']: _category_dict(row) for row in Category.objects.values(*CATEGORY_FIELDS)}
+        cache.set(CATEGORY_CACHE_KEY, categories, CATEGORY_CACHE_SECONDS)
+    return categories
+
+
+async def _acategories(category_ids):
+    categories = await cache.aget(CATEGORY_CACHE_KEY)
+    if categories is None or not category_ids <= categories.keys():
+        categories = {
+            row['id']: _category_dict(row) async for row in Category.objects.values(*CATEGORY_FIELDS)
+        }
+        await cache.aset(CATEGORY_CACHE_KEY, categories, CATEGORY_CACHE_SECONDS)
+    return categories
+
+
+def invalidate_category_cache():
+    cache.delete(CATEGORY_CACHE_KEY)
+
+
+def build_feed(rows, images, categories):
+    """PostSerializer와 같은 형식의 dict 목록"""
+    format_datetime = _datetime_formatter()
+    items = []
+    for row in rows:
+        items.append({
+            'id': str(row['id']),
+            'title': row['title'],
+            'content': row['content'],
+            'category': categories[row['category_id']],
+            'post_type': row['post_type'],
+            'status': row['status'],
+            'is_anonymous': row['is_anonymous'],
+            'is_solved': row['is_solved'],
+            'is_pinned': row['is_pinned'],
+            'images': images.get(row['id'], []),
+            'user': {'id': str(row['user_id']), 'name': row['user__name'], 'email': row['user__email']},
+            'created_at': format_datetime(row['created_at']),
+            'updated_at': format_datetime(row['updated_at']),
+            'view_count': row['view_count'],
+            'like_count': row['like_count'],
+            'comment_count': row['comment_count'],
+        })
+    return items
+
+
+def serialize_rows(rows):
+    if not rows:
+        return []
+    images = _group_images(_image_rows([row['id'] for row in rows]))
+    categories = _categories({row['category_id'] for row in rows})
+    return build_feed(rows, images, categories)
+
+
+async def aserialize_rows(rows):
+    if not rows:
+        return []
+    images = _group_images([row async for row in _image_rows([row['id'] for row in rows])])
+    categories = await _acategories({row['category_id'] for row in rows})
+    return build_feed(rows, images, categories)
+
+
+def serialize_feed(posts):
+    """게시글 queryset → 피드 응답 목록 (쿼리 2개, 카테고리 캐시가 없으면 3개)"""
+    return serialize_rows(feed_rows(posts))
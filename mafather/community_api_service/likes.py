@@ -0,0 +1,43 @@
+# community_api_service/likes.py
+"""
+좋아요 등록/취소
+
+PUT(좋아요)/DELETE(취소)는 목표 상태를 지정하는 멱등 요청이다. 이미 그 상태면 조회만 하고 끝나서
+더블탭이나 재전송이 와도 쓰기 트랜잭션과 좋아요 수 재계산(COUNT)이 다시 일어나지 않는다.
+등록은 (user, target_id, target_type) unique 제약 위의 get_or_create라서 동시에 들어와도 한 건만 생긴다.
+POST는 기존 클라이언트를 위한 토글로 남겨 둔다.
+"""
+from .models import Like
+
+
+def _likes(user, target_type, target_id):
+    return Like.objects.filter(user=user, target_id=target_id, target_type=target_type)
+
+
+def set_like(user, target_type, target_id, liked):
+    """좋아요 상태를 liked로 맞춤 (상태가 바뀌었으면 True)"""
+    if liked:
+        # 좋아요 수 갱신은 Like.save/delete에서
+        _, created = Like.objects.get_or_create(user=user, target_id=target_id, target_type=target_type)
+        return created
+    like = _likes(user, target_type, target_id).first()
+    if like is None:
+        return False
+    like.delete()
+    return True
+
+
+def toggle_like(user, target_type, target_id):
+    """좋아요 토글 (토글 후 좋아요 상태)"""
+    liked = not _likes(user, target_type, target_id).exists()
+    set_like(user, target_type, target_id, liked)
+    return liked
+
+
+def apply(request, target_type, target_id):
+    """요청 메서드에 맞게 좋아요 상태를 바꾸고 (liked, changed) 반환"""
+    if request.method == 'PUT':
+        return True, set_like(request.user, target_type, target_id, True)
+    if request.method == 'DELETE':
+        return False, set_like(request.user, target_type, target_id, False)
+    return toggle_like(request.user, target_type, target_id), True
@@ -0,0 +1 @@
+# Django management commands module
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+커뮤니티 API 부하 테스트 / 벤치마크
+
+별도의 테스트 DB를 만들어 사용자/게시글/댓글/좋아요를 bulk_create로 채운 뒤,
+실제 URL 라우트를 테스트 클라이언트로 동시에 호출해서 시나리오별
+p50/p95/p99 지연 시간, 요청당 쿼리 수, 처리량을 측정하고 JSON으로 저장한다.
+
+    python manage.py bench_community --posts 2000 --requests 500 --concurrency 8 --output bench.json
+    python manage.py bench_community --compare bench.json   # 이전 결과와 비교
+
+--asgi 를 주면 ASGI 핸들러(AsyncClient)로 한 이벤트 루프에서 동시 요청을 보내고,
+--async-views 를 함께 주면 조회 시나리오를 비동기 API로 보내서 같은 워커 수에서의 처리량을 비교할 수 있다.
+
+    python manage.py bench_community --asgi --scenarios feed,post_detail,comment_detail --output sync.json
+    python manage.py bench_community --asgi --async-views --scenarios feed,post_detail,comment_detail --compare sync.json
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from community_api_service import benchmark
+from community_api_service.models import Post
+from mafather.metrics import registry
+
+SCENARIOS = ['feed', 'feed_filtered', 'post_counts', 'post_detail', 'comment_detail', 'comment', 'like_post', 'like_comment']
+# 비동기 API가 있는 조회 시나리오의 URL 이름
+ASYNC_ROUTES = {
+    'feed': 'post-list-async',
+    'post_detail': 'post-detail-async',
+    'comment_detail': 'comment-detail-async',
+}
+
+
+def percentile(sorted_values, pct):
+    """nearest-rank 방식 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Command(BaseCommand):
+    help = '커뮤니티 API 벤치마크 (시드 데이터 생성 후 동시 요청으로 지연 시간/쿼리 수/처리량 측정)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=500)
+        parser.add_argument('--comments', type=int, default=2000)
+        parser.add_argument('--likes', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=200, help='시나리오별 요청 수')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='쉼표로 구분한 시나리오 목록')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--asgi', action='store_true', help='ASGI 핸들러로 한 이벤트 루프에서 요청')
+        parser.add_argument('--async-views', action='store_true', help='조회 시나리오를 비동기 API로 요청')
+        parser.add_argument('--output', help='결과 JSON 파일 경로')
+        parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+        if options['async_views'] and not options['asgi']:
+            raise CommandError('--async-views 는 --asgi 와 함께 사용해야 합니다.')
+
+        self.async_views = options['async_views']
+        self.random = random.Random(options['seed'])
+        old_name, temp_dir = benchmark.setup_database()
+        try:
+            seed_started = time.perf_counter()
+            self.users, self.posts, self.comments, like_count = benchmark.seed(
+                self.random, options['users'], options['posts'], options['comments'], options['likes'],
+            )
+            seed_seconds = time.perf_counter() - seed_started
+            self.stdout.write(
+                f'사용자 {len(self.users)}, 게시글 {len(self.posts)}, 댓글 {len(self.comments)}, 좋아요 {like_count}'
+            )
+            self.stdout.write(f'시드 데이터 생성: {seed_seconds:.2f}초')
+
+            results = {}
+            for name in scenarios:
+                if options['asgi']:
+                    results[name] = asyncio.run(
+                        self._run_scenario_async(name, options['requests'], options['concurrency'])
+                    )
+                else:
+                    results[name] = self._run_scenario(name, options['requests'], options['concurrency'])
+                self._print_result(name, results[name])
+        finally:
+            benchmark.teardown_database(old_name, temp_dir)
+
+        report = {
+            'commit': benchmark.git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': connections['default'].vendor,
+            'params': {
+                key: options[key]
+                for key in (
+                    'users', 'posts', 'comments', 'likes', 'requests', 'concurrency', 'seed',
+                    'asgi', 'async_views',
+                )
+            },
+            'seed_seconds': round(seed_seconds, 3),
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+        if options['compare']:
+            self._compare(report, options['compare'])
+
+    # 요청 실행
+
+    def _route(self, name, default):
+        if self.async_views and name in ASYNC_ROUTES:
+            return ASYNC_ROUTES[name]
+        return default
+
+    def _build_request(self, name):
+        rnd = self.random
+        if name == 'feed':
+            return 'get', reverse(self._route(name, 'post-list')), None
+        if name == 'feed_filtered':
+            post_type = rnd.choice(Post.POST_TYPE_CHOICES)[0]
+            query = 'post_type=question&unsolved=true' if post_type == 'question' else f'post_type={post_type}'
+            return 'get', f"{reverse('post-list')}?{query}", None
+        if name == 'post_counts':
+            return 'get', reverse('post-counts'), None
+        post = rnd.choice(self.posts)
+        if name == 'post_detail':
+            return 'get', reverse(self._route(name, 'post-detail'), args=[post.id]), None
+        if name == 'comment':
+            return 'post', reverse('post-comment', args=[post.id]), {'content': '벤치마크 새 댓글'}
+        if name == 'like_post':
+            return 'post', reverse('post-like', args=[post.id]), None
+        comment = rnd.choice(self.comments)
+        if name == 'comment_detail':
+            return 'get', reverse(self._route(name, 'comment-detail'), args=[comment.post.id, comment.id]), None
+        return 'post', reverse('comment-like', args=[comment.post.id, comment.id]), None
+
+    def _run_scenario(self, name, total, concurrency):
+        work = [(self.random.choice(self.users), self._build_request(name)) for _ in range(total)]
+        lock = threading.Lock()
+        latencies = []
+        errors = []
+
+        def worker():
+            client = APIClient()
+            try:
+                while True:
+                    with lock:
+                        if not work:
+                            return
+                        user, (method, url, data) = work.pop()
+                    client.force_authenticate(user=user)
+                    started = time.perf_counter()
+                    try:
+                        response = getattr(client, method)(url, data, format='json')
+                        failed = response.status_code >= 500
+                    except Exception:
+                        failed = True
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        if failed:
+                            errors.append(url)
+            finally:
+                connections.close_all()
+
+        registry.reset()
+        threads = [threading.Thread(target=worker) for _ in range(max(concurrency, 1))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        return self._summarize(latencies, len(errors), wall, concurrency)
+
+    async def _run_scenario_async(self, name, total, concurrency):
+        work = [(self.random.choice(self.users), self._build_request(name)) for _ in range(total)]
+        # 세션 로그인은 측정 전에 사용자별로 한 번만
+        clients = {}
+        for user, _ in work:
+            if user.pk not in clients:
+                client = AsyncClient()
+                await client.aforce_login(user)
+                clients[user.pk] = client
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        latencies = []
+        errors = []
+
+        async def send(user, method, url, data):
+            async with semaphore:
+                client = clients[user.pk]
+                started = time.perf_counter()
+                try:
+                    if data is None:
+                        response = await getattr(client, method)(url)
+                    else:
+                        response = await getattr(client, method)(
+                            url, json.dumps(data), content_type='application/json'
+                        )
+                    failed = response.status_code >= 500
+                except Exception:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                if failed:
+                    errors.append(url)
+
+        registry.reset()
+        started = time.perf_counter()
+        await asyncio.gather(*(send(user, *request) for user, request in work))
+        wall = time.perf_counter() - started
+        return self._summarize(latencies, len(errors), wall, concurrency)
+
+    def _summarize(self, latencies, errors, wall, concurrency):
+        latencies = sorted(latencies)
+        count = len(latencies)
+        # 요청당 쿼리 수는 QueryMetricsMiddleware 히스토그램의 합계/개수로 계산
+        histograms = [
+            histogram for (metric, _), histogram in registry.snapshot().items()
+            if metric == 'db_queries_per_request'
+        ]
+        total_queries = sum(histogram[-2] for histogram in histograms)
+        measured = sum(histogram[-1] for histogram in histograms)
+        return {
+            'requests': count,
+            'concurrency': concurrency,
+            'errors': errors,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'mean_ms': round(sum(latencies) / count * 1000, 3) if count else 0.0,
+            'queries_per_request': round(total_queries / measured, 2) if measured else 0.0,
+            'throughput_rps': round(count / wall, 2) if wall else 0.0,
+        }
+
+    # 출력
+
+    def _print_result(self, name, result):
+        self.stdout.write(
+            f"{name:<16} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+            f"p99 {result['p99_ms']:>8.2f}ms  쿼리/요청 {result['queries_per_request']:>6.2f}  "
+            f"{result['throughput_rps']:>8.2f} req/s  오류 {result['errors']}"
+        )
+
+    def _compare(self, report, path):
+        with open(path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.stdout.write(f"비교 대상: {path} (commit {baseline.get('commit') or '-'})")
+        for name, result in report['scenarios'].items():
+            before = baseline.get('scenarios', {}).get(name)
+            if not before:
+                continue
+            deltas = []
+            for key in ('p50_ms', 'p95_ms', 'queries_per_request', 'throughput_rps'):
+                if before[key]:
+                    change = (result[key] - before[key]) / before[key] * 100
+                    deltas.append(f'{key} {change:+.1f}%')
+            self.stdout.write(f"{name:<16} {'  '.join(deltas)}")
@@ -0,0 +1,112 @@
+"""
+피드 응답 직렬화/렌더링 벤치마크
+
+bench_community와 같이 community_api_service.benchmark로 테스트 DB에 시드 데이터를 만든 뒤,
+게시글 목록 한 페이지(기본 500건)를 직렬화하는 시간(PostSerializer / feed.serialize_feed, 조회 쿼리 포함)과
+DRF JSONRenderer와 orjson renderer의 렌더링 시간, 응답 크기(원본 / gzip / brotli)를 비교한다.
+
+    python manage.py bench_render --posts 500 --repeat 30 --output render.json
+"""
+import json
+import random
+import statistics
+import time
+
+import orjson
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from community_api_service import benchmark, feed
+from community_api_service.serializers import PostSerializer
+from community_api_service.views import post_queryset
+from mafather import compression
+from mafather.renderers import ORJSONRenderer
+
+
+def median_ms(func, repeat):
+    """repeat번 실행한 시간의 중앙값 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+class Command(BaseCommand):
+    help = '피드 응답 직렬화/렌더링 벤치마크 (렌더링 시간과 압축 전후 응답 크기 비교)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=500, help='한 페이지에 담을 게시글 수')
+        parser.add_argument('--comments', type=int, default=0)
+        parser.add_argument('--likes', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=30, help='측정 반복 횟수 (중앙값 사용)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='결과 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        old_name, temp_dir = benchmark.setup_database()
+        try:
+            rnd = random.Random(options['seed'])
+            benchmark.seed(rnd, options['users'], options['posts'], options['comments'], options['likes'])
+            limit = options['posts']
+            # 매번 새 queryset으로 조회 쿼리까지 포함해서 측정
+            serializers = {
+                'post_serializer': lambda: PostSerializer(post_queryset()[:limit], many=True).data,
+                'fast_feed': lambda: feed.serialize_feed(post_queryset()[:limit]),
+            }
+            serialize = {name: median_ms(func, repeat) for name, func in serializers.items()}
+            data = PostSerializer(post_queryset()[:limit], many=True).data
+            if orjson.dumps(feed.serialize_feed(post_queryset()[:limit])) != orjson.dumps(data):
+                self.stderr.write('경고: fast_feed 출력이 PostSerializer와 다릅니다.')
+        finally:
+            benchmark.teardown_database(old_name, temp_dir)
+
+        count = max(len(data), 1)
+        for name, ms in serialize.items():
+            self.stdout.write(f'직렬화 {name:<16} {ms:>9.3f}ms  {ms * 1000 / count:>8.2f}us/건 ({len(data)}건)')
+        if serialize['fast_feed']:
+            self.stdout.write(f"fast_feed 속도 향상 {serialize['post_serializer'] / serialize['fast_feed']:.1f}배")
+
+        renderers = {'drf_json': JSONRenderer(), 'orjson': ORJSONRenderer()}
+        bodies = {name: renderer.render(data) for name, renderer in renderers.items()}
+        if orjson.loads(bodies['drf_json']) != orjson.loads(bodies['orjson']):
+            self.stderr.write('경고: 두 renderer의 출력 내용이 다릅니다.')
+
+        render = {}
+        for name, renderer in renderers.items():
+            body = bodies[name]
+            render[name] = {
+                'render_ms': median_ms(lambda: renderer.render(data), repeat),
+                'bytes': len(body),
+            }
+            self.stdout.write(f"렌더링 {name:<16} {render[name]['render_ms']:>9.3f}ms  {len(body):>10,} bytes")
+
+        encodings = ['gzip'] + (['br'] if compression.brotli is not None else [])
+        compressed = {}
+        for encoding in encodings:
+            body = bodies['orjson']
+            compressed[encoding] = {
+                'compress_ms': median_ms(lambda: compression.compress(body, encoding), repeat),
+                'bytes': len(compression.compress(body, encoding)),
+            }
+            self.stdout.write(
+                f"압축   {encoding:<16} {compressed[encoding]['compress_ms']:>9.3f}ms  "
+                f"{compressed[encoding]['bytes']:>10,} bytes"
+            )
+
+        report = {
+            'commit': benchmark.git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'params': {key: options[key] for key in ('users', 'posts', 'repeat', 'seed')},
+            'serialize_ms': serialize,
+            'render': render,
+            'compression': compressed,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
@@ -0,0 +1,24 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from community_api_service.notifications import dispatch_all
+
+
+class Command(BaseCommand):
+    help = '알림 아웃박스를 받는 사람별 알림으로 묶어 발송합니다. --loop로 백그라운드 발송기로 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_DISPATCH_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='종료할 때까지 주기적으로 발송')
+        parser.add_argument('--interval', type=float, default=settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS)
+
+    def handle(self, *args, **options):
+        while True:
+            count = dispatch_all(options['batch_size'])
+            if count or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'아웃박스 {count}건 처리'))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from community_api_service.models import PostCounter
+
+
+class Command(BaseCommand):
+    help = '게시글 테이블에서 카테고리/타입별 게시글 수(post_counters)를 다시 집계합니다.'
+
+    def handle(self, *args, **options):
+        PostCounter.rebuild()
+        total = sum(PostCounter.objects.values_list('post_count', flat=True))
+        self.stdout.write(self.style.SUCCESS(
+            f'게시글 수 집계 완료: {PostCounter.objects.count()}개 행, 게시글 {total}개'
+        ))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:20
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+# 이 마이그레이션 작성 시점의 점수 공식 (ranking.py가 바뀌어도 이 마이그레이션의 동작은 그대로 유지)
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+HOT_SCORE_DECAY_SECONDS = 45000
+LIKE_WEIGHT = 3
+COMMENT_WEIGHT = 2
+VIEW_WEIGHT = 0.1
+
+
+def hot_score(like_count, comment_count, view_count, created_at):
+    engagement = like_count * LIKE_WEIGHT + comment_count * COMMENT_WEIGHT + view_count * VIEW_WEIGHT
+    age_term = (created_at - HOT_SCORE_EPOCH).total_seconds() / HOT_SCORE_DECAY_SECONDS
+    return round(math.log10(max(engagement, 0) + 1) + age_term, 7)
+
+
+def backfill_hot_scores(apps, schema_editor):
+    """기존 게시글 인기 점수 계산"""
+    Post = apps.get_model('community_api_service', 'Post')
+    batch = []
+    for post in Post.objects.only('like_count', 'comment_count', 'view_count', 'created_at').iterator(chunk_size=1000):
+        post.hot_score = hot_score(post.like_count, post.comment_count, post.view_count, post.created_at)
+        batch.append(post)
+        if len(batch) >= 1000:
+            Post.objects.bulk_update(batch, ['hot_score'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_api_service', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0, verbose_name='인기 점수'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['deleted_at', '-hot_score', '-id'], name='posts_hot_score_idx'),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+    ]
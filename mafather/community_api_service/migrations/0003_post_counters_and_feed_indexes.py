@@ -0,0 +1,80 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_post_counters(apps, schema_editor):
+    """기존 게시글로 카테고리/타입별 게시글 수 집계"""
+    Post = apps.get_model('community_api_service', 'Post')
+    PostCounter = apps.get_model('community_api_service', 'PostCounter')
+    rows = (
+        Post.objects
+        .filter(status='published', deleted_at__isnull=True)
+        .values('category_id', 'post_type')
+        .annotate(post_count=Count('id'), unsolved_count=Count('id', filter=Q(is_solved=False)))
+        .order_by()
+    )
+    PostCounter.objects.bulk_create([PostCounter(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_api_service', '0002_post_hot_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostCounter',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('post_type', models.CharField(choices=[('question', '질문'), ('story', '이야기'), ('tip', '팁')], max_length=20, verbose_name='게시물 타입')),
+                ('post_count', models.IntegerField(default=0, verbose_name='게시글 수')),
+                ('unsolved_count', models.IntegerField(default=0, verbose_name='미해결 질문 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+            ],
+            options={
+                'verbose_name': '게시글 수 집계',
+                'verbose_name_plural': '게시글 수 집계들',
+                'db_table': 'post_counters',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_hot_score_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'deleted_at', '-is_pinned', '-created_at'], name='posts_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'post_type', 'deleted_at', '-is_pinned', '-created_at'], name='posts_feed_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'category', 'deleted_at', '-is_pinned', '-created_at'], name='posts_feed_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'is_solved', 'deleted_at', '-is_pinned', '-created_at'], name='posts_feed_unsolved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'deleted_at', '-hot_score', '-id'], name='posts_hot_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='postcounter',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_counters', to='community_api_service.category', verbose_name='카테고리'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='postcounter',
+            unique_together={('category', 'post_type')},
+        ),
+        migrations.RunPython(backfill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_service', '0002_uploaded_image'),
+        ('community_api_service', '0003_post_counters_and_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postimage',
+            name='image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='post_images', to='api_service.uploadedimage', verbose_name='업로드 이미지'),
+        ),
+    ]
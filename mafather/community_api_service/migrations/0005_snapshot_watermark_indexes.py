@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_api_service', '0004_post_image_upload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['created_at'], name='likes_created_6ac82b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated_at'], name='posts_updated_8383f4_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.2 on 2026-10-19 08:08
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_api_service', '0005_snapshot_watermark_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('reply', '답글'), ('like', '좋아요')], max_length=20, verbose_name='종류')),
+                ('target_type', models.CharField(choices=[('post', '게시물'), ('comment', '댓글')], max_length=20, verbose_name='대상 유형')),
+                ('target_id', models.UUIDField(verbose_name='대상 ID')),
+                ('is_anonymous', models.BooleanField(default=False, verbose_name='익명 여부')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='행위자')),
+            ],
+            options={
+                'verbose_name': '알림 아웃박스',
+                'verbose_name_plural': '알림 아웃박스',
+                'db_table': 'notification_outbox',
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('reply', '답글'), ('like', '좋아요')], max_length=20, verbose_name='종류')),
+                ('target_type', models.CharField(choices=[('post', '게시물'), ('comment', '댓글')], max_length=20, verbose_name='대상 유형')),
+                ('target_id', models.UUIDField(verbose_name='대상 ID')),
+                ('actor_count', models.IntegerField(default=0, verbose_name='행위자 수')),
+                ('recent_actor_ids', models.JSONField(default=list, verbose_name='최근 행위자')),
+                ('is_read', models.BooleanField(default=False, verbose_name='읽음 여부')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+                ('last_actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='마지막 행위자')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='community_api_service.post', verbose_name='게시물')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='받는 사람')),
+            ],
+            options={
+                'verbose_name': '알림',
+                'verbose_name_plural': '알림들',
+                'db_table': 'notifications',
+                'indexes': [models.Index(fields=['recipient', 'is_read', '-updated_at', '-id'], name='notifications_unread_idx'), models.Index(fields=['recipient', '-updated_at', '-id'], name='notifications_recent_idx'), models.Index(fields=['target_id', 'recipient', 'is_read'], name='notifications_group_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.2 on 2026-10-19 08:54
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_unread_and_backfill_actors(apps, schema_editor):
+    """
+    읽지 않은 중복 알림을 최근 알림 하나로 합치고, 알고 있는 행위자(recent_actor_ids)로 행위자 행 생성
+
+    이전 행위자 수는 최근 목록에서 밀려난 행위자가 다시 셀 수 있어 정확하지 않으므로 행위자 행 수로 다시 맞춘다.
+    """
+    Notification = apps.get_model('community_api_service', 'Notification')
+    NotificationActor = apps.get_model('community_api_service', 'NotificationActor')
+
+    seen = set()
+    duplicates = []
+    for notification in Notification.objects.filter(is_read=False).order_by('-updated_at', '-id').iterator():
+        key = (notification.recipient_id, notification.kind, notification.target_type, notification.target_id)
+        if key in seen:
+            duplicates.append(notification.id)
+        else:
+            seen.add(key)
+    Notification.objects.filter(id__in=duplicates).update(is_read=True)
+
+    for notification in Notification.objects.iterator():
+        actor_ids = {uuid.UUID(actor_id) for actor_id in notification.recent_actor_ids}
+        NotificationActor.objects.bulk_create(
+            [NotificationActor(notification_id=notification.id, actor_id=actor_id) for actor_id in actor_ids],
+            ignore_conflicts=True,
+        )
+        # 최근 목록보다 많이 셌던 값은 그대로 두고 (목록에서 밀려난 행위자는 알 수 없음) 적게 셌던 값만 맞춤
+        if notification.actor_count < len(actor_ids):
+            Notification.objects.filter(id=notification.id).update(actor_count=len(actor_ids))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community_api_service', '0006_notifications'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationActor',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('actor_id', models.UUIDField(verbose_name='행위자 ID')),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actors', to='community_api_service.notification', verbose_name='알림')),
+            ],
+            options={
+                'verbose_name': '알림 행위자',
+                'verbose_name_plural': '알림 행위자들',
+                'db_table': 'notification_actors',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificationactor',
+            constraint=models.UniqueConstraint(fields=('notification', 'actor_id'), name='notification_actors_uniq'),
+        ),
+        migrations.RunPython(merge_unread_and_backfill_actors, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_read', False)), fields=('recipient', 'kind', 'target_type', 'target_id'), name='notifications_unread_uniq'),
+        ),
+    ]
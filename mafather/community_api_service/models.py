@@ -1,7 +1,10 @@
 import uuid
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete
 from django.utils import timezone
-from api_service.models import User
+from api_service.models import UploadedImage, User
+from . import events, ranking
 
 
 class Category(models.Model):
@@ -36,6 +39,18 @@ class Category(models.Model):
     def __str__(self):
         return f"[{self.get_post_type_display()}] {self.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # 런타임 import로 순환 참조 방지
+        from .feed import invalidate_category_cache
+        invalidate_category_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .feed import invalidate_category_cache
+        invalidate_category_cache()
+        return result
+
 
 class Post(models.Model):
     """통합 게시물"""
@@ -62,6 +77,7 @@ class Post(models.Model):
     view_count = models.IntegerField(default=0, verbose_name='조회수')
     like_count = models.IntegerField(default=0, verbose_name='좋아요 수')
     comment_count = models.IntegerField(default=0, verbose_name='댓글 수')
+    hot_score = models.FloatField(default=0, verbose_name='인기 점수')
     is_anonymous = models.BooleanField(default=False, verbose_name='익명 여부')
     is_solved = models.BooleanField(blank=True, null=True, verbose_name='해결 여부 (질문 타입에만 적용)')
     is_pinned = models.BooleanField(default=False, verbose_name='상단 고정 여부')
@@ -80,26 +96,101 @@ class Post(models.Model):
             models.Index(fields=['post_type']),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),  # 분석 스냅샷 증분 내보내기 워터마크 (api_service.snapshots)
             models.Index(fields=['is_pinned']),
+            # 피드 필터 + 정렬(-is_pinned, -created_at)에 맞춘 복합 인덱스
+            models.Index(
+                fields=['status', 'deleted_at', '-is_pinned', '-created_at'],
+                name='posts_feed_idx',
+            ),
+            models.Index(
+                fields=['status', 'post_type', 'deleted_at', '-is_pinned', '-created_at'],
+                name='posts_feed_type_idx',
+            ),
+            models.Index(
+                fields=['status', 'category', 'deleted_at', '-is_pinned', '-created_at'],
+                name='posts_feed_category_idx',
+            ),
+            models.Index(
+                fields=['status', 'is_solved', 'deleted_at', '-is_pinned', '-created_at'],
+                name='posts_feed_unsolved_idx',
+            ),
+            models.Index(fields=['status', 'deleted_at', '-hot_score', '-id'], name='posts_hot_score_idx'),
         ]
 
     def __str__(self):
         return f"[{self.get_post_type_display()}] {self.title}"
 
+    # 게시글 수 집계(PostCounter)에 영향을 주는 필드
+    COUNTER_FIELDS = {'category', 'category_id', 'post_type', 'status', 'deleted_at', 'is_solved'}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields() & cls.COUNTER_FIELDS:
+            instance._loaded_counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        """집계 기준 (카테고리, 타입, 집계 대상 여부, 미해결 질문 여부)"""
+        counted = self.status == 'published' and self.deleted_at is None
+        return (self.category_id, self.post_type, counted, counted and self.is_solved is False)
+
+    def save(self, *args, **kwargs):
+        # 새 게시글은 작성 시각 기준 점수로 시작
+        if self._state.adding:
+            self.hot_score = ranking.post_hot_score(self)
+
+        # 조회수/댓글 수처럼 집계와 무관한 필드만 저장할 때는 카운터를 건드리지 않음
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not self.COUNTER_FIELDS.intersection(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            if self._state.adding:
+                old_state = None
+            elif hasattr(self, '_loaded_counter_state'):
+                old_state = self._loaded_counter_state
+            else:
+                old = Post.objects.filter(pk=self.pk).first()
+                old_state = old.counter_state() if old else None
+            super().save(*args, **kwargs)
+            new_state = self.counter_state()
+            if new_state != old_state:
+                PostCounter.apply_delta(old_state, -1)
+                PostCounter.apply_delta(new_state, 1)
+            self._loaded_counter_state = new_state
+
     def soft_delete(self):
         """소프트 삭제"""
         self.deleted_at = timezone.now()
         self.save()
 
+    def _view_count_update(self):
+        # 읽어 온 인스턴스(replica에서 읽었을 수 있음)의 카운트를 저장하지 않고 UPDATE 한 번으로
+        # 조회수를 1 올리면서 같은 행의 현재 카운트로 점수를 다시 매김 (동시 조회/좋아요/댓글을 덮어쓰지 않음)
+        return {
+            'hot_score': ranking.hot_score_expression(self.created_at, view_delta=1),
+            'view_count': F('view_count') + 1,
+        }
+
     def increment_view_count(self):
         """조회수 증가"""
+        Post.objects.filter(id=self.id).update(**self._view_count_update())
+        self.view_count += 1
+
+    async def aincrement_view_count(self):
+        """조회수 증가 (비동기)"""
+        await Post.objects.filter(id=self.id).aupdate(**self._view_count_update())
         self.view_count += 1
-        self.save(update_fields=['view_count'])
 
     def update_comment_count(self):
         """댓글 수 업데이트"""
         self.comment_count = self.comments.filter(deleted_at__isnull=True).count()
-        self.save(update_fields=['comment_count'])
+        Post.objects.filter(id=self.id).update(comment_count=self.comment_count)
+        self.hot_score = ranking.refresh_hot_score(self.id)
+        events.publish_comment_count(self.id, self.comment_count)
 
     def update_like_count(self):
         """좋아요 수 업데이트"""
@@ -109,7 +200,8 @@ class Post(models.Model):
             target_type='post'
         ).count()
         self.like_count = like_count
-        self.save(update_fields=['like_count'])
+        Post.objects.filter(id=self.id).update(like_count=like_count)
+        self.hot_score = ranking.refresh_hot_score(self.id)
 
 
 class Comment(models.Model):
@@ -157,6 +249,7 @@ class Comment(models.Model):
 
     def save(self, *args, **kwargs):
         with transaction.atomic():
+            adding = self._state.adding
             # 대댓글의 깊이 설정
             if self.parent:
                 self.depth = 1
@@ -168,6 +261,17 @@ class Comment(models.Model):
                     deleted_at__isnull=True
                 ).count()
                 self.post.save(update_fields=['comment_count', 'updated_at'])
+                ranking.refresh_hot_score(self.post_id)
+                # 실시간 이벤트 (커밋 후 발행)
+                if adding:
+                    events.publish_comment_created(self)
+                    # 답글 알림은 같은 트랜잭션에서 아웃박스에 한 행만 쓰고 발송은 notifications.dispatch에서
+                    if self.parent_id:
+                        NotificationOutbox.objects.create(
+                            kind='reply', actor_id=self.user_id, target_type='comment',
+                            target_id=self.parent_id, is_anonymous=self.is_anonymous,
+                        )
+                events.publish_comment_count(self.post_id, self.post.comment_count)
 
     def delete(self, *args, **kwargs):
         with transaction.atomic():
@@ -179,6 +283,8 @@ class Comment(models.Model):
                 deleted_at__isnull=True
             ).count()
             post.save(update_fields=['comment_count', 'updated_at'])
+            ranking.refresh_hot_score(post.id)
+            events.publish_comment_count(post.id, post.comment_count)
 
     def update_like_count(self):
         """좋아요 수 업데이트"""
@@ -190,11 +296,92 @@ class Comment(models.Model):
         self.save(update_fields=['like_count'])
 
 
+class PostCounter(models.Model):
+    """카테고리/게시물 타입별 게시글 수 (탭 배지용 집계 테이블)"""
+
+    id = models.BigAutoField(primary_key=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='post_counters', verbose_name='카테고리')
+    post_type = models.CharField(max_length=20, choices=Post.POST_TYPE_CHOICES, verbose_name='게시물 타입')
+    post_count = models.IntegerField(default=0, verbose_name='게시글 수')
+    unsolved_count = models.IntegerField(default=0, verbose_name='미해결 질문 수')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정 시간')
+
+    class Meta:
+        db_table = 'post_counters'
+        verbose_name = '게시글 수 집계'
+        verbose_name_plural = '게시글 수 집계들'
+        unique_together = ['category', 'post_type']
+
+    def __str__(self):
+        return f"{self.category.name} ({self.post_type}) - {self.post_count}"
+
+    @classmethod
+    def apply_delta(cls, state, delta):
+        """Post.counter_state() 기준으로 집계 증감"""
+        if state is None:
+            return
+        category_id, post_type, counted, unsolved = state
+        if not counted:
+            return
+        unsolved_delta = delta if unsolved else 0
+        updated = cls.objects.filter(category_id=category_id, post_type=post_type).update(
+            post_count=F('post_count') + delta,
+            unsolved_count=F('unsolved_count') + unsolved_delta,
+            updated_at=timezone.now(),
+        )
+        # 줄일 행이 없으면 만들지 않음 (카테고리 CASCADE로 집계 행이 먼저 지워진 경우 등)
+        if updated or delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    category_id=category_id,
+                    post_type=post_type,
+                    post_count=max(delta, 0),
+                    unsolved_count=max(unsolved_delta, 0),
+                )
+        except IntegrityError:
+            # 동시에 다른 요청이 행을 만든 경우
+            cls.objects.filter(category_id=category_id, post_type=post_type).update(
+                post_count=F('post_count') + delta,
+                unsolved_count=F('unsolved_count') + unsolved_delta,
+                updated_at=timezone.now(),
+            )
+
+    @classmethod
+    def rebuild(cls):
+        """게시글 테이블에서 전체 재집계 (QuerySet.update/bulk_create로 바꾼 뒤 사용)"""
+        rows = (
+            Post.objects
+            .filter(status='published', deleted_at__isnull=True)
+            .values('category_id', 'post_type')
+            .annotate(post_count=Count('id'), unsolved_count=Count('id', filter=Q(is_solved=False)))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([cls(**row) for row in rows])
+
+
+def _post_deleted(sender, instance, **kwargs):
+    # 게시글 삭제는 직접 delete(), QuerySet.delete(), 사용자/카테고리 CASCADE 모두 post_delete를 보냄
+    # (QuerySet.update()는 신호가 없으므로 rebuild_post_counters로 다시 집계)
+    state = getattr(instance, '_loaded_counter_state', None) or instance.counter_state()
+    PostCounter.apply_delta(state, -1)
+
+
+post_delete.connect(_post_deleted, sender=Post, dispatch_uid='community_api_service.post_counter_delete')
+
+
 class PostImage(models.Model):
     """게시물 이미지"""
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='images', verbose_name='게시물')
+    image = models.ForeignKey(
+        UploadedImage, on_delete=models.SET_NULL, blank=True, null=True,
+        related_name='post_images', verbose_name='업로드 이미지'
+    )
     image_url = models.URLField(verbose_name='이미지 URL')
     alt_text = models.CharField(max_length=255, blank=True, null=True, verbose_name='대체 텍스트')
     order = models.IntegerField(default=0, verbose_name='이미지 순서')
@@ -238,6 +425,7 @@ class Like(models.Model):
         indexes = [
             models.Index(fields=['target_id', 'target_type']),
             models.Index(fields=['user', 'target_id', 'target_type']),
+            models.Index(fields=['created_at']),  # 분석 스냅샷 증분 내보내기 워터마크 (api_service.snapshots)
         ]
 
     def __str__(self):
@@ -259,8 +447,14 @@ class Like(models.Model):
         return None
 
     def save(self, *args, **kwargs):
-        # 먼저 저장
-        super().save(*args, **kwargs)
+        # 먼저 저장 (새 좋아요면 같은 트랜잭션에서 알림 아웃박스에 한 행 추가)
+        with transaction.atomic():
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            if adding:
+                NotificationOutbox.objects.create(
+                    kind='like', actor_id=self.user_id, target_type=self.target_type, target_id=self.target_id,
+                )
         
         # 그다음 카운트 업데이트 (직접 DB 업데이트로 순환 참조 방지)
         try:
@@ -272,9 +466,11 @@ class Like(models.Model):
             if self.target_type == 'post':
                 # Post 모델에 직접 업데이트
                 Post.objects.filter(id=self.target_id).update(like_count=like_count)
+                ranking.refresh_hot_score(self.target_id)
             elif self.target_type == 'comment':
                 # Comment 모델에 직접 업데이트
                 Comment.objects.filter(id=self.target_id).update(like_count=like_count)
+            _publish_like_changed(self.target_type, self.target_id, like_count)
         except Exception as e:
             # 로그 기록하고 무시 (테스트 환경에서는 print)
             print(f"Error updating like count in save: {str(e)}")
@@ -295,7 +491,122 @@ class Like(models.Model):
             
             if target_type == 'post':
                 Post.objects.filter(id=target_id).update(like_count=like_count)
+                ranking.refresh_hot_score(target_id)
             elif target_type == 'comment':
                 Comment.objects.filter(id=target_id).update(like_count=like_count)
+            _publish_like_changed(target_type, target_id, like_count)
         except Exception as e:
-            print(f"Error updating like count in delete: {str(e)}")
\ No newline at end of file
+            print(f"Error updating like count in delete: {str(e)}")
+
+
+def _publish_like_changed(target_type, target_id, like_count):
+    """좋아요 수 변경 이벤트 발행 (댓글 좋아요는 소속 게시글 채널로 전달)"""
+    if target_type == 'post':
+        post_id = target_id
+    else:
+        post_id = Comment.objects.filter(id=target_id).values_list('post_id', flat=True).first()
+        if post_id is None:
+            return
+    events.publish_like_changed(target_type, target_id, post_id, like_count)
+
+
+class NotificationOutbox(models.Model):
+    """알림 아웃박스 (답글/좋아요 쓰기 트랜잭션에서 INSERT, notifications.dispatch가 알림으로 묶은 뒤 삭제)"""
+
+    KIND_CHOICES = [
+        ('reply', '답글'),
+        ('like', '좋아요'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name='종류')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name='행위자')
+    # 알림 대상 (좋아요한 게시글/댓글, 답글이 달린 댓글)
+    target_type = models.CharField(max_length=20, choices=Like.TARGET_TYPE_CHOICES, verbose_name='대상 유형')
+    target_id = models.UUIDField(verbose_name='대상 ID')
+    is_anonymous = models.BooleanField(default=False, verbose_name='익명 여부')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')
+
+    class Meta:
+        db_table = 'notification_outbox'
+        verbose_name = '알림 아웃박스'
+        verbose_name_plural = '알림 아웃박스'
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.target_type}:{self.target_id}"
+
+
+class Notification(models.Model):
+    """알림 (같은 대상의 읽지 않은 알림은 하나로 묶음 - "5명이 회원님의 게시글을 좋아합니다")"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', verbose_name='받는 사람')
+    kind = models.CharField(max_length=20, choices=NotificationOutbox.KIND_CHOICES, verbose_name='종류')
+    target_type = models.CharField(max_length=20, choices=Like.TARGET_TYPE_CHOICES, verbose_name='대상 유형')
+    target_id = models.UUIDField(verbose_name='대상 ID')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+', verbose_name='게시물')
+    # 서로 다른 행위자 수 (NotificationActor 행 수와 같음)
+    actor_count = models.IntegerField(default=0, verbose_name='행위자 수')
+    # 최근 행위자 ID (최신순, 최대 NOTIFICATION_RECENT_ACTORS명)
+    recent_actor_ids = models.JSONField(default=list, verbose_name='최근 행위자')
+    # 마지막 행위자 (익명 답글이면 비움)
+    last_actor = models.ForeignKey(
+        User, on_delete=models.SET_NULL, blank=True, null=True, related_name='+', verbose_name='마지막 행위자'
+    )
+    is_read = models.BooleanField(default=False, verbose_name='읽음 여부')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정 시간')
+
+    class Meta:
+        db_table = 'notifications'
+        verbose_name = '알림'
+        verbose_name_plural = '알림들'
+        indexes = [
+            # 알림 목록 (최근 갱신순 keyset 페이지네이션, 읽지 않은 알림만 / 전체)
+            models.Index(fields=['recipient', 'is_read', '-updated_at', '-id'], name='notifications_unread_idx'),
+            models.Index(fields=['recipient', '-updated_at', '-id'], name='notifications_recent_idx'),
+            # 발송 시 묶을 읽지 않은 알림 찾기
+            models.Index(fields=['target_id', 'recipient', 'is_read'], name='notifications_group_idx'),
+        ]
+        constraints = [
+            # (받는 사람, 종류, 대상)별 읽지 않은 알림은 하나 (발송기가 동시에 돌아도 중복 생성 방지)
+            models.UniqueConstraint(
+                fields=['recipient', 'kind', 'target_type', 'target_id'],
+                condition=Q(is_read=False),
+                name='notifications_unread_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.message}"
+
+    @property
+    def message(self):
+        """알림 문구"""
+        actor = f"{self.last_actor.name}님" if self.last_actor else '익명'
+        if self.actor_count > 1:
+            actor += f" 외 {self.actor_count - 1}명"
+        if self.kind == 'reply':
+            return f"{actor}이 회원님의 댓글에 답글을 남겼습니다."
+        target = '게시글' if self.target_type == 'post' else '댓글'
+        return f"{actor}이 회원님의 {target}을 좋아합니다."
+
+
+class NotificationActor(models.Model):
+    """알림별 행위자 (같은 사람이 여러 번 행동해도 행위자 수는 한 번만 셈)"""
+
+    id = models.BigAutoField(primary_key=True)
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='actors', verbose_name='알림')
+    # 탈퇴한 사용자가 있어도 발송이 실패하지 않도록 외래 키 없이 ID만 저장
+    actor_id = models.UUIDField(verbose_name='행위자 ID')
+
+    class Meta:
+        db_table = 'notification_actors'
+        verbose_name = '알림 행위자'
+        verbose_name_plural = '알림 행위자들'
+        constraints = [
+            models.UniqueConstraint(fields=['notification', 'actor_id'], name='notification_actors_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_id} - {self.actor_id}"
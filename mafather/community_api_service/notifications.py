@@ -0,0 +1,204 @@
+# community_api_service/notifications.py
+"""
+답글/좋아요 알림
+
+쓰기 경로(Comment.save, Like.save)는 같은 트랜잭션에서 notification_outbox에 한 행만 INSERT한다.
+받는 사람 조회와 묶기는 백그라운드 발송기(manage.py dispatch_notifications --loop)가 한다.
+- 아웃박스를 id 순으로 batch_size개씩 꺼내서 대상 게시글/댓글 작성자를 한 번에 조회
+- 자기 글에 한 행동, 삭제된 대상, 발송 전에 취소된 좋아요는 버림
+- (받는 사람, 종류, 대상)별로 읽지 않은 알림 하나에 묶음 ("홍길동님 외 4명이 회원님의 게시글을 좋아합니다")
+  이미 읽은 알림에 새 행동이 오면 새 알림을 만든다. 읽지 않은 알림은 유일 제약으로 하나만 있을 수 있어서
+  발송기 여러 개가 같은 알림을 동시에 만들면 나중 것이 먼저 만들어진 알림에 더한다.
+- 행위자 수는 알림별 행위자 행(NotificationActor)으로 세서 같은 사람이 여러 번 행동해도 한 번만 센다.
+- 처리한 아웃박스 행은 같은 트랜잭션에서 지움 (실패하면 다음 실행에서 다시 처리)
+
+읽지 않은 알림 수는 사용자별로 캐시하고, 발송/읽음 처리 때 지운다.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from mafather import cursors
+
+from .models import Comment, Like, Notification, NotificationActor, NotificationOutbox, Post
+
+
+def _unread_cache_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def unread_count(user_id):
+    """읽지 않은 알림 수 (캐시에 있으면 DB 조회 없음)"""
+    key = _unread_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+        cache.set(key, count, settings.NOTIFICATION_UNREAD_CACHE_SECONDS)
+    return count
+
+
+def invalidate_unread(user_ids):
+    cache.delete_many([_unread_cache_key(user_id) for user_id in user_ids])
+
+
+def mark_read(user_id, ids=None):
+    """알림 읽음 처리 (ids가 없으면 전부) → 바뀐 알림 수"""
+    notifications = Notification.objects.filter(recipient_id=user_id, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+    # update()는 updated_at(auto_now)을 바꾸지 않아 목록 순서가 유지됨
+    updated = notifications.update(is_read=True)
+    if updated:
+        invalidate_unread([user_id])
+    return updated
+
+
+def _targets(rows):
+    """(대상 유형, 대상 ID) → (받는 사람 ID, 게시글 ID) (삭제된 대상은 없음)"""
+    post_ids = {row.target_id for row in rows if row.target_type == 'post'}
+    comment_ids = {row.target_id for row in rows if row.target_type == 'comment'}
+    targets = {}
+    if post_ids:
+        posts = Post.objects.filter(id__in=post_ids, deleted_at__isnull=True).order_by().values_list('id', 'user_id')
+        for post_id, user_id in posts:
+            targets[('post', post_id)] = (user_id, post_id)
+    if comment_ids:
+        comments = Comment.objects.filter(
+            id__in=comment_ids, deleted_at__isnull=True, post__deleted_at__isnull=True
+        ).order_by().values_list('id', 'user_id', 'post_id')
+        for comment_id, user_id, post_id in comments:
+            targets[('comment', comment_id)] = (user_id, post_id)
+    return targets
+
+
+def _live_likes(rows):
+    """아직 남아 있는 좋아요 (사용자 ID, 대상 유형, 대상 ID) 집합"""
+    like_rows = [row for row in rows if row.kind == 'like']
+    if not like_rows:
+        return set()
+    return set(Like.objects.filter(
+        user_id__in={row.actor_id for row in like_rows},
+        target_id__in={row.target_id for row in like_rows},
+    ).values_list('user_id', 'target_type', 'target_id'))
+
+
+def _add_actors(notification, rows, known, actors):
+    """
+    알림에 행동 묶기
+
+    known: 이미 기록된 (알림 ID, 행위자 ID) 집합, actors: 새로 INSERT할 NotificationActor 목록 (둘 다 여기서 채움)
+    """
+    for row in rows:
+        if (notification.id, row.actor_id) not in known:
+            known.add((notification.id, row.actor_id))
+            actors.append(NotificationActor(notification_id=notification.id, actor_id=row.actor_id))
+            notification.actor_count += 1
+        actor = str(row.actor_id)
+        recent = [actor] + [actor_id for actor_id in notification.recent_actor_ids if actor_id != actor]
+        notification.recent_actor_ids = recent[:settings.NOTIFICATION_RECENT_ACTORS]
+        notification.last_actor_id = None if row.is_anonymous else row.actor_id
+
+
+def _known_actors(notifications):
+    return set(NotificationActor.objects.filter(notification__in=notifications).values_list('notification_id', 'actor_id'))
+
+
+def _create_unread(key, post_id, rows, actors):
+    """새 읽지 않은 알림 (다른 발송기가 먼저 만들었으면 그 알림에 더함)"""
+    recipient_id, kind, target_type, target_id = key
+    notification = Notification(
+        recipient_id=recipient_id, kind=kind, target_type=target_type, target_id=target_id, post_id=post_id,
+    )
+    created = []
+    _add_actors(notification, rows, set(), created)
+    try:
+        with transaction.atomic():
+            notification.save(force_insert=True)
+    except IntegrityError:
+        notification = Notification.objects.select_for_update().get(
+            recipient_id=recipient_id, kind=kind, target_type=target_type, target_id=target_id, is_read=False,
+        )
+        created = []
+        _add_actors(notification, rows, _known_actors([notification]), created)
+        notification.save()
+    actors.extend(created)
+    return notification
+
+
+def dispatch(batch_size=None):
+    """아웃박스 한 묶음을 알림으로 만들고 처리한 아웃박스 행 수 반환"""
+    batch_size = batch_size or settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+    with transaction.atomic():
+        rows = list(NotificationOutbox.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size])
+        if not rows:
+            return 0
+        targets = _targets(rows)
+        live_likes = _live_likes(rows)
+
+        groups = {}
+        for row in rows:
+            target = targets.get((row.target_type, row.target_id))
+            if target is None:
+                continue
+            recipient_id, post_id = target
+            if recipient_id == row.actor_id:
+                continue
+            if row.kind == 'like' and (row.actor_id, row.target_type, row.target_id) not in live_likes:
+                continue
+            key = (recipient_id, row.kind, row.target_type, row.target_id)
+            groups.setdefault(key, (post_id, []))[1].append(row)
+
+        if groups:
+            existing = {
+                (n.recipient_id, n.kind, n.target_type, n.target_id): n
+                for n in Notification.objects.select_for_update().filter(
+                    target_id__in={key[3] for key in groups},
+                    recipient_id__in={key[0] for key in groups},
+                    is_read=False,
+                )
+            }
+            known = _known_actors(list(existing.values())) if existing else set()
+            actors = []
+            for key, (post_id, group_rows) in groups.items():
+                notification = existing.get(key)
+                if notification is None:
+                    _create_unread(key, post_id, group_rows, actors)
+                    continue
+                _add_actors(notification, group_rows, known, actors)
+                notification.save()
+            NotificationActor.objects.bulk_create(actors, ignore_conflicts=True)
+            recipients = {key[0] for key in groups}
+            transaction.on_commit(lambda: invalidate_unread(recipients))
+
+        NotificationOutbox.objects.filter(id__in=[row.id for row in rows]).delete()
+    return len(rows)
+
+
+def dispatch_all(batch_size=None):
+    """쌓인 아웃박스를 모두 처리하고 처리한 행 수 반환"""
+    total = 0
+    while True:
+        count = dispatch(batch_size)
+        if not count:
+            return total
+        total += count
+
+
+def page(user_id, cursor, page_size, unread_only=True):
+    """최근 갱신순 한 페이지 → (알림 목록, 다음 커서)"""
+    notifications = Notification.objects.filter(recipient_id=user_id).select_related('last_actor')
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+    notifications = notifications.order_by('-updated_at', '-id')
+    if cursor:
+        updated_at, notification_id = cursors.decode(cursor)
+        notifications = notifications.filter(
+            Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=notification_id)
+        )
+    items = list(notifications[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        last = items[page_size - 1]
+        next_cursor = cursors.encode(last.updated_at, last.id)
+    return items[:page_size], next_cursor
@@ -0,0 +1,75 @@
+# community_api_service/ranking.py
+"""
+인기 게시글(hot) 점수
+
+    hot_score = log10(좋아요*3 + 댓글*2 + 조회수*0.1 + 1) + (작성 시각 - 기준 시각) / HOT_SCORE_DECAY_SECONDS
+
+작성 시각 항이 점수에 더해지므로 새 글일수록 점수가 높고, 참여도가 10배가 되어야
+HOT_SCORE_DECAY_SECONDS 만큼 늦게 쓴 글과 같아진다. 시간이 지나도 기존 점수를 다시 계산할 필요가 없어서
+좋아요/댓글/조회가 생길 때 해당 게시글 한 건만 갱신하면 된다 (posts.hot_score 인덱스로 정렬).
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Log, Round
+from django.utils import timezone
+
+HOT_SCORE_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+LIKE_WEIGHT = 3
+COMMENT_WEIGHT = 2
+VIEW_WEIGHT = 0.1
+
+
+def _age_term(created_at):
+    return (created_at - HOT_SCORE_EPOCH).total_seconds() / settings.HOT_SCORE_DECAY_SECONDS
+
+
+def hot_score(like_count, comment_count, view_count, created_at=None):
+    """게시글 인기 점수 계산"""
+    created_at = created_at or timezone.now()
+    engagement = like_count * LIKE_WEIGHT + comment_count * COMMENT_WEIGHT + view_count * VIEW_WEIGHT
+    return round(math.log10(max(engagement, 0) + 1) + _age_term(created_at), 7)
+
+
+def hot_score_expression(created_at, view_delta=0):
+    """
+    hot_score와 같은 계산의 SQL 식 (update()에서 DB의 현재 카운트로 점수를 매김)
+
+    작성 시각 항은 바뀌지 않는 created_at으로 미리 계산하고, 카운트는 UPDATE 시점의 행 값을 쓴다.
+    view_delta는 같은 UPDATE에서 올리는 조회수 (MySQL은 SET을 왼쪽부터 적용하므로 점수를 먼저 둘 것)
+    """
+    engagement = (
+        F('like_count') * LIKE_WEIGHT + F('comment_count') * COMMENT_WEIGHT
+        + Cast(F('view_count') + view_delta, FloatField()) * VIEW_WEIGHT
+    )
+    return Round(Log(10, engagement + 1.0) + _age_term(created_at), 7)
+
+
+def post_hot_score(post):
+    return hot_score(post.like_count, post.comment_count, post.view_count, post.created_at)
+
+
+def refresh_hot_score(post_id):
+    """
+    게시글 한 건의 점수를 primary에 커밋된 현재 카운트로 다시 계산
+
+    행을 잠그고 읽어서 쓰므로 동시에 바뀐 좋아요/댓글/조회수를 놓치지 않는다.
+    replica로 읽는 조회 API 안에서 불러도 primary(쓰기 DB)에서 읽는다.
+    """
+    # 런타임 import로 순환 참조 방지
+    from .models import Post
+
+    alias = router.db_for_write(Post)
+    with transaction.atomic(using=alias):
+        row = Post.objects.using(alias).select_for_update().filter(id=post_id).values_list(
+            'like_count', 'comment_count', 'view_count', 'created_at'
+        ).first()
+        if row is None:
+            return None
+        score = hot_score(*row)
+        Post.objects.using(alias).filter(id=post_id).update(hot_score=score)
+    return score
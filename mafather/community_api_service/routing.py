@@ -0,0 +1,7 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/community/feed/', consumers.FeedEventConsumer.as_asgi(), name='ws-feed'),
+    path('ws/community/posts/<uuid:post_id>/', consumers.PostEventConsumer.as_asgi(), name='ws-post'),
+]
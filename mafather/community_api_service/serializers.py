@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import Post, Category, PostImage, Comment
+from .models import Post, Category, PostImage, Comment, Notification
+from api_service.models import UploadedImage
 from api_service.serializers import UserSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -8,15 +10,24 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'post_type', 'color', 'icon']
 
 class PostImageSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = PostImage
-        fields = ['id', 'image_url', 'alt_text', 'order']
+        fields = ['id', 'image_url', 'alt_text', 'order', 'variants']
+
+    def get_variants(self, obj):
+        # 업로드 API로 올린 이미지면 너비별 WebP/JPEG URL (목록은 가장 작은 변환본을 쓰면 됨)
+        return obj.image.variant_urls() if obj.image else []
 
 class PostSerializer(serializers.ModelSerializer):
     images = PostImageSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
     category_id = serializers.UUIDField(write_only=True)
     user = UserSerializer(read_only=True)
+    image_ids = serializers.ListField(
+        child=serializers.UUIDField(), write_only=True, required=False, max_length=10
+    )
     
     class Meta:
         model = Post
@@ -24,13 +35,35 @@ class PostSerializer(serializers.ModelSerializer):
             'id', 'title', 'content', 'category', 'category_id',
             'post_type', 'status', 'is_anonymous', 'is_solved',
             'is_pinned', 'images', 'user', 'created_at', 'updated_at',
-            'view_count', 'like_count', 'comment_count'
+            'view_count', 'like_count', 'comment_count', 'image_ids'
         ]
         read_only_fields = [
             'id', 'created_at', 'updated_at', 'view_count',
             'like_count', 'comment_count', 'user'
         ]
 
+    def validate_image_ids(self, value):
+        """업로드 API로 올린 본인 이미지만 첨부 가능"""
+        request = self.context.get('request')
+        images = UploadedImage.objects.filter(id__in=value)
+        if request is not None:
+            images = images.filter(user=request.user)
+        found = {image.id: image for image in images}
+        missing = [str(image_id) for image_id in value if image_id not in found]
+        if missing:
+            raise serializers.ValidationError(f"이미지를 찾을 수 없습니다: {', '.join(missing)}")
+        return [found[image_id] for image_id in value]
+
+    def create(self, validated_data):
+        images = validated_data.pop('image_ids', [])
+        with transaction.atomic():
+            post = super().create(validated_data)
+            PostImage.objects.bulk_create([
+                PostImage(post=post, image=image, image_url=image.original.url, order=order)
+                for order, image in enumerate(images)
+            ])
+        return post
+
 class CommentSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
@@ -49,9 +82,22 @@ class CommentSerializer(serializers.ModelSerializer):
     
     def get_replies(self, obj):
         if obj.depth == 0:  # 최상위 댓글인 경우에만 답글 표시
-            replies = Comment.objects.filter(
-                parent=obj,
-                deleted_at__isnull=True
-            ).order_by('created_at')
+            # 미리 가져온 답글이 있으면 추가 쿼리 없이 사용 (views.comment_queryset 참고)
+            replies = getattr(obj, 'live_replies', None)
+            if replies is None:
+                replies = Comment.objects.filter(
+                    parent=obj,
+                    deleted_at__isnull=True
+                ).order_by('created_at')
             return CommentSerializer(replies, many=True).data
-        return []
\ No newline at end of file
+        return []
+
+class NotificationSerializer(serializers.ModelSerializer):
+    last_actor = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = [
+            'id', 'kind', 'target_type', 'target_id', 'post', 'message',
+            'actor_count', 'last_actor', 'is_read', 'created_at', 'updated_at',
+        ]
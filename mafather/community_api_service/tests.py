@@ -1,9 +1,28 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Post, Category, Comment, Like
-from api_service.models import User
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import override_settings
+from .models import (
+    Post, PostCounter, PostImage, Category, Comment, Like, Notification, NotificationActor, NotificationOutbox,
+)
+from .autocomplete import PrefixTrie, AutocompleteIndex, to_jamo
+from api_service.models import User, SearchLog, UploadedImage
+from mafather.renderers import ORJSONRenderer
+from . import feed, notifications, ranking, views
+from .routing import websocket_urlpatterns
+from .serializers import CommentSerializer, PostSerializer
 import uuid
 
 class CommunityAPITestCase(TestCase):
@@ -247,4 +266,957 @@ class CommunityAPITestCase(TestCase):
         url = reverse('comment-edit', args=[post.id, comment.id])
         data = {'content': '수정 시도'}
         response = self.client.put(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PrefixTrieTestCase(TestCase):
+    def test_partial_syllable_matches(self):
+        """입력 중인 음절로도 추천어가 매칭되는지 테스트"""
+        trie = PrefixTrie(top_k=5)
+        trie.add('한글 공부', 3)
+        trie.add('하늘', 1)
+        trie.add('닭가슴살 이유식', 2)
+
+        self.assertEqual(trie.suggest('하'), ['한글 공부', '하늘'])
+        # '하늘'을 입력하는 도중에도 '한'이 먼저 입력되므로 함께 매칭됨
+        self.assertEqual(trie.suggest('한'), ['한글 공부', '하늘'])
+        self.assertEqual(trie.suggest('한그'), ['한글 공부'])
+        self.assertEqual(trie.suggest('ㅎ'), ['한글 공부', '하늘'])
+        self.assertEqual(trie.suggest('달'), ['닭가슴살 이유식'])
+        self.assertEqual(trie.suggest('없는 검색어'), [])
+        self.assertEqual(to_jamo('닭'), 'ㄷㅏㄹㄱ')
+
+    def test_top_k_is_kept_per_node(self):
+        """노드별 상위 k개 추천어 유지 및 가중치 누적 테스트"""
+        trie = PrefixTrie(top_k=2)
+        trie.add('수면 교육', 5)
+        trie.add('수면 시간', 3)
+        trie.add('수유 간격', 4)
+        self.assertEqual(trie.suggest('수'), ['수면 교육', '수유 간격'])
+
+        trie.add('수면 시간', 10)
+        self.assertEqual(trie.suggest('수'), ['수면 시간', '수면 교육'])
+        self.assertEqual(trie.suggest('수유'), ['수유 간격'])
+        self.assertEqual(trie.suggest('수', limit=1), ['수면 시간'])
+
+
+@override_settings(AUTOCOMPLETE_BACKGROUND_REFRESH=False)
+class SearchAutocompleteAPITestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_autocomplete_from_search_logs_and_titles(self):
+        """검색 로그와 게시글 제목 기반 자동완성 테스트"""
+        for _ in range(3):
+            SearchLog.objects.create(query='이유식 만들기', results_count=5)
+        SearchLog.objects.create(query='이유식 거부', results_count=0)  # 결과 없는 검색은 제외
+        Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title='이앓이 대처법',
+            content='내용',
+            post_type='question'
+        )
+
+        index = AutocompleteIndex()
+        with mock.patch.object(views, 'autocomplete_index', index):
+            response = self.client.get(reverse('search-autocomplete'), {'q': '이'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['suggestions'], ['이유식 만들기', '이앓이 대처법'])
+
+            # 증분 갱신으로 새 게시글 반영
+            Post.objects.create(
+                user=self.user,
+                category=self.category,
+                title='이유식 알레르기',
+                content='내용',
+                post_type='tip'
+            )
+            index.refresh()
+            response = self.client.get(reverse('search-autocomplete'), {'q': '이유'})
+            self.assertEqual(response.data['suggestions'], ['이유식 만들기', '이유식 알레르기'])
+
+
+
+class AsyncReadAPITestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.post = Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title='테스트 게시글',
+            content='테스트 내용입니다.',
+            post_type='question'
+        )
+        self.comment = Comment.objects.create(user=self.user, post=self.post, content='부모 댓글입니다.')
+        Comment.objects.create(user=self.user, post=self.post, parent=self.comment, content='답글입니다.')
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def test_async_responses_match_sync(self):
+        """비동기 조회 API가 동기 API와 같은 응답을 주는지 테스트"""
+        sync = self.client.get(reverse('post-list'))
+        response = self.client.get(reverse('post-list-async'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync.json())
+
+        args = [self.post.id, self.comment.id]
+        sync = self.client.get(reverse('comment-detail', args=args))
+        response = self.client.get(reverse('comment-detail-async', args=args))
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(len(response.json()['replies']), 1)
+
+    def test_async_post_detail_increments_view_count(self):
+        """비동기 상세 조회 시 조회수 증가 테스트"""
+        response = self.client.get(reverse('post-detail-async', args=[self.post.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['view_count'], 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+        response = self.client.get(reverse('post-detail-async', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_async_requires_login(self):
+        """비동기 조회 API 인증 테스트"""
+        self.client.logout()
+        response = self.client.get(reverse('post-list-async'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    COMMUNITY_EVENT_COALESCE_SECONDS=0.2,
+)
+class RealtimeEventTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.post = Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title='테스트 게시글',
+            content='테스트 내용입니다.',
+            post_type='question'
+        )
+
+    async def connect(self, path, user=None):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), path)
+        communicator.scope['user'] = user or self.user
+        connected, _ = await communicator.connect()
+        return communicator, connected
+
+    def create_comment(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user=self.user, post=self.post, content='새 댓글')
+
+    def toggle_like(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            like = Like.objects.filter(user=user, target_id=self.post.id, target_type='post').first()
+            if like:
+                like.delete()
+            else:
+                Like.objects.create(user=user, target_id=self.post.id, target_type='post')
+
+    async def test_comment_events_pushed_to_post_channel(self):
+        """새 댓글과 댓글 수 이벤트 전달 테스트"""
+        communicator, connected = await self.connect(f'/ws/community/posts/{self.post.id}/')
+        self.assertTrue(connected)
+
+        await sync_to_async(self.create_comment)()
+        created = await communicator.receive_json_from()
+        self.assertEqual(created['type'], 'comment.created')
+        self.assertEqual(created['data']['content'], '새 댓글')
+
+        count = await communicator.receive_json_from(timeout=1)
+        self.assertEqual(count, {
+            'type': 'comment_count',
+            'data': {'post_id': str(self.post.id), 'comment_count': 1},
+        })
+        await communicator.disconnect()
+
+    def test_comment_event_serialized_after_commit(self):
+        """새 댓글 이벤트는 커밋 후 답글 조회 없이 직렬화하고, 채널 레이어가 없으면 직렬화하지 않는지 테스트"""
+        with mock.patch('community_api_service.serializers.CommentSerializer', wraps=CommentSerializer) as serializer:
+            with self.captureOnCommitCallbacks() as callbacks:
+                Comment.objects.create(user=self.user, post=self.post, content='새 댓글')
+            serializer.assert_not_called()
+            with self.assertNumQueries(0):
+                for callback in callbacks:
+                    callback()
+            self.assertTrue(serializer.called)
+
+            serializer.reset_mock()
+            with override_settings(CHANNEL_LAYERS={}):
+                with self.captureOnCommitCallbacks(execute=True):
+                    Comment.objects.create(user=self.user, post=self.post, content='구독자 없는 댓글')
+            serializer.assert_not_called()
+
+    async def test_like_storm_is_coalesced(self):
+        """좋아요가 몰릴 때 구독자에게 마지막 값만 합쳐서 보내는지 테스트"""
+        communicator, connected = await self.connect('/ws/community/feed/')
+        self.assertTrue(connected)
+
+        for _ in range(5):
+            await sync_to_async(self.toggle_like)(self.user)
+
+        messages = [await communicator.receive_json_from(timeout=1)]
+        while not await communicator.receive_nothing(timeout=0.4):
+            messages.append(await communicator.receive_json_from())
+
+        # 5번의 변경이 간격당 한 메시지로 합쳐지고 마지막 값이 전달됨
+        self.assertLessEqual(len(messages), 2)
+        self.assertEqual(messages[-1]['type'], 'like.changed')
+        self.assertEqual(messages[-1]['data']['like_count'], 1)
+        await communicator.disconnect()
+
+    async def test_rejects_anonymous_and_missing_post(self):
+        """비로그인 사용자와 없는 게시글 구독 거부 테스트"""
+        from django.contrib.auth.models import AnonymousUser
+
+        communicator, connected = await self.connect('/ws/community/feed/', user=AnonymousUser())
+        self.assertFalse(connected)
+        communicator, connected = await self.connect(f'/ws/community/posts/{uuid.uuid4()}/')
+        self.assertFalse(connected)
+
+
+
+class HotRankingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='story')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_post(self, title):
+        return Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title=title,
+            content='내용',
+            post_type='story'
+        )
+
+    def test_score_updates_incrementally(self):
+        """좋아요/댓글/조회 시 인기 점수 증분 갱신 테스트"""
+        post = self.create_post('게시글')
+        initial = post.hot_score
+
+        Like.objects.create(user=self.user, target_id=post.id, target_type='post')
+        post.refresh_from_db()
+        after_like = post.hot_score
+        self.assertGreater(after_like, initial)
+
+        Comment.objects.create(user=self.user, post=post, content='댓글')
+        post.refresh_from_db()
+        self.assertGreater(post.hot_score, after_like)
+
+        after_comment = post.hot_score
+        post.increment_view_count()
+        post.refresh_from_db()
+        self.assertGreater(post.hot_score, after_comment)
+
+    def test_view_count_keeps_concurrent_changes(self):
+        """먼저 읽어 둔 인스턴스로 조회수를 올려도 그 사이의 좋아요/조회가 사라지지 않는지 테스트"""
+        post = self.create_post('게시글')
+        stale = Post.objects.get(id=post.id)
+        async_stale = Post.objects.get(id=post.id)
+        Like.objects.create(user=self.user, target_id=post.id, target_type='post')
+
+        stale.increment_view_count()
+        async_to_sync(async_stale.aincrement_view_count)()
+
+        post.refresh_from_db()
+        self.assertEqual((post.like_count, post.view_count), (1, 2))
+        self.assertAlmostEqual(post.hot_score, ranking.hot_score(1, 0, 2, post.created_at), places=6)
+
+    def test_hot_sort_with_cursor(self):
+        """인기순 목록과 커서 페이지네이션 테스트"""
+        posts = [self.create_post(f'게시글 {i}') for i in range(5)]
+        for user_index, post in enumerate(posts[:3]):
+            for i in range(user_index + 1):
+                liker = User.objects.create_user(email=f'liker{user_index}-{i}@example.com', password='x', name='liker')
+                Like.objects.create(user=liker, target_id=post.id, target_type='post')
+
+        with self.settings(COMMUNITY_HOT_PAGE_SIZE=2):
+            url = reverse('post-list')
+            seen = []
+            cursor = None
+            while True:
+                params = {'sort': 'hot'}
+                if cursor:
+                    params['cursor'] = cursor
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                seen.extend(item['title'] for item in response.data['results'])
+                cursor = response.data['next_cursor']
+                if not cursor:
+                    break
+
+        self.assertEqual(seen[:3], ['게시글 2', '게시글 1', '게시글 0'])
+        self.assertEqual(sorted(seen), sorted(post.title for post in posts))
+
+        response = self.client.get(url, {'sort': 'hot', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FeedFilterAndCounterTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.question_category = Category.objects.create(name='질문 카테고리', post_type='question')
+        self.story_category = Category.objects.create(name='이야기 카테고리', post_type='story')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_post(self, category, post_type, **kwargs):
+        return Post.objects.create(
+            user=self.user,
+            category=category,
+            title=kwargs.pop('title', '게시글'),
+            content='내용',
+            post_type=post_type,
+            **kwargs
+        )
+
+    def counter(self, category, post_type):
+        row = PostCounter.objects.filter(category=category, post_type=post_type).first()
+        return (row.post_count, row.unsolved_count) if row else (0, 0)
+
+    def test_counters_follow_post_changes(self):
+        """게시글 작성/해결/삭제/상태 변경 시 집계 테이블 증분 갱신 테스트"""
+        question = self.create_post(self.question_category, 'question', is_solved=False)
+        self.create_post(self.question_category, 'question', is_solved=False)
+        self.create_post(self.story_category, 'story')
+        self.create_post(self.story_category, 'story', status='draft')
+        self.assertEqual(self.counter(self.question_category, 'question'), (2, 2))
+        self.assertEqual(self.counter(self.story_category, 'story'), (1, 0))
+
+        question.is_solved = True
+        question.save()
+        self.assertEqual(self.counter(self.question_category, 'question'), (2, 1))
+
+        # 조회수 저장처럼 집계와 무관한 update_fields는 카운터를 건드리지 않음
+        with self.assertNumQueries(1):
+            question.increment_view_count()
+
+        # 다시 불러온 객체로 카테고리 이동
+        moved = Post.objects.get(id=question.id)
+        moved.category = self.story_category
+        moved.save()
+        self.assertEqual(self.counter(self.question_category, 'question'), (1, 1))
+        self.assertEqual(self.counter(self.story_category, 'question'), (1, 0))
+
+        moved.soft_delete()
+        self.assertEqual(self.counter(self.story_category, 'question'), (0, 0))
+        Post.objects.get(post_type='story', status='published').delete()
+        self.assertEqual(self.counter(self.story_category, 'story'), (0, 0))
+
+        expected = sorted(PostCounter.objects.values_list('category_id', 'post_type', 'post_count', 'unsolved_count'))
+        PostCounter.rebuild()
+        rebuilt = sorted(PostCounter.objects.values_list('category_id', 'post_type', 'post_count', 'unsolved_count'))
+        self.assertEqual([row for row in expected if row[2]], rebuilt)
+
+    def test_counters_follow_cascade_deletes(self):
+        """사용자/카테고리 삭제로 게시글이 CASCADE 삭제될 때도 집계가 맞는지 테스트"""
+        other = User.objects.create_user(email='other@example.com', password='x', name='Other')
+        self.create_post(self.question_category, 'question', is_solved=False)
+        Post.objects.create(user=other, category=self.question_category, title='글', content='내용',
+                            post_type='question', is_solved=False)
+        Post.objects.create(user=other, category=self.story_category, title='글', content='내용', post_type='story')
+        self.assertEqual(self.counter(self.question_category, 'question'), (2, 2))
+
+        other.delete()
+        self.assertEqual(self.counter(self.question_category, 'question'), (1, 1))
+        self.assertEqual(self.counter(self.story_category, 'story'), (0, 0))
+
+        Post.objects.filter(category=self.question_category).delete()
+        self.assertEqual(self.counter(self.question_category, 'question'), (0, 0))
+
+        self.create_post(self.story_category, 'story')
+        self.story_category.delete()
+        self.assertFalse(PostCounter.objects.filter(category_id=self.story_category.id).exists())
+
+    def test_filtered_feed_and_counts(self):
+        """post_type / category / unsolved 필터와 게시글 수 API 테스트"""
+        self.create_post(self.question_category, 'question', title='미해결', is_solved=False)
+        self.create_post(self.question_category, 'question', title='해결', is_solved=True)
+        self.create_post(self.story_category, 'story', title='이야기')
+        self.create_post(self.story_category, 'story', title='임시', status='draft')
+        url = reverse('post-list')
+
+        response = self.client.get(url)
+        self.assertEqual({item['title'] for item in response.data}, {'미해결', '해결', '이야기'})
+
+        response = self.client.get(url, {'post_type': 'question', 'unsolved': 'true'})
+        self.assertEqual([item['title'] for item in response.data], ['미해결'])
+
+        response = self.client.get(url, {'category': str(self.story_category.id)})
+        self.assertEqual([item['title'] for item in response.data], ['이야기'])
+
+        for params in ({'post_type': 'unknown'}, {'category': 'not-a-uuid'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('post-counts'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['post_types']['question'], {'post_count': 2, 'unsolved_count': 1})
+        self.assertEqual(response.data['post_types']['story'], {'post_count': 1, 'unsolved_count': 0})
+        self.assertEqual(response.data['post_types']['tip'], {'post_count': 0, 'unsolved_count': 0})
+
+
+class FeedSerializerParityTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.other_user = User.objects.create_user(email='other@example.com', password='x', name='다른 사용자')
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+        question = Category.objects.create(name='질문', post_type='question', color='#ff0000', icon='q')
+        story = Category.objects.create(name='이야기', post_type='story')
+        self.posts = [
+            Post.objects.create(user=self.user, category=question, title='질문 글', content='내용',
+                                post_type='question', is_solved=False),
+            Post.objects.create(user=self.other_user, category=story, title='익명 글', content='내용 "따옴표"',
+                                post_type='story', is_anonymous=True, is_pinned=True),
+            Post.objects.create(user=self.user, category=story, title='이미지 글', content='내용', post_type='story'),
+        ]
+        upload = UploadedImage.objects.create(
+            original='images/blobs/ab/abc.jpg', sha256='abc', content_type='image/jpeg', status='ready',
+            variants=[{'width': 320, 'height': 240, 'webp': 'images/variants/ab/abc/320.webp',
+                       'jpeg': 'images/variants/ab/abc/320.jpg'}],
+        )
+        PostImage.objects.create(post=self.posts[2], image=upload, image_url='/media/images/blobs/ab/abc.jpg', order=1)
+        PostImage.objects.create(post=self.posts[2], image_url='https://example.com/a.jpg', alt_text='대체', order=0)
+
+    def test_fast_feed_matches_post_serializer(self):
+        """읽기 전용 피드 직렬화가 PostSerializer와 같은 바이트를 내는지 테스트"""
+        renderer = ORJSONRenderer()
+        expected = renderer.render(PostSerializer(views.post_queryset(), many=True).data)
+        self.assertEqual(renderer.render(feed.serialize_feed(views.post_queryset())), expected)
+
+        # 카테고리 캐시가 있어도 이미지/게시글 쿼리 2개만 실행
+        with self.assertNumQueries(2):
+            feed.serialize_feed(views.post_queryset())
+
+        response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.content, expected)
+        response = self.client.get(reverse('post-list-async'))
+        self.assertEqual(response.content, expected)
+
+    def test_category_cache_invalidation(self):
+        """카테고리 변경 시 캐시된 카테고리 정보 갱신 테스트"""
+        feed.serialize_feed(views.post_queryset())
+        category = self.posts[0].category
+        category.name = '바뀐 이름'
+        category.save()
+        items = feed.serialize_feed(views.post_queryset().filter(id=self.posts[0].id))
+        self.assertEqual(items[0]['category']['name'], '바뀐 이름')
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.post = Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title='테스트 게시글',
+            content='테스트 내용입니다.',
+            post_type='question'
+        )
+        self.comment = Comment.objects.create(user=self.user, post=self.post, content='부모 댓글입니다.')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_post_not_modified(self):
+        """If-None-Match가 맞으면 조회수 증가 없이 304를 주는지 테스트"""
+        url = reverse('post-detail', args=[self.post.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # ETag 조회 쿼리 하나만 실행
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+        # 조회수만 바뀐 경우는 같은 ETag
+        response = self.client.get(url)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_post_etag_changes(self):
+        """좋아요/댓글/수정 후 ETag가 바뀌는지 테스트"""
+        url = reverse('post-detail', args=[self.post.id])
+        etags = [self.client.get(url)['ETag']]
+
+        self.client.post(reverse('post-like', args=[self.post.id]))
+        etags.append(self.client.get(url)['ETag'])
+        self.client.post(reverse('post-comment', args=[self.post.id]), {'content': '새 댓글'}, format='json')
+        etags.append(self.client.get(url)['ETag'])
+        self.post.refresh_from_db()
+        self.post.title = '바뀐 제목'
+        self.post.save()
+        etags.append(self.client.get(url)['ETag'])
+        self.assertEqual(len(set(etags)), 4)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], '바뀐 제목')
+
+    def test_comment_etag_includes_replies(self):
+        """답글 작성/좋아요 시 댓글 ETag가 바뀌는지 테스트"""
+        url = reverse('comment-detail', args=[self.post.id, self.comment.id])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.post(
+            reverse('comment-reply', args=[self.post.id, self.comment.id]), {'content': '답글'}, format='json'
+        )
+        reply_id = response.json()['id']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['replies']), 1)
+
+        etag = response['ETag']
+        self.client.post(reverse('comment-like', args=[self.post.id, reply_id]))
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_async_not_modified(self):
+        """비동기 상세 조회 API의 304 테스트"""
+        self.client.force_login(self.user)
+        for url in (
+            reverse('post-detail-async', args=[self.post.id]),
+            reverse('comment-detail-async', args=[self.post.id, self.comment.id]),
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+        # 동기/비동기 ETag는 같음
+        etag = self.client.get(reverse('post-detail', args=[self.post.id]))['ETag']
+        response = self.client.get(reverse('post-detail-async', args=[self.post.id]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class IdempotentLikeTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.post = Post.objects.create(
+            user=self.user,
+            category=self.category,
+            title='테스트 게시글',
+            content='테스트 내용입니다.',
+            post_type='question'
+        )
+        self.comment = Comment.objects.create(user=self.user, post=self.post, content='댓글입니다.')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_put_and_delete_are_idempotent(self):
+        """PUT/DELETE를 반복해도 상태가 한 번만 바뀌는지 테스트"""
+        url = reverse('post-like', args=[self.post.id])
+        response = self.client.put(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['like_count'], 1)
+
+        # 이미 좋아요 상태면 조회만 (게시글 조회 + get_or_create의 조회)
+        with self.assertNumQueries(2):
+            response = self.client.put(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'message': '이미 좋아요를 누른 상태입니다.', 'liked': True, 'like_count': 1
+        })
+        self.assertEqual(Like.objects.filter(target_id=self.post.id).count(), 1)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['like_count'], 0)
+        with self.assertNumQueries(2):
+            response = self.client.delete(url)
+        self.assertFalse(response.json()['liked'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_comment_put_and_delete(self):
+        """댓글 좋아요 PUT/DELETE 테스트"""
+        url = reverse('comment-like', args=[self.post.id, self.comment.id])
+        self.assertEqual(self.client.put(url).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.put(url).status_code, status.HTTP_200_OK)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 1)
+        self.client.delete(url)
+        self.client.delete(url)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 0)
+
+    def test_idempotency_key_replays_response(self):
+        """같은 Idempotency-Key로 재전송한 토글 요청이 다시 실행되지 않는지 테스트"""
+        url = reverse('post-like', args=[self.post.id])
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY='tap-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            retry = self.client.post(url, HTTP_IDEMPOTENCY_KEY='tap-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+
+        # 다른 키는 새 요청, 다른 사용자의 같은 키는 따로 처리
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY='tap-2')
+        self.assertFalse(response.json()['liked'])
+        other_user = User.objects.create_user(email='other@example.com', password='x', name='다른 사용자')
+        self.client.force_authenticate(user=other_user)
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY='tap-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(response.json()['like_count'], 1)
+
+        # 실패 응답은 저장하지 않음
+        missing = reverse('post-like', args=[uuid.uuid4()])
+        self.assertEqual(self.client.put(missing, HTTP_IDEMPOTENCY_KEY='tap-3').status_code, 404)
+        self.assertNotIn('Idempotent-Replayed', self.client.put(missing, HTTP_IDEMPOTENCY_KEY='tap-3'))
+
+
+class BatchFetchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.posts = [
+            Post.objects.create(user=self.user, category=self.category, title=f'게시글 {i}', content='내용',
+                                post_type='question')
+            for i in range(3)
+        ]
+        self.comment = Comment.objects.create(user=self.user, post=self.posts[0], content='댓글입니다.')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_batch_posts(self):
+        """ID 목록 순서대로 상세 조회와 같은 형식으로 돌려주는지 테스트"""
+        deleted = self.posts[2]
+        deleted.soft_delete()
+        missing_id = uuid.uuid4()
+        ids = [str(self.posts[1].id), str(self.posts[0].id), str(deleted.id), str(missing_id), str(self.posts[1].id)]
+
+        # 게시글 + 이미지 + 카테고리(캐시가 비어 있음), 조회수 쓰기 없음
+        with self.assertNumQueries(3):
+            response = self.client.post(reverse('post-batch'), {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([item['id'] for item in data['results']], ids[:2])
+        self.assertEqual(data['missing'], [str(deleted.id), str(missing_id)])
+        self.assertNotIn('unchanged', data)
+
+        detail = PostSerializer(views.post_queryset().get(id=self.posts[0].id)).data
+        renderer = ORJSONRenderer()
+        self.assertEqual(renderer.render(data['results'][1]), renderer.render(detail))
+        self.posts[0].refresh_from_db()
+        self.assertEqual(self.posts[0].view_count, 0)
+
+    def test_batch_posts_delta(self):
+        """updated_since 이후 바뀐 게시글만 본문을 보내는지 테스트"""
+        url = reverse('post-batch')
+        ids = [str(post.id) for post in self.posts]
+        since = self.client.post(url, {'ids': ids}, format='json').json()['server_time']
+
+        self.posts[1].title = '바뀐 제목'
+        self.posts[1].save()
+        Like.objects.create(user=self.user, target_id=self.posts[0].id, target_type='post')
+
+        response = self.client.post(url, {'ids': ids, 'updated_since': since}, format='json')
+        data = response.json()
+        self.assertEqual([item['title'] for item in data['results']], ['바뀐 제목'])
+        unchanged = {item['id']: item for item in data['unchanged']}
+        self.assertEqual(set(unchanged), {ids[0], ids[2]})
+        self.assertEqual(unchanged[ids[0]]['like_count'], 1)
+        self.assertEqual(data['missing'], [])
+
+    def test_batch_comments(self):
+        """댓글 일괄 조회와 답글이 달린 댓글의 delta 테스트"""
+        url = reverse('comment-batch')
+        ids = [str(self.comment.id), str(uuid.uuid4())]
+        data = self.client.post(url, {'ids': ids}, format='json').json()
+        self.assertEqual([item['id'] for item in data['results']], ids[:1])
+        self.assertEqual(data['missing'], ids[1:])
+
+        since = data['server_time']
+        data = self.client.post(url, {'ids': ids, 'updated_since': since}, format='json').json()
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['unchanged'], [{'id': ids[0], 'like_count': 0}])
+
+        Comment.objects.create(user=self.user, post=self.posts[0], parent=self.comment, content='답글')
+        data = self.client.post(url, {'ids': ids, 'updated_since': since}, format='json').json()
+        self.assertEqual(len(data['results'][0]['replies']), 1)
+
+    def test_batch_validation(self):
+        """잘못된 요청 테스트"""
+        url = reverse('post-batch')
+        for body in (
+            {},
+            {'ids': []},
+            {'ids': ['not-a-uuid']},
+            {'ids': [str(uuid.uuid4())] * 2, 'updated_since': 'yesterday'},
+        ):
+            response = self.client.post(url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, body)
+        with override_settings(COMMUNITY_BATCH_MAX_IDS=2):
+            response = self.client.post(url, {'ids': [str(uuid.uuid4()) for _ in range(3)]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NotificationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.others = [
+            User.objects.create_user(email=f'user{index}@example.com', password='testpass123', name=f'사용자{index}')
+            for index in range(4)
+        ]
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+        self.post = Post.objects.create(
+            user=self.user, category=self.category, title='테스트 게시글', content='테스트 내용입니다.', post_type='question'
+        )
+        self.comment = Comment.objects.create(user=self.user, post=self.post, content='댓글입니다.')
+        self.client = APIClient()
+
+    def test_outbox_written_with_like_and_reply(self):
+        """좋아요/답글이 같은 트랜잭션에서 아웃박스에만 쓰이는지 테스트"""
+        self.client.force_authenticate(user=self.others[0])
+        self.client.put(reverse('post-like', args=[self.post.id]))
+        response = self.client.post(
+            reverse('comment-reply', args=[self.post.id, self.comment.id]), {'content': '답글입니다.'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(NotificationOutbox.objects.values_list('kind', 'target_type', 'target_id')),
+            [('like', 'post', self.post.id), ('reply', 'comment', self.comment.id)],
+        )
+        self.assertFalse(Notification.objects.exists())
+
+        self.assertEqual(notifications.dispatch_all(), 2)
+        self.assertFalse(NotificationOutbox.objects.exists())
+        self.assertEqual(Notification.objects.filter(recipient=self.user).count(), 2)
+
+    def test_dispatch_groups_per_recipient(self):
+        """같은 대상의 알림을 하나로 묶고 자기 행동/취소된 좋아요는 버리는지 테스트"""
+        for user in self.others[:3]:
+            Like.objects.create(user=user, target_id=self.post.id, target_type='post')
+        Like.objects.create(user=self.user, target_id=self.post.id, target_type='post')  # 자기 글
+        Like.objects.create(user=self.others[3], target_id=self.post.id, target_type='post').delete()  # 취소
+        # 아웃박스, 대상, 좋아요, 기존 알림 조회 + 알림 INSERT(SAVEPOINT 포함) + 행위자 INSERT + 아웃박스 DELETE
+        # (+ SAVEPOINT 2개)
+        with self.assertNumQueries(11):
+            self.assertEqual(notifications.dispatch(), 5)
+
+        notification = Notification.objects.get()
+        self.assertEqual((notification.recipient, notification.actor_count), (self.user, 3))
+        self.assertEqual(notification.last_actor, self.others[2])
+        self.assertEqual(notification.message, '사용자2님 외 2명이 회원님의 게시글을 좋아합니다.')
+
+        # 읽지 않은 알림에 이어서 묶고, 같은 사람이 다시 좋아요해도 한 번만 셈
+        Like.objects.filter(user=self.others[0], target_id=self.post.id).get().delete()
+        Like.objects.create(user=self.others[0], target_id=self.post.id, target_type='post')
+        Like.objects.create(user=self.others[3], target_id=self.post.id, target_type='post')
+        notifications.dispatch_all()
+        notification.refresh_from_db()
+        self.assertEqual((Notification.objects.count(), notification.actor_count), (1, 4))
+
+        # 읽은 뒤에 온 행동은 새 알림
+        notifications.mark_read(self.user.pk)
+        Like.objects.filter(user=self.others[3], target_id=self.post.id).get().delete()
+        Like.objects.create(user=self.others[3], target_id=self.post.id, target_type='post')
+        notifications.dispatch_all()
+        self.assertEqual(Notification.objects.filter(is_read=False).get().actor_count, 1)
+
+    @override_settings(NOTIFICATION_RECENT_ACTORS=2)
+    def test_actor_count_is_distinct(self):
+        """최근 행위자 목록에서 밀려난 사람이 다시 행동해도 한 번만 세는지 테스트"""
+        for user in self.others[:3]:
+            Like.objects.create(user=user, target_id=self.post.id, target_type='post')
+        notifications.dispatch_all()
+        Like.objects.filter(user=self.others[0], target_id=self.post.id).get().delete()
+        Like.objects.create(user=self.others[0], target_id=self.post.id, target_type='post')
+        notifications.dispatch_all()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 3)
+        self.assertEqual(notification.actors.count(), 3)
+        self.assertEqual(notification.message, '사용자0님 외 2명이 회원님의 게시글을 좋아합니다.')
+
+    def test_concurrent_create_merges(self):
+        """다른 발송기가 먼저 만든 읽지 않은 알림에 더하는지 테스트"""
+        key = (self.user.id, 'like', 'post', self.post.id)
+        Like.objects.create(user=self.others[0], target_id=self.post.id, target_type='post')
+        notifications.dispatch_all()
+        first = Notification.objects.get()
+
+        rows = [NotificationOutbox(kind='like', actor_id=user.id, target_type='post', target_id=self.post.id)
+                for user in self.others[:2]]
+        actors = []
+        merged = notifications._create_unread(key, self.post.id, rows, actors)
+        NotificationActor.objects.bulk_create(actors, ignore_conflicts=True)
+
+        self.assertEqual(merged.id, first.id)
+        first.refresh_from_db()
+        self.assertEqual((Notification.objects.count(), first.actor_count), (1, 2))
+
+    def test_anonymous_reply(self):
+        """익명 답글은 행위자 이름을 숨기는지 테스트"""
+        Comment.objects.create(user=self.others[0], post=self.post, parent=self.comment, content='답글', is_anonymous=True)
+        Comment.objects.create(user=self.user, post=self.post, parent=self.comment, content='내 답글')
+        notifications.dispatch_all()
+        notification = Notification.objects.get()
+        self.assertEqual((notification.kind, notification.last_actor), ('reply', None))
+        self.assertEqual(notification.message, '익명이 회원님의 댓글에 답글을 남겼습니다.')
+
+    @override_settings(NOTIFICATION_PAGE_SIZE=2)
+    def test_notification_endpoints(self):
+        """알림 목록 페이지네이션, 캐시된 읽지 않은 수, 읽음 처리 테스트"""
+        comments = [Comment.objects.create(user=self.user, post=self.post, content=f'댓글 {i}') for i in range(2)]
+        Like.objects.create(user=self.others[0], target_id=self.post.id, target_type='post')
+        for comment in comments:
+            Like.objects.create(user=self.others[0], target_id=comment.id, target_type='comment')
+        notifications.dispatch_all()
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.data, {'unread_count': 3})
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(self.user.pk), 3)
+
+        url = reverse('notification-list')
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 2)
+        first_page = [item['id'] for item in response.data['results']]
+        response = self.client.get(url, {'cursor': response.data['next_cursor']})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next_cursor'])
+        self.assertEqual(response.data['results'][0]['message'], '사용자0님이 회원님의 게시글을 좋아합니다.')
+
+        response = self.client.post(reverse('notification-read'), {'ids': first_page}, format='json')
+        self.assertEqual(response.data, {'updated': 2, 'unread_count': 1})
+        self.assertEqual(len(self.client.get(url).data['results']), 1)
+        response = self.client.get(url, {'all': 'true'})
+        self.assertEqual([item['is_read'] for item in response.data['results']], [True, True])
+        self.assertIsNotNone(response.data['next_cursor'])
+        response = self.client.post(reverse('notification-read'), {}, format='json')
+        self.assertEqual(response.data, {'updated': 1, 'unread_count': 0})
+
+        self.client.force_authenticate(user=self.others[0])
+        self.assertEqual(self.client.get(url).data['results'], [])
+        self.assertEqual(self.client.get(url, {'cursor': 'invalid'}).status_code, 400)
+
+
+# 벤치마크 명령은 자체 테스트 DB를 만들고 지우므로 SQLite 파일 DB를 설정한 별도 프로세스에서 실행
+BENCH_SCRIPT = """
+import sys
+import django
+django.setup()
+from django.core.management import call_command
+
+directory = sys.argv[1]
+call_command(
+    'bench_community', users=3, posts=5, comments=5, likes=5, requests=1, concurrency=1,
+    output=f'{directory}/community.json',
+)
+call_command(
+    'bench_community', users=3, posts=5, comments=5, likes=5, requests=1, concurrency=1,
+    asgi=True, async_views=True, scenarios='feed,post_detail,comment_detail', output=f'{directory}/async.json',
+)
+call_command('bench_render', users=3, posts=5, repeat=1, output=f'{directory}/render.json')
+"""
+
+
+class BenchmarkCommandTestCase(SimpleTestCase):
+    """bench_community / bench_render 스모크 테스트"""
+
+    def test_commands_run(self):
+        """작은 시드 데이터로 두 명령이 오류 없이 결과 JSON을 만드는지 테스트"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE='mafather.settings', PYTHONPATH=str(settings.BASE_DIR),
+            DB_ENGINE='sqlite', DB_NAME=os.path.join(directory, 'unused.sqlite3'), REDIS_URL='',
+        )
+        env.pop('DB_REPLICA_HOST', None)
+        env.pop('DB_REPLICA_NAME', None)
+        env.setdefault('DJANGO_SECRET_KEY', 'bench-commands')
+        result = subprocess.run(
+            [sys.executable, '-c', BENCH_SCRIPT, directory],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertNotIn('경고', result.stderr)
+
+        def report(name):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                return json.load(f)
+
+        community = report('community.json')
+        self.assertEqual(community['params']['posts'], 5)
+        self.assertEqual(set(community['scenarios']), {
+            'feed', 'feed_filtered', 'post_counts', 'post_detail', 'comment_detail', 'comment', 'like_post',
+            'like_comment',
+        })
+        for name, scenario in community['scenarios'].items():
+            self.assertEqual((name, scenario['requests'], scenario['errors']), (name, 1, 0))
+        scenarios = report('async.json')['scenarios']
+        self.assertEqual([scenarios[name]['errors'] for name in sorted(scenarios)], [0, 0, 0])
+
+        render = report('render.json')
+        self.assertEqual(render['params']['repeat'], 1)
+        self.assertEqual(set(render['serialize_ms']), {'post_serializer', 'fast_feed'})
+        self.assertIn('gzip', render['compression'])
+        # 벤치마크 DB는 임시 디렉터리에 만들었다가 지움
+        self.assertEqual(sorted(os.listdir(directory)), ['async.json', 'community.json', 'render.json'])
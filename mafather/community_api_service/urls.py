@@ -3,6 +3,8 @@ from . import views
 
 urlpatterns = [
     path('posts/', views.get_posts, name='post-list'),
+    path('posts/counts/', views.get_post_counts, name='post-counts'),
+    path('posts/batch/', views.batch_posts, name='post-batch'),
     path('posts/create/', views.create_post, name='post-create'),
     path('posts/<uuid:post_id>/', views.get_post, name='post-detail'),
     path('posts/<uuid:post_id>/like/', views.like_post, name='post-like'),
@@ -12,4 +14,13 @@ urlpatterns = [
     path('posts/<uuid:post_id>/comment/<uuid:comment_id>/delete/', views.delete_comment, name='comment-delete'),
     path('posts/<uuid:post_id>/comment/<uuid:comment_id>/edit/', views.edit_comment, name='comment-edit'),
     path('posts/<uuid:post_id>/comment/<uuid:comment_id>/reply/', views.reply_comment, name='comment-reply'),
+    path('comments/batch/', views.batch_comments, name='comment-batch'),
+    path('notifications/', views.get_notifications, name='notification-list'),
+    path('notifications/unread-count/', views.get_unread_notification_count, name='notification-unread-count'),
+    path('notifications/read/', views.read_notifications, name='notification-read'),
+    path('search/autocomplete/', views.search_autocomplete, name='search-autocomplete'),
+    # 비동기 조회 API (ASGI)
+    path('async/posts/', views.aget_posts, name='post-list-async'),
+    path('async/posts/<uuid:post_id>/', views.aget_post, name='post-detail-async'),
+    path('async/posts/<uuid:post_id>/comment/<uuid:comment_id>/', views.aget_comment, name='comment-detail-async'),
 ]
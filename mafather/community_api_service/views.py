@@ -1,16 +1,74 @@
 # community_api_service/views.py
+import uuid
+from functools import wraps
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.http import HttpResponse
 from rest_framework import viewsets
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import MethodNotAllowed, NotAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Post, Category, Like, Comment
-from .serializers import PostSerializer, CategorySerializer, CommentSerializer
+from mafather import cursors
+from mafather.db_router import read_from_replica
+from mafather.idempotency import idempotent
+from mafather.renderers import dumps
+from mafather.throttling import throttle
+from .models import Post, PostCounter, PostImage, Category, Comment
+from .serializers import PostSerializer, CategorySerializer, CommentSerializer, NotificationSerializer
+from .autocomplete import autocomplete_index
+from . import batch, conditional, feed, likes, notifications
+
+
+def post_queryset():
+    """게시글 조회용 queryset (작성자/카테고리/이미지를 미리 가져와 N+1 방지)"""
+    return (
+        Post.objects
+        .filter(deleted_at__isnull=True)
+        .select_related('category', 'user')
+        .prefetch_related(Prefetch('images', queryset=PostImage.objects.select_related('image')))
+    )
+
+
+def comment_queryset():
+    """댓글 조회용 queryset (작성자와 삭제되지 않은 답글을 미리 가져옴)"""
+    replies = Comment.objects.filter(deleted_at__isnull=True).select_related('user').order_by('created_at')
+    return (
+        Comment.objects
+        .filter(deleted_at__isnull=True)
+        .select_related('user')
+        .prefetch_related(Prefetch('replies', queryset=replies, to_attr='live_replies'))
+    )
+
+def filter_feed(posts, params):
+    """
+    피드 필터 (게시된 글만, post_type / category / unsolved=true)
+
+    각 조합은 posts_feed_*_idx 복합 인덱스의 앞쪽 컬럼과 정렬 순서에 맞춰져 있다.
+    잘못된 값이면 ValueError
+    """
+    posts = posts.filter(status='published')
+    post_type = params.get('post_type')
+    if post_type:
+        if post_type not in dict(Post.POST_TYPE_CHOICES):
+            raise ValueError('잘못된 게시물 타입입니다.')
+        posts = posts.filter(post_type=post_type)
+    category = params.get('category')
+    if category:
+        try:
+            posts = posts.filter(category_id=uuid.UUID(category))
+        except ValueError as e:
+            raise ValueError('잘못된 카테고리입니다.') from e
+    if params.get('unsolved') == 'true':
+        posts = posts.filter(is_solved=False)
+    return posts
 
 # 게시글 작성 API   
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])  # 로그인한 사용자만 접근 가능
+@throttle_classes([throttle('post_create')])
 def create_post(request):
-    serializer = PostSerializer(data=request.data)
+    serializer = PostSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         post = serializer.save(user=request.user)
         return Response(serializer.data, status=201)
@@ -18,50 +76,96 @@ def create_post(request):
 
 # 게시글 목록 조회 API
 @api_view(['GET'])
+@read_from_replica
 def get_posts(request):
-    posts = Post.objects.filter(deleted_at__isnull=True)  # 삭제되지 않은 게시글만
-    serializer = PostSerializer(posts, many=True)
-    return Response(serializer.data)
+    try:
+        posts = filter_feed(post_queryset(), request.query_params)  # 삭제되지 않은 게시글만
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    if request.query_params.get('sort') == 'hot':
+        return _hot_posts(request, posts)
+    return Response(feed.serialize_feed(posts))  # PostSerializer와 같은 형식의 읽기 전용 직렬화
+
+
+def _hot_posts(request, posts):
+    """인기순 목록 (hot_score 인덱스를 타는 keyset 커서 페이지네이션)"""
+    posts = posts.order_by('-hot_score', '-id')
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        try:
+            score, post_id = cursors.decode(cursor, float)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        posts = posts.filter(Q(hot_score__lt=score) | Q(hot_score=score, id__lt=post_id))
+
+    page_size = settings.COMMUNITY_HOT_PAGE_SIZE
+    rows = feed.feed_rows(posts[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        last = rows[page_size - 1]
+        next_cursor = cursors.encode(last['hot_score'], last['id'])
+    return Response({"results": feed.serialize_rows(rows[:page_size]), "next_cursor": next_cursor})
 
 # 게시글 상세 조회 API
 @api_view(['GET'])
+@read_from_replica
 def get_post(request, post_id):
+    # 변경이 없으면 직렬화/조회수 증가 없이 304 (conditional.py 참고)
+    etag = conditional.post_etag(post_id)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return response
     try:
-        post = Post.objects.get(id=post_id, deleted_at__isnull=True)
+        post = post_queryset().get(id=post_id)
         post.increment_view_count()  # 조회수 증가
         serializer = PostSerializer(post)
-        return Response(serializer.data)
+        return conditional.with_etag(Response(serializer.data), etag)
     except Post.DoesNotExist:
         return Response({"error": "게시글을 찾을 수 없습니다."}, status=404)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
-# 게시글 좋아요 API
+# 게시글 수 API (탭 배지용, post_counters 집계 테이블에서 읽음)
+@api_view(['GET'])
+@read_from_replica
+def get_post_counts(request):
+    post_types = {post_type: {"post_count": 0, "unsolved_count": 0} for post_type, _ in Post.POST_TYPE_CHOICES}
+    categories = []
+    total = 0
+    for counter in PostCounter.objects.order_by('category__order', 'category_id'):
+        post_types[counter.post_type]["post_count"] += counter.post_count
+        post_types[counter.post_type]["unsolved_count"] += counter.unsolved_count
+        categories.append({
+            "category": counter.category_id,
+            "post_type": counter.post_type,
+            "post_count": counter.post_count,
+            "unsolved_count": counter.unsolved_count,
+        })
+        total += counter.post_count
+    return Response({"total": total, "post_types": post_types, "categories": categories})
+
+# 게시글 일괄 조회 API (모바일 캐시 동기화)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
+def batch_posts(request):
+    try:
+        ids, since = batch.parse_request(request.data)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response(batch.fetch_posts(post_queryset(), ids, since))
+
+# 게시글 좋아요 API
+@api_view(['POST', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([throttle('like')])
+@idempotent
 def like_post(request, post_id):
+    """PUT: 좋아요, DELETE: 좋아요 취소 (멱등), POST: 토글"""
     try:
         post = Post.objects.get(id=post_id, deleted_at__isnull=True)
-        
-        # 이미 좋아요를 누른 경우
-        existing_like = Like.objects.filter(
-            user=request.user,
-            target_id=post_id,
-            target_type='post'
-        ).first()
-        
-        if existing_like:
-            existing_like.delete()
-            return Response({"message": "좋아요가 취소되었습니다."}, status=200)
-        
-        # 새로운 좋아요 생성
-        like = Like.objects.create(
-            user=request.user,
-            target_id=post_id,
-            target_type='post'
-        )
-        
-        return Response({"message": "좋아요가 등록되었습니다."}, status=201)
+        liked, changed = likes.apply(request, 'post', post_id)
+        return _like_response(post, liked, changed)
         
     except Post.DoesNotExist:
         return Response({"error": "게시글을 찾을 수 없습니다."}, status=404)
@@ -69,9 +173,21 @@ def like_post(request, post_id):
         # 디버깅을 위해 구체적인 오류 메시지 반환
         return Response({"error": f"서버 오류: {str(e)}"}, status=500)
 
+
+def _like_response(target, liked, changed):
+    """좋아요 요청 응답 (상태가 그대로면 쓰기 없이 현재 상태만 반환)"""
+    if changed:
+        target.refresh_from_db(fields=['like_count'])
+        message = "좋아요가 등록되었습니다." if liked else "좋아요가 취소되었습니다."
+    else:
+        message = "이미 좋아요를 누른 상태입니다." if liked else "좋아요를 누르지 않은 상태입니다."
+    data = {"message": message, "liked": liked, "like_count": target.like_count}
+    return Response(data, status=201 if liked and changed else 200)
+
 # 게시글 댓글 작성 API
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([throttle('comment_create')])
 def comment_post(request, post_id):
     try:
         post = Post.objects.get(id=post_id, deleted_at__isnull=True)
@@ -91,8 +207,7 @@ def comment_post(request, post_id):
         
         serializer = CommentSerializer(data=data)
         if serializer.is_valid():
-            comment = serializer.save(user=request.user)
-            post.update_comment_count()  # update_comment_count 메서드 사용
+            comment = serializer.save(user=request.user)  # 댓글 수는 Comment.save에서 갱신
             return Response(serializer.data, status=201)
         return Response(serializer.errors, status=400)
         
@@ -103,12 +218,17 @@ def comment_post(request, post_id):
 
 # 게시글 댓글 조회 API
 @api_view(['GET'])
+@read_from_replica
 def get_comment(request, post_id, comment_id):
+    etag = conditional.comment_etag(post_id, comment_id)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return response
     try:
         post = Post.objects.get(id=post_id, deleted_at__isnull=True)
-        comment = Comment.objects.get(id=comment_id, post=post, deleted_at__isnull=True)
+        comment = comment_queryset().get(id=comment_id, post=post)
         serializer = CommentSerializer(comment)
-        return Response(serializer.data)
+        return conditional.with_etag(Response(serializer.data), etag)
     except Post.DoesNotExist:
         return Response({"error": "게시글을 찾을 수 없습니다."}, status=404)
     except Comment.DoesNotExist:
@@ -116,33 +236,64 @@ def get_comment(request, post_id, comment_id):
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
-# 게시글 댓글 좋아요 API
+# 댓글 일괄 조회 API (모바일 캐시 동기화)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
+def batch_comments(request):
+    try:
+        ids, since = batch.parse_request(request.data)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response(batch.fetch_comments(comment_queryset(), ids, since))
+
+# 내 알림 목록 API (최근 갱신순, keyset 커서 페이지네이션, 기본은 읽지 않은 알림만)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_notifications(request):
+    unread_only = request.query_params.get('all') != 'true'
+    try:
+        items, next_cursor = notifications.page(
+            request.user.pk, request.query_params.get('cursor'), settings.NOTIFICATION_PAGE_SIZE, unread_only
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response({"results": NotificationSerializer(items, many=True).data, "next_cursor": next_cursor})
+
+# 읽지 않은 알림 수 API (캐시)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_unread_notification_count(request):
+    return Response({"unread_count": notifications.unread_count(request.user.pk)})
+
+# 알림 읽음 처리 API (ids가 없으면 전부)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def read_notifications(request):
+    ids = request.data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list):
+            return Response({"error": "ids는 목록이어야 합니다."}, status=400)
+        try:
+            ids = [uuid.UUID(str(value)) for value in ids]
+        except ValueError:
+            return Response({"error": "잘못된 ID가 있습니다."}, status=400)
+    updated = notifications.mark_read(request.user.pk, ids)
+    return Response({"updated": updated, "unread_count": notifications.unread_count(request.user.pk)})
+
+# 게시글 댓글 좋아요 API
+@api_view(['POST', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([throttle('like')])
+@idempotent
 def like_comment(request, post_id, comment_id):
+    """PUT: 좋아요, DELETE: 좋아요 취소 (멱등), POST: 토글"""
     try:
         post = Post.objects.get(id=post_id, deleted_at__isnull=True)
         comment = Comment.objects.get(id=comment_id, post=post, deleted_at__isnull=True)
-        
-        # 이미 좋아요를 누른 경우
-        existing_like = Like.objects.filter(
-            user=request.user,
-            target_id=comment_id,
-            target_type='comment'
-        ).first()
-        
-        if existing_like:
-            existing_like.delete()
-            return Response({"message": "좋아요가 취소되었습니다."}, status=200)
-        
-        # 새로운 좋아요 생성
-        Like.objects.create(
-            user=request.user,
-            target_id=comment_id,
-            target_type='comment'
-        )
-        
-        return Response({"message": "좋아요가 등록되었습니다."}, status=201)
+        liked, changed = likes.apply(request, 'comment', comment_id)
+        return _like_response(comment, liked, changed)
         
     except Post.DoesNotExist:
         return Response({"error": "게시글을 찾을 수 없습니다."}, status=404)
@@ -201,6 +352,7 @@ def edit_comment(request, post_id, comment_id):
 # 게시글 댓글 답글 API
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([throttle('comment_create')])
 def reply_comment(request, post_id, comment_id):
     try:
         post = Post.objects.get(id=post_id, deleted_at__isnull=True)
@@ -222,4 +374,90 @@ def reply_comment(request, post_id, comment_id):
     except Comment.DoesNotExist:
         return Response({"error": "부모 댓글을 찾을 수 없습니다."}, status=404)
     except Exception as e:
-        return Response({"error": str(e)}, status=500)
\ No newline at end of file
+        return Response({"error": str(e)}, status=500)
+
+# 검색어 자동완성 API
+@api_view(['GET'])
+def search_autocomplete(request):
+    query = request.query_params.get('q', '')
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        return Response({"error": "limit은 숫자여야 합니다."}, status=400)
+
+    if not query.strip():
+        return Response({"query": query, "suggestions": []})
+
+    suggestions = autocomplete_index.suggest(query, limit=max(limit, 1))
+    return Response({"query": query, "suggestions": suggestions})
+
+
+# 비동기 조회 API (ASGI)
+# Daphne에서 동기 뷰는 스레드 하나로 직렬화되므로, 조회 API는 비동기 ORM으로 이벤트 루프에서 처리한다.
+# 응답 형식은 동기 API와 같고, 인증은 세션 인증만 지원한다.
+
+def _json(data, status=200):
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def async_api_view(view):
+    """GET 전용 비동기 뷰 데코레이터 (로그인 확인)"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _json({"detail": str(MethodNotAllowed(request.method).detail)}, status=405)
+        user = await request.auser()
+        if not user.is_authenticated:
+            return _json({"detail": str(NotAuthenticated.default_detail)}, status=403)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+# 게시글 목록 조회 API (비동기)
+@async_api_view
+@read_from_replica
+async def aget_posts(request):
+    try:
+        posts = filter_feed(post_queryset(), request.GET)
+    except ValueError as e:
+        return _json({"error": str(e)}, status=400)
+    return _json(await feed.aserialize_rows(await feed.afeed_rows(posts)))
+
+
+# 게시글 상세 조회 API (비동기)
+@async_api_view
+@read_from_replica
+async def aget_post(request, post_id):
+    etag = await conditional.apost_etag(post_id)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return response
+    try:
+        post = await post_queryset().aget(id=post_id)
+        await post.aincrement_view_count()  # 조회수 증가
+        return conditional.with_etag(_json(PostSerializer(post).data), etag)
+    except Post.DoesNotExist:
+        return _json({"error": "게시글을 찾을 수 없습니다."}, status=404)
+    except Exception as e:
+        return _json({"error": str(e)}, status=500)
+
+
+# 게시글 댓글 조회 API (비동기)
+@async_api_view
+@read_from_replica
+async def aget_comment(request, post_id, comment_id):
+    etag = await conditional.acomment_etag(post_id, comment_id)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return response
+    try:
+        if not await Post.objects.filter(id=post_id, deleted_at__isnull=True).aexists():
+            raise Post.DoesNotExist
+        comment = await comment_queryset().aget(id=comment_id, post_id=post_id)
+        return conditional.with_etag(_json(CommentSerializer(comment).data), etag)
+    except Post.DoesNotExist:
+        return _json({"error": "게시글을 찾을 수 없습니다."}, status=404)
+    except Comment.DoesNotExist:
+        return _json({"error": "댓글을 찾을 수 없습니다."}, status=404)
+    except Exception as e:
+        return _json({"error": str(e)}, status=500)
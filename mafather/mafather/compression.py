@@ -0,0 +1,105 @@
+"""
+응답 압축 미들웨어
+
+Accept-Encoding에 따라 큰 JSON/텍스트 응답을 brotli(패키지가 설치된 경우) 또는 gzip으로 압축한다.
+RESPONSE_COMPRESSION_MIN_BYTES보다 작은 응답은 압축 비용이 더 커서 그대로 보낸다.
+"""
+import gzip
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript')
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 동적 응답용 (11은 정적 파일용으로 너무 느림)
+
+
+def _accepted_encodings(header):
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 목록"""
+    accepted = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+
+def choose_encoding(header):
+    """응답에 쓸 인코딩 (br > gzip, 압축하지 않으면 None)"""
+    accepted = _accepted_encodings(header or '')
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class ResponseCompressionMiddleware:
+    """큰 응답을 br/gzip으로 압축"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+
+        # 압축 여부가 Accept-Encoding에 따라 달라지므로 캐시에 알림
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # 바이트가 달라지므로 strong ETag는 weak로 바꿈 (Django GZipMiddleware와 동일)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,38 @@
+"""
+keyset 페이지네이션 커서
+
+(정렬 값, ID) 두 값을 JSON 배열로 만들어 URL-safe base64로 감싼다 (패딩 '=' 제외).
+정렬 값이 날짜/시간이면 ISO 문자열로 저장하고, 복원할 때 parse로 원래 타입으로 되돌린다.
+
+    next_cursor = cursors.encode(last.updated_at, last.id)
+    updated_at, row_id = cursors.decode(cursor)                       # 시간 (기본)
+    date, row_id = cursors.decode(cursor, datetime.date.fromisoformat)  # 날짜
+    score, row_id = cursors.decode(cursor, float)                     # 점수
+"""
+import base64
+import binascii
+import json
+import uuid
+
+from django.utils.dateparse import parse_datetime
+
+
+def encode(value, row_id):
+    """(정렬 값, ID) keyset 커서"""
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    raw = json.dumps([value, str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode(cursor, parse=parse_datetime):
+    """커서 복원 → (정렬 값, UUID). 잘못된 값이면 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        parsed = parse(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed, uuid.UUID(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError('잘못된 커서입니다.') from e
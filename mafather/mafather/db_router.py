@@ -0,0 +1,203 @@
+"""
+데이터베이스 라우팅 (primary / replica)
+
+- 쓰기는 항상 primary(default)로 보낸다.
+- 읽기는 @read_from_replica 로 표시한 조회 API에서만 replica로 보낸다.
+- 사용자가 쓰기를 하면 DB_REPLICA_STICKY_SECONDS 동안 그 사용자의 읽기를 primary에 고정해서
+  복제 지연 때문에 방금 쓴 글이 안 보이는 일이 없도록 한다 (read-your-writes).
+- replica로 읽는 조회 API 안의 쓰기(조회수 등)는 읽은 값을 저장하지 말고 ID로 찾아 F() 같은 상대 갱신만 한다.
+  replica에서 읽은 값은 뒤처져 있을 수 있어서 그대로 저장하면 primary의 최신 값을 되돌린다.
+"""
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.functional import SimpleLazyObject, empty
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_request_state = ContextVar('db_request_state', default=None)
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+class _RequestState:
+    """요청 단위 라우팅 상태"""
+
+    __slots__ = ('wrote',)
+
+    def __init__(self):
+        self.wrote = False
+
+
+def replica_alias():
+    """replica가 설정되어 있으면 그 별칭, 아니면 None"""
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return None
+    # 테스트에서는 replica가 default의 미러(TEST.MIRROR)가 되어 같은 DB를 가리키므로 primary만 사용
+    if _database_identity(REPLICA_ALIAS) == _database_identity(PRIMARY_ALIAS):
+        return None
+    return REPLICA_ALIAS
+
+
+def _database_identity(alias):
+    config = connections[alias].settings_dict
+    return (config['ENGINE'], str(config['NAME']), config.get('HOST'), config.get('PORT'))
+
+
+def _sticky_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+def _request_user_id(request):
+    """요청 처리 중 이미 인증된 사용자 ID (아직 평가되지 않은 lazy user는 DB를 건드리지 않도록 무시)"""
+    # DRF Request는 인증 결과를 원래 HttpRequest.user 에도 설정함
+    request = getattr(request, '_request', request)
+    user = request.__dict__.get('user')
+    if type(user) is SimpleLazyObject:
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None:
+        user = request.__dict__.get('_acached_user')
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def _record(name, alias):
+    with _stats_lock:
+        _stats[(alias, name)] += 1
+
+
+def connection_stats():
+    """별칭별 연결/라우팅 지표"""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    stats = {}
+    for alias, config in settings.DATABASES.items():
+        stats[alias] = {
+            'vendor': config['ENGINE'].rsplit('.', 1)[-1],
+            'conn_max_age': config.get('CONN_MAX_AGE', 0),
+            'connections_opened': snapshot.get((alias, 'connections_opened'), 0),
+            'reads_routed': snapshot.get((alias, 'reads_routed'), 0),
+            'writes_routed': snapshot.get((alias, 'writes_routed'), 0),
+        }
+    return stats
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _record('connections_opened', connection.alias)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='mafather.db_router.connection_created')
+
+
+class PrimaryReplicaRouter:
+    """primary/replica 라우터"""
+
+    def db_for_read(self, model, **hints):
+        alias = PRIMARY_ALIAS
+        if _replica_reads.get() and replica_alias():
+            state = _request_state.get()
+            if state is None or not state.wrote:
+                alias = REPLICA_ALIAS
+        _record('reads_routed', alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        # 조회 API 안의 부수적인 쓰기(조회수 등)는 read-your-writes 고정 대상에서 제외
+        if state is not None and not _replica_reads.get():
+            state.wrote = True
+        _record('writes_routed', PRIMARY_ALIAS)
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 primary의 복제본이므로 두 DB 사이의 관계는 같은 DB로 취급
+        allowed = {PRIMARY_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in allowed and obj2._state.db in allowed:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class DatabaseRoutingMiddleware:
+    """요청마다 라우팅 상태를 만들고, 쓰기가 있었던 사용자의 읽기를 일정 시간 primary에 고정"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = _RequestState()
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state.wrote and replica_alias():
+            user_id = _request_user_id(request)
+            if user_id is not None:
+                cache.set(_sticky_key(user_id), 1, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        state = _RequestState()
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state.wrote and replica_alias():
+            user_id = _request_user_id(request)
+            if user_id is not None:
+                await cache.aset(_sticky_key(user_id), 1, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+
+def read_from_replica(view):
+    """
+    조회 API의 읽기를 replica로 보내는 데코레이터
+
+    DRF의 @api_view 아래에 붙여서 인증이 끝난 request.user를 볼 수 있게 한다.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            user_id = _request_user_id(request) if replica_alias() else None
+            pinned = user_id is not None and await cache.aget(_sticky_key(user_id)) is not None
+            token = _replica_reads.set(not pinned)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        user_id = _request_user_id(request) if replica_alias() else None
+        pinned = user_id is not None and cache.get(_sticky_key(user_id)) is not None
+        token = _replica_reads.set(not pinned)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
@@ -0,0 +1,52 @@
+"""
+Idempotency-Key 헤더 처리
+
+모바일 클라이언트는 응답을 못 받으면 같은 요청을 다시 보낸다. 요청에 Idempotency-Key 헤더가 있으면
+(사용자, 메서드, 경로, 키)별로 첫 성공 응답(2xx)을 캐시에 저장해 두고, 같은 키로 다시 오면 view를
+실행하지 않고 저장한 응답을 돌려준다 (Idempotent-Replayed: true).
+
+같은 키의 요청이 동시에 들어오면 둘 다 실행될 수 있으므로 view 자체도 멱등이어야 한다.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def _cache_key(request, key):
+    digest = hashlib.sha256(f'{request.method}:{request.path}:{key}'.encode()).hexdigest()
+    return f'idempotency:{request.user.pk}:{digest}'
+
+
+def idempotent(view):
+    """DRF 함수 view용 (@api_view, @permission_classes 아래에 둔다)"""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"error": f"{HEADER}는 {MAX_KEY_LENGTH}자 이하여야 합니다."}, status=400)
+
+        cache_key = _cache_key(request, key)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            status_code, data = cached
+            response = Response(data, status=status_code)
+            response[REPLAYED_HEADER] = 'true'
+            return response
+
+        response = view(request, *args, **kwargs)
+        if 200 <= response.status_code < 300:
+            cache.set(cache_key, (response.status_code, response.data), settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+        return response
+
+    return wrapper
@@ -0,0 +1,281 @@
+"""
+요청 지표 수집
+
+URL 이름(post-list, post-detail, comment-like ...)별로 요청 처리 시간, SQL 쿼리 수, SQL 총 시간을
+고정 버킷 히스토그램에 기록하고 Prometheus 텍스트 형식으로 내보낸다.
+
+- 히스토그램은 스레드마다 따로 두고(기록할 때 락 없음) 수집(scrape) 시점에만 합친다.
+- SQL 계측은 DB 연결이 만들어질 때 execute_wrapper를 한 번만 붙이고, 현재 요청의 집계 대상은
+  ContextVar로 찾는다. 비동기 ORM이 다른 스레드에서 쿼리를 실행해도 같은 요청으로 집계된다.
+- 임계값(SLOW_QUERY_THRESHOLD_MS)을 넘는 쿼리는 정규화한 SQL과 호출 위치를 slow query 로그로 남긴다.
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+slow_query_logger = logging.getLogger('mafather.slow_query')
+
+
+def _log_linear_bounds(start, stop, steps_per_power=4):
+    """HDR 히스토그램과 비슷한 로그-선형 버킷 경계 (2의 거듭제곱 구간을 균등 분할)"""
+    bounds = []
+    low = start
+    while low < stop:
+        step = low / steps_per_power
+        for i in range(1, steps_per_power + 1):
+            bounds.append(round(low + step * i, 6))
+        low *= 2
+    return tuple(bounds)
+
+
+# 초 단위: 0.125ms 위 첫 경계 약 0.156ms ~ 마지막 경계 약 16.4초 (2배 구간마다 4칸)
+SECONDS_BOUNDS = _log_linear_bounds(0.000125, 16)
+# 요청당 쿼리 수
+QUERY_COUNT_BOUNDS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 25, 32, 50, 64, 100, 128, 256)
+
+
+class _Shard:
+    """한 스레드가 기록하는 히스토그램 모음 (키: (지표 이름, endpoint))"""
+
+    __slots__ = ('histograms',)
+
+    def __init__(self):
+        self.histograms = {}
+
+
+class HistogramRegistry:
+    """스레드별 샤드에 기록하고 수집 시점에 합치는 히스토그램 저장소"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self.bounds = {}
+
+    def register(self, name, bounds):
+        self.bounds[name] = bounds
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, name, endpoint, value):
+        histograms = self._shard().histograms
+        histogram = histograms.get((name, endpoint))
+        if histogram is None:
+            bounds = self.bounds[name]
+            # [버킷별 개수..., +Inf 개수, 합계, 전체 개수]
+            histogram = histograms[(name, endpoint)] = [0] * (len(bounds) + 3)
+        bounds = self.bounds[name]
+        histogram[bisect_left(bounds, value)] += 1
+        histogram[-2] += value
+        histogram[-1] += 1
+
+    def snapshot(self):
+        """{(지표 이름, endpoint): [버킷별 개수..., +Inf, 합계, 개수]} 합산 결과"""
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, histogram in list(shard.histograms.items()):
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(histogram)
+                else:
+                    for i, value in enumerate(histogram):
+                        total[i] += value
+        return merged
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.histograms.clear()
+
+
+registry = HistogramRegistry()
+registry.register('request_duration_seconds', SECONDS_BOUNDS)
+registry.register('db_queries_per_request', QUERY_COUNT_BOUNDS)
+registry.register('db_time_seconds', SECONDS_BOUNDS)
+
+HELP = {
+    'request_duration_seconds': '요청 처리 시간',
+    'db_queries_per_request': '요청당 SQL 쿼리 수',
+    'db_time_seconds': '요청당 SQL 실행 시간 합계',
+}
+
+
+class _RequestStats:
+    __slots__ = ('queries', 'db_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_current_stats = ContextVar('request_db_stats', default=None)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\(\?(?:\s*,\s*\?)+\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """리터럴과 파라미터를 ?로 바꾸고 IN 목록을 접어서 같은 형태의 쿼리를 하나로 묶음"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+_PROJECT_DIR = str(settings.BASE_DIR)
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _call_site():
+    """쿼리를 실행한 프로젝트 코드의 위치 (Django, 라이브러리 프레임은 건너뜀)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_PROJECT_DIR) and filename != _THIS_FILE and 'site-packages' not in filename:
+            return f'{os.path.relpath(filename, _PROJECT_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _instrument(execute, sql, params, many, context):
+    stats = _current_stats.get()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_query_logger.warning(
+                'slow query %.1fms [%s] %s',
+                elapsed * 1000, _call_site(), normalize_sql(sql),
+                extra={'duration_ms': elapsed * 1000, 'alias': context['connection'].alias},
+            )
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if _instrument not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_instrument)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='mafather.metrics.connection_created')
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or 'unnamed'
+
+
+def _observe(request, stats, start):
+    endpoint = _endpoint(request)
+    registry.observe('request_duration_seconds', endpoint, time.perf_counter() - start)
+    registry.observe('db_queries_per_request', endpoint, stats.queries)
+    registry.observe('db_time_seconds', endpoint, stats.db_time)
+
+
+class QueryMetricsMiddleware:
+    """요청 처리 시간과 SQL 쿼리 수/시간을 endpoint(URL 이름)별 히스토그램에 기록"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = _RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+            _observe(request, stats, start)
+
+    async def __acall__(self, request):
+        stats = _RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+            _observe(request, stats, start)
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+def render_prometheus():
+    """Prometheus 텍스트 형식(0.0.4)으로 모든 지표 출력"""
+    # 순환 import 방지를 위해 런타임 import
+    from .db_router import connection_stats
+
+    lines = []
+    snapshot = registry.snapshot()
+    for name, bounds in registry.bounds.items():
+        metric = f'mafather_{name}'
+        lines.append(f'# HELP {metric} {HELP[name]}')
+        lines.append(f'# TYPE {metric} histogram')
+        for (metric_name, endpoint), histogram in sorted(snapshot.items()):
+            if metric_name != name:
+                continue
+            label = f'endpoint="{_escape_label(endpoint)}"'
+            cumulative = 0
+            for bound, count in zip(bounds, histogram):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label},le="{_format_bound(bound)}"}} {cumulative}')
+            cumulative += histogram[len(bounds)]
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label}}} {histogram[-2]}')
+            lines.append(f'{metric}_count{{{label}}} {histogram[-1]}')
+
+    stats = connection_stats()
+    for key, help_text in (
+        ('connections_opened', 'DB 연결 생성 수'),
+        ('reads_routed', '읽기 라우팅 수'),
+        ('writes_routed', '쓰기 라우팅 수'),
+    ):
+        metric = f'mafather_db_{key}_total'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for alias, values in stats.items():
+            lines.append(f'{metric}{{alias="{_escape_label(alias)}"}} {values[key]}')
+
+    return '\n'.join(lines) + '\n'
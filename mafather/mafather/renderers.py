@@ -0,0 +1,64 @@
+"""
+orjson 기반 DRF renderer / parser
+
+DRF 기본 JSONRenderer(json 모듈 + JSONEncoder)보다 인코딩이 빠르고, UUID/datetime/date를 직접 처리한다.
+출력 형식은 DRF JSONRenderer와 같게 맞춘다 (공백 없는 compact 형식, 한글 그대로, UTC는 'Z').
+"""
+import datetime
+import decimal
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import JSONRenderer
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """orjson이 직접 처리하지 못하는 타입 (DRF JSONEncoder와 같은 규칙)"""
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return tuple(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        # numpy 배열/스칼라
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):
+        return tuple(obj)
+    raise TypeError(f'{type(obj).__name__} 타입은 JSON으로 변환할 수 없습니다.')
+
+
+def dumps(data, indent=False):
+    option = ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+    return orjson.dumps(data, default=_default, option=option)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer와 같은 media type/indent 협상, 인코딩만 orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # 브라우저블 API 등에서 indent를 요청한 경우만 들여쓰기 (orjson은 2칸만 지원)
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
+
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f'JSON parse error - {e}')
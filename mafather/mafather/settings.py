@@ -41,7 +41,6 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',  
     'django.contrib.messages',
-    'daphne',
     'django.contrib.staticfiles',
     'api_service',
     'chatbot',
@@ -51,7 +50,16 @@ INSTALLED_APPS = [
     'corsheaders', # CORS 처리
 ]
 
+# daphne 앱은 runserver를 ASGI 개발 서버로 바꾸는 용도라 DJANGO_DEV_ASGI=1일 때만 등록 (staticfiles 앞에 위치해야 함)
+# 등록하면 daphne.server와 twisted/autobahn/numpy를 모든 WSGI 워커와 관리 명령이 불러옴
+# 운영 ASGI 서버는 `daphne mafather.asgi:application`으로 실행하므로 필요 없음
+# 개발: DJANGO_DEV_ASGI=1 python manage.py runserver
+if os.getenv('DJANGO_DEV_ASGI') == '1':
+    INSTALLED_APPS.insert(INSTALLED_APPS.index('django.contrib.staticfiles'), 'daphne')
+
 MIDDLEWARE = [
+    'mafather.metrics.QueryMetricsMiddleware',  # 전체 처리 시간을 재기 위해 가장 바깥에 위치
+    'mafather.compression.ResponseCompressionMiddleware',  # 본문을 바꾸는 미들웨어보다 바깥에 위치
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS는 CommonMiddleware 앞에 위치
@@ -60,6 +68,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'mafather.db_router.DatabaseRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'mafather.urls'
@@ -88,26 +97,66 @@ ASGI_APPLICATION = 'mafather.asgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# MySQL 설정 (주석 처리)
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.mysql',
-#         'NAME': os.getenv('DB_NAME'),
-#         'USER': os.getenv('DB_USER'),
-#         'PASSWORD': os.getenv('DB_PASSWORD'),
-#         'HOST': os.getenv('DB_HOST'),
-#         'PORT': os.getenv('DB_PORT'),
-#     }
-# }
-
-# SQLite 설정 (테스트용)
+# 환경 변수로 DB를 구성한다.
+#   DB_ENGINE=mysql  : DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+#   DB_ENGINE=sqlite : DB_NAME (파일 경로, 기본값 db.sqlite3) - 로컬/테스트용
+# replica는 DB_REPLICA_HOST(mysql) 또는 DB_REPLICA_NAME(sqlite)이 있을 때만 추가되며,
+# 나머지 접속 정보는 지정하지 않으면 primary 값을 그대로 쓴다.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))  # 영구 연결 유지 시간 (초)
+
+
+def _database_config(prefix):
+    if DB_ENGINE == 'mysql':
+        config = {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': os.getenv(f'{prefix}_NAME', os.getenv('DB_NAME')),
+            'USER': os.getenv(f'{prefix}_USER', os.getenv('DB_USER')),
+            'PASSWORD': os.getenv(f'{prefix}_PASSWORD', os.getenv('DB_PASSWORD')),
+            'HOST': os.getenv(f'{prefix}_HOST', os.getenv('DB_HOST')),
+            'PORT': os.getenv(f'{prefix}_PORT', os.getenv('DB_PORT')),
+            'OPTIONS': {'charset': 'utf8mb4'},
+        }
+    else:
+        config = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(f'{prefix}_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    config['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    config['CONN_HEALTH_CHECKS'] = True  # 재사용 전에 끊어진 연결인지 확인
+    return config
+
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': _database_config('DB'),
 }
 
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = _database_config('DB_REPLICA')
+    # 테스트에서는 replica를 따로 만들지 않고 default를 그대로 사용
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['mafather.db_router.PrimaryReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = 5  # 쓰기 이후 해당 사용자의 읽기를 primary로 고정하는 시간
+
+# Cache
+# REDIS_URL이 있으면 Redis, 없으면 프로세스 메모리 캐시를 사용
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Custom User Model
 AUTH_USER_MODEL = 'api_service.User'
@@ -167,6 +216,19 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'mafather.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'mafather.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'TEST_REQUEST_RENDERER_CLASSES': [
+        'rest_framework.renderers.MultiPartRenderer',
+        'mafather.renderers.ORJSONRenderer',
+    ],
     'UNAUTHENTICATED_USER': None,
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler'
 }
@@ -202,4 +264,129 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
-]
\ No newline at end of file
+]
+
+# Channels 설정
+# REDIS_URL이 있으면 Redis로 워커 간 fan-out, 없으면 프로세스 메모리 레이어 (개발/테스트용)
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
+COMMUNITY_EVENT_COALESCE_SECONDS = 0.5  # 좋아요 수/댓글 수 이벤트를 구독자별로 합쳐 보내는 간격
+
+# Idempotency-Key 헤더로 받은 요청의 응답 보관 기간
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+
+# 사용자별 요청 빈도 제한 (mafather.throttling, '횟수/기간' - 기간은 s, m, h, d / None이면 제한 없음)
+RATE_LIMITS = {
+    'post_create': '10/m',
+    'comment_create': '30/m',
+    'like': '120/m',
+    'chat_turn': '20/m',
+}
+RATE_LIMIT_EXEMPT_STAFF = True
+
+# 답글/좋아요 알림 (community_api_service.notifications)
+NOTIFICATION_PAGE_SIZE = 20
+NOTIFICATION_DISPATCH_BATCH_SIZE = 500  # 발송기가 한 트랜잭션에서 처리할 아웃박스 행 수
+NOTIFICATION_DISPATCH_INTERVAL_SECONDS = 5  # dispatch_notifications --loop 주기
+NOTIFICATION_RECENT_ACTORS = 10  # 묶인 알림마다 기억하는 최근 행위자 수 (같은 사람 중복 제거용)
+NOTIFICATION_UNREAD_CACHE_SECONDS = 5 * 60
+
+# 인기 게시글 설정
+HOT_SCORE_DECAY_SECONDS = 45000  # 참여도 10배 = 12.5시간 늦게 쓴 글과 같은 점수
+COMMUNITY_HOT_PAGE_SIZE = 20
+
+# 모바일 동기화용 일괄 조회 API에서 한 번에 받을 수 있는 ID 수
+COMMUNITY_BATCH_MAX_IDS = 100
+
+# 자녀 발달 기록 타임라인 한 페이지 크기
+DEVELOPMENT_TIMELINE_PAGE_SIZE = 20
+
+# 채팅 세션 목록 / 메시지 기록 한 페이지 크기
+CHAT_SESSION_PAGE_SIZE = 20
+CHAT_MESSAGE_PAGE_SIZE = 50
+
+# 오래된 채팅 메시지 보관 (chatbot.archive) - 마지막 메시지 후 일수, 한 번에 고를 세션 수
+CHAT_ARCHIVE_AFTER_DAYS = int(os.getenv('CHAT_ARCHIVE_AFTER_DAYS', '90'))
+CHAT_ARCHIVE_BATCH_SIZE = 100
+
+# 분석용 컬럼 스냅샷 내보내기 (api_service.snapshots)
+ANALYTICS_EXPORT_ROOT = os.getenv('ANALYTICS_EXPORT_ROOT', os.path.join(BASE_DIR, 'analytics'))
+ANALYTICS_EXPORT_LAG_SECONDS = 300  # 아직 커밋되지 않은 트랜잭션을 놓치지 않도록 이만큼 이전까지만 내보냄
+ANALYTICS_EXPORT_ROWS_PER_FILE = 200_000
+
+# LLM 연동 (chatbot.llm, 패키지는 처음 호출할 때 불러옴)
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+LLM_CHAT_MODEL = os.getenv('LLM_CHAT_MODEL', 'gpt-4o-mini')
+LLM_EMBEDDING_MODEL = os.getenv('LLM_EMBEDDING_MODEL', 'text-embedding-3-small')
+LLM_TEMPERATURE = 0.3
+LLM_REQUEST_TIMEOUT_SECONDS = 30
+LLM_MAX_RETRIES = 2
+
+# LLM 토큰 한도 / 단가 (chatbot.ledger, 0이면 무제한)
+LLM_DAILY_TOKEN_QUOTA = int(os.getenv('LLM_DAILY_TOKEN_QUOTA', '200000'))
+LLM_MONTHLY_TOKEN_QUOTA = int(os.getenv('LLM_MONTHLY_TOKEN_QUOTA', '3000000'))
+LLM_TOKEN_PRICES = {  # 100만 토큰당 USD
+    'default': {'prompt': 0.15, 'completion': 0.60},
+}
+
+# 이정표 달성 월령 통계 (vectordb.analytics)
+MILESTONE_STATS_MAX_MONTHS = 72  # 히스토그램 마지막 칸 (이 개월 수 이상은 한 칸에)
+MILESTONE_STATS_MIN_SAMPLE = 20  # 표본이 이보다 적으면 API에서 통계를 보여주지 않음
+
+
+# 검색어 자동완성 설정
+AUTOCOMPLETE_TOP_K = 10  # 노드별로 미리 계산해 두는 추천어 수
+AUTOCOMPLETE_SEARCH_LOG_DAYS = 30  # 인기 검색어 집계 기간
+AUTOCOMPLETE_SEARCH_LOG_WEIGHT = 3  # 검색 1회당 가중치
+AUTOCOMPLETE_POST_TITLE_WEIGHT = 1  # 게시글 제목 1건당 가중치
+AUTOCOMPLETE_BACKGROUND_REFRESH = True
+AUTOCOMPLETE_REFRESH_SECONDS = 60  # 증분 갱신 주기
+AUTOCOMPLETE_FULL_REBUILD_SECONDS = 60 * 60  # 전체 재구축 주기
+
+
+# 요청 지표 / slow query 로그 설정
+SLOW_QUERY_THRESHOLD_MS = 100
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']  # /metrics/ 에 접근 가능한 IP (DEBUG에서는 제한 없음)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'mafather.slow_query': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+
+# 응답 압축 설정 (이보다 작은 응답은 그대로 전송)
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+
+
+# 이미지 업로드 / 변환 설정
+IMAGE_UPLOAD_MAX_BYTES = 15 * 1024 * 1024
+IMAGE_MAX_PIXELS = 50_000_000  # 압축 폭탄 방지 (가로 x 세로)
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)  # 목록 썸네일 / 본문 / 확대 보기
+# 변환 프로세스 수 (0이면 요청 스레드에서 바로 변환 - 테스트/개발용)
+IMAGE_PROCESS_WORKERS = int(os.getenv('IMAGE_PROCESS_WORKERS', '2'))
@@ -0,0 +1,501 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from api_service.models import User
+from community_api_service.models import Category, Post
+from . import cursors, db_router, throttling
+from .db_router import (
+    PrimaryReplicaRouter, DatabaseRoutingMiddleware, read_from_replica, connection_stats
+)
+from .metrics import registry, normalize_sql
+from .compression import ResponseCompressionMiddleware, choose_encoding
+from .renderers import ORJSONRenderer
+
+
+class DatabaseRouterTestCase(TestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = User(email='test@example.com', name='Test User')
+        cache.clear()
+
+    def make_request(self):
+        request = self.factory.get('/')
+        request.user = self.user
+        return request
+
+    def test_reads_use_primary_without_replica(self):
+        """replica가 없으면 조회 API도 primary를 사용하는지 테스트"""
+        @read_from_replica
+        def view(request):
+            return HttpResponse(self.router.db_for_read(User))
+
+        with mock.patch.object(db_router, 'replica_alias', return_value=None):
+            response = DatabaseRoutingMiddleware(view)(self.make_request())
+        self.assertEqual(response.content, b'default')
+
+    def test_replica_routing_and_read_your_writes(self):
+        """조회 API는 replica로, 쓰기 이후에는 같은 사용자의 읽기가 primary로 고정되는지 테스트"""
+        @read_from_replica
+        def read_view(request):
+            return HttpResponse(self.router.db_for_read(User))
+
+        def write_view(request):
+            self.router.db_for_write(User)
+            return HttpResponse(self.router.db_for_read(User))
+
+        with mock.patch.object(db_router, 'replica_alias', return_value='replica'):
+            self.assertEqual(self.router.db_for_read(User), 'default')  # 표시되지 않은 읽기
+            response = DatabaseRoutingMiddleware(read_view)(self.make_request())
+            self.assertEqual(response.content, b'replica')
+
+            response = DatabaseRoutingMiddleware(write_view)(self.make_request())
+            self.assertEqual(response.content, b'default')
+
+            response = DatabaseRoutingMiddleware(read_view)(self.make_request())
+            self.assertEqual(response.content, b'default')
+
+            # 다른 사용자는 고정되지 않음
+            other = self.make_request()
+            other.user = User(email='other@example.com', name='Other User')
+            response = DatabaseRoutingMiddleware(read_view)(other)
+            self.assertEqual(response.content, b'replica')
+
+    def test_side_effect_writes_in_read_views_do_not_pin(self):
+        """조회 API 안의 부수적인 쓰기(조회수)는 고정 대상이 아닌지 테스트"""
+        @read_from_replica
+        def read_view(request):
+            self.router.db_for_write(User)
+            return HttpResponse(self.router.db_for_read(User))
+
+        with mock.patch.object(db_router, 'replica_alias', return_value='replica'):
+            DatabaseRoutingMiddleware(read_view)(self.make_request())
+            response = DatabaseRoutingMiddleware(read_view)(self.make_request())
+            self.assertEqual(response.content, b'replica')
+
+    def test_db_stats_endpoint(self):
+        """DB 연결 지표 API 테스트"""
+        admin = User.objects.create_superuser(email='admin@example.com', password='testpass123', name='Admin')
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        response = client.get(reverse('db-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('default', response.data)
+        self.assertGreater(connection_stats()['default']['writes_routed'], 0)
+
+        client.force_authenticate(user=User.objects.create_user(email='user@example.com', password='x', name='User'))
+        self.assertEqual(client.get(reverse('db-stats')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+# primary/replica를 서로 다른 SQLite 파일로 설정한 별도 프로세스에서 실제 라우팅 확인
+# replica는 마이그레이션한 primary 파일의 복사본이고, 복사한 뒤 primary에만 쓴 글/카운트는 replica에 없다 (복제 지연)
+REPLICA_SCRIPT = """
+import json, shutil, sys
+import django
+django.setup()
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from api_service.models import User
+from community_api_service import ranking
+from community_api_service.models import Category, Post
+from mafather import db_router
+
+primary_name, replica_name = sys.argv[1:3]
+setup_test_environment()
+call_command('migrate', verbosity=0)
+writer = User.objects.create_user(email='writer@example.com', password='x', name='Writer')
+reader = User.objects.create_user(email='reader@example.com', password='x', name='Reader')
+category = Category.objects.create(name='카테고리', post_type='question')
+replicated = Post.objects.create(user=writer, category=category, title='복제된 글', content='내용', post_type='question')
+connections.close_all()
+shutil.copyfile(primary_name, replica_name)
+Post.objects.filter(id=replicated.id).update(view_count=10, like_count=2)
+Post.objects.create(user=writer, category=category, title='primary에만 있는 글', content='내용', post_type='question')
+
+def titles(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return sorted(post['title'] for post in client.get(reverse('post-list')).json())
+
+def routed():
+    return {alias: stats['reads_routed'] for alias, stats in db_router.connection_stats().items()}
+
+result = {
+    'replica_alias': db_router.replica_alias(),
+    'names': {alias: str(connections[alias].settings_dict['NAME']) for alias in ('default', 'replica')},
+    'unmarked_read': Post.objects.all().db,
+    'before_write': titles(writer),
+}
+client = APIClient()
+client.force_authenticate(user=writer)
+response = client.post(
+    reverse('post-create'),
+    {'title': '방금 쓴 글', 'content': '내용', 'category_id': str(category.id), 'post_type': 'question'},
+    format='json',
+)
+result['write_status'] = response.status_code
+result['written_to'] = sorted(Post.objects.using('default').values_list('title', flat=True))
+result['replica_rows'] = sorted(Post.objects.using('replica').values_list('title', flat=True))
+before = routed()
+result['after_write'] = titles(writer)
+after_writer = routed()
+result['other_user'] = titles(reader)
+after_reader = routed()
+result['writer_reads'] = {alias: after_writer[alias] - before[alias] for alias in before}
+result['reader_reads'] = {alias: after_reader[alias] - after_writer[alias] for alias in before}
+
+# replica에서 읽은 상세 조회의 조회수 증가는 primary 값에 더해야 함 (replica 값으로 덮어쓰지 않음)
+client = APIClient()
+client.force_authenticate(user=reader)
+before_detail = routed()
+detail = client.get(reverse('post-detail', args=[replicated.id]))
+after_detail = routed()
+primary_row = Post.objects.using('default').get(id=replicated.id)
+result['detail'] = {
+    'status': detail.status_code,
+    'replica_reads': after_detail['replica'] - before_detail['replica'],
+    'primary': [primary_row.view_count, primary_row.like_count],
+    'replica': Post.objects.using('replica').get(id=replicated.id).view_count,
+    'score_matches': abs(primary_row.hot_score - ranking.hot_score(2, 0, 11, primary_row.created_at)) < 1e-6,
+}
+print(json.dumps(result, ensure_ascii=False))
+"""
+
+
+class ReplicaRoutingEndToEndTestCase(SimpleTestCase):
+    """서로 다른 SQLite 파일 두 개로 primary/replica 분리와 read-your-writes 고정 확인"""
+
+    def test_two_sqlite_files(self):
+        """조회 API는 replica 파일을, 쓰기와 쓴 사용자의 다음 읽기는 primary 파일을 쓰는지 테스트"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        primary_name = os.path.join(directory, 'primary.sqlite3')
+        replica_name = os.path.join(directory, 'replica.sqlite3')
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE='mafather.settings', PYTHONPATH=str(settings.BASE_DIR),
+            DB_ENGINE='sqlite', DB_NAME=primary_name, DB_REPLICA_NAME=replica_name, REDIS_URL='',
+        )
+        env.setdefault('DJANGO_SECRET_KEY', 'replica-routing')
+        result = subprocess.run(
+            [sys.executable, '-c', REPLICA_SCRIPT, primary_name, replica_name],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(report['replica_alias'], 'replica')
+        self.assertEqual(report['names'], {'default': primary_name, 'replica': replica_name})
+        self.assertEqual(report['unmarked_read'], 'default')
+        # 조회 API는 복제 지연이 있는 replica 파일을 읽음
+        self.assertEqual(report['before_write'], ['복제된 글'])
+        # 쓰기는 primary 파일에만
+        self.assertEqual(report['write_status'], 201)
+        self.assertIn('방금 쓴 글', report['written_to'])
+        self.assertEqual(report['replica_rows'], ['복제된 글'])
+        # 쓴 사용자의 다음 읽기는 primary로 고정, 다른 사용자는 계속 replica
+        self.assertEqual(report['after_write'], ['primary에만 있는 글', '방금 쓴 글', '복제된 글'])
+        self.assertEqual(report['writer_reads']['replica'], 0)
+        self.assertGreater(report['writer_reads']['default'], 0)
+        self.assertEqual(report['other_user'], ['복제된 글'])
+        self.assertGreater(report['reader_reads']['replica'], 0)
+        # replica가 뒤처져 있어도 상세 조회는 primary의 조회수/좋아요 수를 되돌리지 않음
+        detail = report['detail']
+        self.assertEqual(detail['status'], 200)
+        self.assertGreater(detail['replica_reads'], 0)
+        self.assertEqual(detail['primary'], [11, 2])
+        self.assertEqual(detail['replica'], 0)
+        self.assertTrue(detail['score_matches'])
+
+
+class CursorTestCase(SimpleTestCase):
+    def test_round_trip(self):
+        """시간/날짜/점수 커서 복원 테스트"""
+        row_id = uuid.uuid4()
+        updated_at = datetime(2025, 3, 1, 12, 30, 0, 123456, tzinfo=dt_timezone.utc)
+        self.assertEqual(cursors.decode(cursors.encode(updated_at, row_id)), (updated_at, row_id))
+        self.assertEqual(
+            cursors.decode(cursors.encode(date(2025, 3, 1), row_id), date.fromisoformat),
+            (date(2025, 3, 1), row_id),
+        )
+        self.assertEqual(cursors.decode(cursors.encode(1.25, row_id), float), (1.25, row_id))
+        self.assertNotIn('=', cursors.encode(updated_at, row_id))
+
+    def test_invalid(self):
+        """잘못된 커서는 ValueError"""
+        for cursor in ('!!!', 'bm90IGpzb24', cursors.encode('not a time', uuid.uuid4()), cursors.encode(1.0, 'x')):
+            with self.assertRaises(ValueError):
+                cursors.decode(cursor)
+
+
+class QueryMetricsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        registry.reset()
+
+    def test_per_endpoint_histograms(self):
+        """URL 이름별 처리 시간/쿼리 수 히스토그램 기록 테스트"""
+        self.client.get(reverse('post-list'))
+        self.client.get(reverse('post-list'))
+
+        snapshot = registry.snapshot()
+        duration = snapshot[('request_duration_seconds', 'post-list')]
+        queries = snapshot[('db_queries_per_request', 'post-list')]
+        self.assertEqual(duration[-1], 2)
+        self.assertEqual(queries[-1], 2)
+        self.assertGreaterEqual(queries[-2], 2)  # 요청마다 최소 1개의 쿼리
+
+    def test_prometheus_endpoint(self):
+        """Prometheus 형식 지표 출력 테스트"""
+        self.client.get(reverse('post-list'))
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('# TYPE mafather_request_duration_seconds histogram', body)
+        self.assertIn('mafather_request_duration_seconds_count{endpoint="post-list"} 1', body)
+        self.assertIn('mafather_request_duration_seconds_bucket{endpoint="post-list",le="+Inf"} 1', body)
+        self.assertIn('mafather_db_reads_routed_total{alias="default"}', body)
+
+        with self.settings(DEBUG=False):
+            response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_slow_query_log(self):
+        """임계값을 넘는 쿼리의 slow query 로그 테스트"""
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0), self.assertLogs('mafather.slow_query', 'WARNING') as logs:
+            User.objects.filter(email__in=['a@example.com', 'b@example.com']).count()
+        self.assertIn('mafather/tests.py', logs.output[0])
+        self.assertIn('IN (...)', logs.output[0])
+
+    def test_normalize_sql(self):
+        """SQL 정규화 테스트"""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM posts WHERE id IN (%s, %s, %s) AND title = 'abc' LIMIT 21"),
+            'SELECT * FROM posts WHERE id IN (...) AND title = ? LIMIT ?'
+        )
+
+
+class ORJSONRenderingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_output_matches_drf_json_renderer(self):
+        """DRF JSONRenderer와 같은 바이트를 출력하는지 테스트"""
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'title': '한글 제목 "따옴표"',
+            'created_at': datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=dt_timezone.utc),
+            'score': Decimal('1.5'),
+            'tags': ['a', 'b'],
+            'nested': {'count': 3, 'empty': None, 'ok': True},
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_invalid_json_body(self):
+        """잘못된 JSON 본문이면 400을 반환하는지 테스트"""
+        response = self.client.post(
+            reverse('post-create'), data='{"title": ', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ResponseCompressionTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def respond(self, body, accept_encoding):
+        middleware = ResponseCompressionMiddleware(
+            lambda request: HttpResponse(body, content_type='application/json')
+        )
+        return middleware(self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_compresses_large_responses(self):
+        """큰 응답만 gzip으로 압축하는지 테스트"""
+        body = b'[' + b','.join(b'{"title": "post"}' for _ in range(200)) + b']'
+        with mock.patch('mafather.compression.brotli', None):
+            response = self.respond(body, 'gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.content), body)
+
+        response = self.respond(body, 'identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, body)
+
+        response = self.respond(b'{"title": "post"}', 'gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_choose_encoding(self):
+        """Accept-Encoding 협상 테스트"""
+        with mock.patch('mafather.compression.brotli', mock.Mock()):
+            self.assertEqual(choose_encoding('gzip, br'), 'br')
+            self.assertEqual(choose_encoding('gzip, br;q=0'), 'gzip')
+        with mock.patch('mafather.compression.brotli', None):
+            self.assertEqual(choose_encoding('br'), None)
+        self.assertEqual(choose_encoding('gzip;q=0'), None)
+        self.assertEqual(choose_encoding(None), None)
+
+
+# 앱 시작 시 불러오면 안 되는 무거운 패키지 (chatbot.llm 등에서 처음 쓸 때 불러옴)
+HEAVY_MODULES = (
+    'langchain', 'langchain_core', 'langchain_community', 'langchain_openai',
+    'openai', 'tiktoken', 'sqlalchemy', 'numpy', 'twisted',
+)
+STARTUP_RSS_BUDGET_MB = 150
+STARTUP_SCRIPT = """
+import json, resource, sys
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns  # 모든 앱의 views를 불러옴
+import mafather.wsgi, chatbot.llm, chatbot.ledger, chatbot.archive, vectordb.analytics, api_service.snapshots
+print(json.dumps({
+    'heavy': sorted(name for name in %r if name in sys.modules),
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+""" % (HEAVY_MODULES,)
+
+
+class StartupImportTestCase(SimpleTestCase):
+    """워커 시작 비용 벤치마크 (python -X importtime + 최대 RSS)"""
+
+    def test_startup_imports(self):
+        """앱 시작 시 LLM/분석용 패키지를 불러오지 않고 메모리 예산 안인지 테스트"""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='mafather.settings', PYTHONPATH=str(settings.BASE_DIR))
+        env.setdefault('DJANGO_SECRET_KEY', 'startup-benchmark')
+        env.pop('DJANGO_DEV_ASGI', None)  # 개발 서버용 daphne 앱 없이 측정
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        # importtime 출력: "import time: self [us] | cumulative | imported package" (최상위 import만 합산)
+        top_level = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or line.endswith('imported package'):
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if not name.startswith('  '):
+                top_level.append((int(cumulative), name.strip()))
+        slowest = ', '.join(f'{name} {us / 1000:.0f}ms' for us, name in sorted(top_level, reverse=True)[:5])
+        summary = (
+            f'import {sum(us for us, _ in top_level) / 1000:.0f}ms, RSS {report["rss_mb"]:.0f}MB, '
+            f'가장 느린 import: {slowest}'
+        )
+
+        self.assertEqual(report['heavy'], [], summary)
+        self.assertLess(report['rss_mb'], STARTUP_RSS_BUDGET_MB, summary)
+
+
+@override_settings(REDIS_URL=None, RATE_LIMITS={
+    'post_create': '2/m', 'comment_create': '2/m', 'like': '3/s', 'chat_turn': '1/h',
+})
+class ThrottlingTestCase(TestCase):
+    def setUp(self):
+        throttling.reset_store()
+        self.addCleanup(throttling.reset_store)
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='테스트 카테고리', post_type='question')
+
+    def test_gcra(self):
+        """기간 안에 횟수만큼 허용한 뒤 간격마다 하나씩 허용하는지 테스트"""
+        store = throttling.MemoryStore()
+        with mock.patch('mafather.throttling.time.monotonic', return_value=1000.0) as clock:
+            self.assertEqual([store.hit('key', 3, 60) for _ in range(3)], [0, 0, 0])
+            self.assertAlmostEqual(store.hit('key', 3, 60), 20)
+            self.assertEqual(store.hit('other', 3, 60), 0)
+            clock.return_value = 1020.0
+            self.assertEqual(store.hit('key', 3, 60), 0)
+            self.assertAlmostEqual(store.hit('key', 3, 60), 20)
+            clock.return_value = 1200.0
+            self.assertEqual([store.hit('key', 3, 60) for _ in range(3)], [0, 0, 0])
+
+    def test_gcra_real_clock(self):
+        """실제 시계에서도 첫 요청은 항상 허용하는지 테스트 (부동소수점 오차 회귀)"""
+        store = throttling.MemoryStore()
+        self.assertEqual({store.hit(f'key:{i}', 1, 60 * 60) for i in range(1000)}, {0})
+        self.assertEqual({store.hit(f'burst:{i % 50}', 3, 1) for i in range(150)}, {0})
+        self.assertGreater(store.hit('key:0', 1, 60 * 60), 0)
+
+    def test_create_post_throttled(self):
+        """사용자별로 글쓰기 횟수를 제한하는지 테스트 (SQL 없이 확인)"""
+        url = reverse('post-create')
+        data = {'title': '제목', 'content': '내용', 'category_id': str(self.category.id), 'post_type': 'question'}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, data, format='json').status_code, 201)
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Post.objects.count(), 2)
+
+        with self.assertNumQueries(0):
+            self.assertGreater(throttling.hit('post_create', self.user.pk), 0)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123', name='Other')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.post(url, data, format='json').status_code, 201)
+
+        other.is_staff = True
+        other.save(update_fields=['is_staff'])
+        for _ in range(3):
+            self.assertEqual(self.client.post(url, data, format='json').status_code, 201)
+
+    def test_like_throttle_scope(self):
+        """좋아요는 쓰기 요청만 세고 조회는 제한하지 않는지 테스트"""
+        post = Post.objects.create(
+            user=self.user, category=self.category, title='제목', content='내용', post_type='question'
+        )
+        url = reverse('post-like', args=[post.id])
+        statuses = [self.client.put(url).status_code for _ in range(4)]
+        self.assertEqual(statuses, [201, 200, 200, 429])
+        self.assertEqual(self.client.get(reverse('post-detail', args=[post.id])).status_code, 200)
+
+    def test_comment_and_reply_share_scope(self):
+        """댓글과 답글이 같은 댓글 작성 범위로 제한되는지 테스트"""
+        post = Post.objects.create(
+            user=self.user, category=self.category, title='제목', content='내용', post_type='question'
+        )
+        response = self.client.post(reverse('post-comment', args=[post.id]), {'content': '댓글'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        reply_url = reverse('comment-reply', args=[post.id, response.data['id']])
+        self.assertEqual(self.client.post(reply_url, {'content': '답글'}, format='json').status_code, 201)
+        response = self.client.post(reply_url, {'content': '답글'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_check(self):
+        """view 밖에서 쓰는 확인과 설정이 없는 범위 테스트"""
+        throttling.check('chat_turn', self.user.pk)
+        with self.assertRaises(Throttled):
+            throttling.check('chat_turn', self.user.pk)
+        self.assertEqual(throttling.hit('unknown', self.user.pk), 0)
+        self.assertEqual(throttling.parse_rate('30/min'), (30, 60))
+        self.assertIsNone(throttling.parse_rate(None))
@@ -0,0 +1,157 @@
+"""
+사용자별 요청 빈도 제한 (GCRA)
+
+글쓰기/댓글/좋아요/챗봇 턴처럼 쓰기 비용이 큰 요청을 범위(scope)별, 사용자별로 제한한다.
+RATE_LIMITS에 '횟수/기간'(s, m, h, d)으로 설정하고, 기간 안에 횟수만큼은 한꺼번에 보내도 되고
+그 뒤로는 (기간 / 횟수)마다 한 번씩 허용한다 (GCRA, 키 하나에 다음 허용 시각(TAT) 하나만 저장).
+확인은 키 하나를 읽고 쓰는 O(1) 연산이고 SQL DB는 건드리지 않는다.
+
+REDIS_URL이 있으면 Redis Lua 스크립트로 원자적으로 확인하고(Redis 서버 시간 기준),
+없으면 프로세스 메모리에서 확인한다 (개발/테스트용, 워커마다 따로 셈).
+
+    @api_view(['POST'])
+    @permission_classes([IsAuthenticated])
+    @throttle_classes([throttle('post_create')])
+    def create_post(request): ...
+
+view 밖(챗봇 턴 등)에서는 check(scope, user_id)를 부르면 된다. 제한에 걸리면 DRF Throttled(429, Retry-After).
+"""
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+# 메모리 저장소 키가 이 수를 넘으면 이미 지난 키를 정리
+MEMORY_PRUNE_THRESHOLD = 10_000
+
+# KEYS[1]: 키, ARGV[1]: 간격(ms), ARGV[2]: 기간(ms) → 허용이면 0, 아니면 기다릴 ms
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+if new_tat - now > period then
+    return new_tat - now - period
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return 0
+"""
+
+
+def parse_rate(rate):
+    """'10/m' → (횟수, 기간 초). 비어 있으면 None (제한 없음)"""
+    if not rate:
+        return None
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period[0]]
+
+
+def rate_for(scope):
+    return parse_rate(settings.RATE_LIMITS.get(scope))
+
+
+class MemoryStore:
+    """프로세스 메모리 GCRA (키 → 다음 허용 시각)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tats = {}
+
+    def hit(self, key, count, period):
+        """요청 한 번 → 허용이면 0, 아니면 기다릴 초 (Redis 스크립트와 같이 정수 ms로 계산)"""
+        # 실수 초로 계산하면 반올림 오차로 첫 요청도 기간을 넘었다고 판단할 수 있음
+        period_ms = period * 1000
+        interval = max(period_ms // count, 1)
+        with self._lock:
+            now = int(time.monotonic() * 1000)
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + interval
+            if new_tat - now > period_ms:
+                return (new_tat - now - period_ms) / 1000
+            self._tats[key] = new_tat
+            if len(self._tats) > MEMORY_PRUNE_THRESHOLD:
+                self._tats = {k: v for k, v in self._tats.items() if v > now}
+        return 0
+
+
+class RedisStore:
+    """Redis GCRA (Lua 스크립트 하나로 읽기/판단/쓰기)"""
+
+    def __init__(self, url):
+        import redis
+
+        self._script = redis.Redis.from_url(url).register_script(GCRA_SCRIPT)
+
+    def hit(self, key, count, period):
+        period_ms = period * 1000
+        wait_ms = self._script(keys=[key], args=[max(period_ms // count, 1), period_ms])
+        return int(wait_ms) / 1000
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RedisStore(settings.REDIS_URL) if settings.REDIS_URL else MemoryStore()
+    return _store
+
+
+def reset_store():
+    """카운터 저장소를 새로 만듦 (테스트용)"""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def hit(scope, ident):
+    """scope의 ident 요청 한 번 → 허용이면 0, 아니면 기다릴 초 (설정이 없으면 항상 0)"""
+    rate = rate_for(scope)
+    if rate is None:
+        return 0
+    return get_store().hit(f'throttle:{scope}:{ident}', *rate)
+
+
+def check(scope, user_id):
+    """view 밖에서 쓰는 확인 (제한에 걸리면 Throttled)"""
+    wait = hit(scope, user_id)
+    if wait:
+        raise Throttled(wait=wait)
+
+
+class ScopedGCRAThrottle(BaseThrottle):
+    """scope별 GCRA throttle (조회 요청과 staff는 제한하지 않음, 비로그인은 IP별)"""
+
+    scope = None
+
+    def allow_request(self, request, view):
+        self._wait = 0
+        if request.method in SAFE_METHODS:
+            return True
+        user = request.user
+        if user.is_authenticated and user.is_staff and settings.RATE_LIMIT_EXEMPT_STAFF:
+            return True
+        ident = user.pk if user.is_authenticated else f'ip:{self.get_ident(request)}'
+        self._wait = hit(self.scope, ident)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+def throttle(scope):
+    """@throttle_classes([throttle('post_create')])"""
+    return type(f'{scope.title().replace("_", "")}Throttle', (ScopedGCRAThrottle,), {'scope': scope})
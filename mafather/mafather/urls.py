@@ -14,10 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from . import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('system/db-stats/', views.db_stats, name='db-stats'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('api/', include('api_service.urls')),
     path('api/community/', include('community_api_service.urls')),
+    path('api/development/', include('vectordb.urls')),
+    path('api/chat/', include('chatbot.urls')),
 ]
+
+# 개발 서버에서 업로드 이미지 제공 (운영에서는 웹 서버가 MEDIA_ROOT를 직접 제공)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,20 @@
+# mafather/views.py
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .db_router import connection_stats
+from .metrics import render_prometheus
+
+# DB 연결 지표 조회 API (관리자 전용)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_stats(request):
+    return Response(connection_stats())
+
+# Prometheus 지표 API (스크래퍼가 인증 없이 호출하므로 허용된 IP만 접근 가능)
+def metrics(request):
+    if not settings.DEBUG and request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
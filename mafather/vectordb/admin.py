@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import DevelopmentRecord, DevelopmentRecordImage, DevelopmentMilestone, ChildMilestone
+from .models import DevelopmentRecord, DevelopmentRecordImage, DevelopmentMilestone, ChildMilestone, MilestoneAgeStats
 
 
 class DevelopmentRecordImageInline(admin.TabularInline):
@@ -18,7 +18,7 @@ class DevelopmentRecordAdmin(admin.ModelAdmin):
     list_filter = ['age_group', 'development_area', 'record_type', 'date', 'created_at']
     search_fields = ['title', 'description', 'child__name', 'user__name']
     ordering = ['-date', '-created_at']
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'age_group', 'created_at', 'updated_at']  # 연령 그룹은 저장 시 계산
     inlines = [DevelopmentRecordImageInline]
     
     fieldsets = (
@@ -40,9 +40,10 @@ class DevelopmentRecordImageAdmin(admin.ModelAdmin):
     search_fields = ['record__title']
     ordering = ['record', 'order']
     readonly_fields = ['id', 'created_at']
+    raw_id_fields = ['image']
     
     fieldsets = (
-        (None, {'fields': ('record', 'image_url', 'order')}),
+        (None, {'fields': ('record', 'image', 'image_url', 'order')}),
         ('시스템정보', {'fields': ('id', 'created_at', 'deleted_at')}),
     )
 
@@ -97,3 +98,16 @@ class ChildMilestoneAdmin(admin.ModelAdmin):
     def milestone_area(self, obj):
         return obj.milestone.get_development_area_display()
     milestone_area.short_description = '발달 영역'
+
+
+@admin.register(MilestoneAgeStats)
+class MilestoneAgeStatsAdmin(admin.ModelAdmin):
+    """이정표 달성 월령 통계 관리자 (compute_milestone_stats 명령으로 갱신)"""
+
+    list_display = ['milestone', 'sample_size', 'p25', 'p50', 'p75', 'p90', 'computed_at']
+    list_filter = ['milestone__age_group', 'milestone__development_area']
+    ordering = ['milestone__age_group', 'milestone__development_area', 'milestone__order']
+    readonly_fields = [
+        'milestone', 'sample_size', 'p10', 'p25', 'p50', 'p75', 'p90', 'histogram',
+        'source_count', 'source_updated_at', 'computed_at'
+    ]
@@ -0,0 +1,105 @@
+# vectordb/analytics.py
+"""
+이정표 달성 월령 통계 (코호트 분석)
+
+child_milestones 전체를 요청마다 user_children과 조인해서 집계하면 비싸므로,
+이 모듈의 refresh_milestone_stats()를 주기적으로 실행해서(manage.py compute_milestone_stats)
+이정표별 분포를 milestone_age_stats 요약 테이블에 저장해 두고 API는 한 행만 읽는다.
+
+증분 계산: 이정표별 (원본 행 수, 달성 기록과 자녀 중 최근 updated_at)을 GROUP BY 한 번으로 구해서
+저장된 값과 다른 이정표만 다시 계산한다 (달성 기록 추가/수정/삭제, 자녀 생년월일 수정/삭제 모두 감지).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from api_service import age
+from .models import ChildMilestone, DevelopmentMilestone, MilestoneAgeStats
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DAYS_PER_MONTH = 365.2425 / 12
+
+
+def _cohort_rows():
+    """통계에 쓰는 달성 기록 (삭제된 자녀 제외)"""
+    return ChildMilestone.objects.filter(child__deleted_at__isnull=True)
+
+
+def _source_versions():
+    """이정표별 (원본 행 수, 최근 수정 시간) - 자녀 수정(생년월일 변경)도 월령을 바꾸므로 함께 봄"""
+    rows = (
+        _cohort_rows()
+        .values('milestone_id')
+        .annotate(count=Count('id'), latest=Max('updated_at'), child_latest=Max('child__updated_at'))
+        .order_by()
+    )
+    return {
+        row['milestone_id']: (row['count'], max(row['latest'], row['child_latest']))
+        for row in rows
+    }
+
+
+def summarize(birth_dates, achieved_dates, max_months=None):
+    """
+    달성 월령 분포 계산 → MilestoneAgeStats 필드 dict
+
+    출생 전 날짜로 입력된 기록은 잘못된 값으로 보고 뺀다.
+    백분위는 일 단위 월령(소수), 히스토그램은 만 개월 수 기준이다.
+    """
+    import numpy as np
+
+    if max_months is None:
+        max_months = settings.MILESTONE_STATS_MAX_MONTHS
+    birth = np.asarray(birth_dates, dtype='datetime64[D]')
+    achieved = np.asarray(achieved_dates, dtype='datetime64[D]')
+    days = (achieved - birth).astype(np.int64)
+    valid = days >= 0
+    months = age.age_in_months_array(birth[valid], achieved[valid])
+
+    stats = {'sample_size': int(valid.sum())}
+    if stats['sample_size']:
+        values = np.percentile(days[valid] / DAYS_PER_MONTH, PERCENTILES)
+        stats.update({f'p{p}': round(float(value), 2) for p, value in zip(PERCENTILES, values)})
+        stats['histogram'] = np.bincount(np.minimum(months, max_months), minlength=max_months + 1).tolist()
+    else:
+        stats.update({f'p{p}': None for p in PERCENTILES})
+        stats['histogram'] = []
+    return stats
+
+
+def refresh_milestone_stats(full=False):
+    """바뀐 이정표(full이면 전부)의 통계를 다시 계산하고 갱신한 이정표 수 반환"""
+    versions = _source_versions()
+    stored = {
+        stats.milestone_id: (stats.source_count, stats.source_updated_at)
+        for stats in MilestoneAgeStats.objects.only('milestone_id', 'source_count', 'source_updated_at')
+    }
+    milestone_ids = set(DevelopmentMilestone.objects.values_list('id', flat=True))
+    stale = [
+        milestone_id for milestone_id in milestone_ids
+        if full or stored.get(milestone_id) != versions.get(milestone_id, (0, None))
+    ]
+    if not stale:
+        return 0
+
+    rows = {milestone_id: ([], []) for milestone_id in stale}
+    for milestone_id, birth_date, achieved_date in (
+        _cohort_rows().filter(milestone_id__in=stale)
+        .values_list('milestone_id', 'child__birth_date', 'achieved_date')
+        .iterator(chunk_size=5000)
+    ):
+        rows[milestone_id][0].append(birth_date)
+        rows[milestone_id][1].append(achieved_date)
+
+    with transaction.atomic():
+        for milestone_id, (birth_dates, achieved_dates) in rows.items():
+            count, latest = versions.get(milestone_id, (0, None))
+            MilestoneAgeStats.objects.update_or_create(
+                milestone_id=milestone_id,
+                defaults={
+                    **summarize(birth_dates, achieved_dates),
+                    'source_count': count,
+                    'source_updated_at': latest,
+                },
+            )
+    return len(stale)
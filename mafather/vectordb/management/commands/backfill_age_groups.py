@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from api_service import age
+from vectordb.models import DevelopmentRecord
+
+
+class Command(BaseCommand):
+    help = '자녀 생년월일과 기록 날짜로 발달 기록의 연령 그룹(age_group)을 다시 계산해서 고칩니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='한 번에 읽고 고칠 기록 수')
+        parser.add_argument('--dry-run', action='store_true', help='고치지 않고 대상 수만 출력')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        scanned = fixed = 0
+        last_id = None
+        while True:
+            # ID 순 keyset으로 끊어 읽어서 큰 테이블도 메모리/OFFSET 비용 없이 처리
+            records = DevelopmentRecord.objects.order_by('id')
+            if last_id is not None:
+                records = records.filter(id__gt=last_id)
+            rows = list(records.values_list('id', 'date', 'child__birth_date', 'age_group')[:batch_size])
+            if not rows:
+                break
+            ids, dates, birth_dates, current = zip(*rows)
+            groups = age.age_groups_array(age.age_in_months_array(birth_dates, dates))
+            changed = [
+                DevelopmentRecord(id=record_id, age_group=group)
+                for record_id, group, old in zip(ids, groups, current)
+                if group != old
+            ]
+            if changed and not options['dry_run']:
+                DevelopmentRecord.objects.bulk_update(changed, ['age_group'])
+            scanned += len(rows)
+            fixed += len(changed)
+            last_id = ids[-1]
+
+        if options['dry_run']:
+            self.stdout.write(f'기록 {scanned}건 중 연령 그룹이 다른 기록 {fixed}건')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'기록 {scanned}건 확인, 연령 그룹 {fixed}건 수정'))
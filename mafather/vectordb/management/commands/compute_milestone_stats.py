@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from vectordb.analytics import refresh_milestone_stats
+
+
+class Command(BaseCommand):
+    help = '이정표별 달성 월령 분포(백분위/히스토그램)를 계산해서 milestone_age_stats에 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='바뀌지 않은 이정표도 모두 다시 계산')
+
+    def handle(self, *args, **options):
+        count = refresh_milestone_stats(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'이정표 {count}개 통계 갱신'))
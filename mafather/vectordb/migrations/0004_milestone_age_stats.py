@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vectordb', '0003_development_timeline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MilestoneAgeStats',
+            fields=[
+                ('milestone', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='age_stats', serialize=False, to='vectordb.developmentmilestone', verbose_name='이정표')),
+                ('sample_size', models.IntegerField(default=0, verbose_name='표본 수')),
+                ('p10', models.FloatField(blank=True, null=True, verbose_name='10% 달성 월령')),
+                ('p25', models.FloatField(blank=True, null=True, verbose_name='25% 달성 월령')),
+                ('p50', models.FloatField(blank=True, null=True, verbose_name='50% 달성 월령')),
+                ('p75', models.FloatField(blank=True, null=True, verbose_name='75% 달성 월령')),
+                ('p90', models.FloatField(blank=True, null=True, verbose_name='90% 달성 월령')),
+                ('histogram', models.JSONField(default=list, verbose_name='월령별 달성 수')),
+                ('source_count', models.IntegerField(default=0, verbose_name='원본 행 수')),
+                ('source_updated_at', models.DateTimeField(blank=True, null=True, verbose_name='원본 최근 수정 시간')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='계산 시간')),
+            ],
+            options={
+                'verbose_name': '이정표 달성 월령 통계',
+                'verbose_name_plural': '이정표 달성 월령 통계들',
+                'db_table': 'milestone_age_stats',
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-19 07:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_service', '0003_uploaded_image_sha256'),
+        ('vectordb', '0004_milestone_age_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='developmentrecord',
+            index=models.Index(fields=['updated_at'], name='development_updated_c88e6d_idx'),
+        ),
+    ]
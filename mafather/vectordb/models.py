@@ -1,7 +1,8 @@
 import uuid
 from django.db import models
 from django.utils import timezone
-from api_service.models import User, UserChild
+from api_service import age
+from api_service.models import UploadedImage, User, UserChild
 
 
 class DevelopmentRecord(models.Model):
@@ -68,11 +69,24 @@ class DevelopmentRecord(models.Model):
             models.Index(fields=['user']),
             models.Index(fields=['child']),
             models.Index(fields=['date']),
+            models.Index(fields=['updated_at']),  # 분석 스냅샷 증분 내보내기 워터마크 (api_service.snapshots)
+            # 자녀별 타임라인 (최신순 keyset 페이지네이션, vectordb.timeline)
+            models.Index(fields=['child', 'deleted_at', '-date', '-id'], name='dev_records_timeline_idx'),
         ]
 
     def __str__(self):
         return f"{self.child.name} - {self.title} ({self.date})"
 
+    def save(self, *args, **kwargs):
+        # 연령 그룹은 자녀 생년월일과 기록 날짜로 계산 (직접 입력하지 않음)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'date', 'child', 'child_id'} & set(update_fields):
+            self.date = self._meta.get_field('date').to_python(self.date)
+            self.age_group = age.age_group(age.age_in_months(self.child.birth_date, self.date))
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'age_group'}
+        super().save(*args, **kwargs)
+
     def soft_delete(self):
         """소프트 삭제"""
         self.deleted_at = timezone.now()
@@ -89,6 +103,10 @@ class DevelopmentRecordImage(models.Model):
         related_name='images', 
         verbose_name='발달 기록'
     )
+    image = models.ForeignKey(
+        UploadedImage, on_delete=models.SET_NULL, blank=True, null=True,
+        related_name='record_images', verbose_name='업로드 이미지'
+    )
     image_url = models.URLField(verbose_name='이미지 URL')
     order = models.IntegerField(default=0, verbose_name='이미지 순서')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')
@@ -178,3 +196,39 @@ class ChildMilestone(models.Model):
 
     def __str__(self):
         return f"{self.child.name} - {self.milestone.title} ({self.achieved_date})"
+
+
+class MilestoneAgeStats(models.Model):
+    """이정표별 달성 월령 분포 (vectordb.analytics가 주기적으로 계산하는 요약 테이블)"""
+
+    milestone = models.OneToOneField(
+        DevelopmentMilestone, on_delete=models.CASCADE, primary_key=True,
+        related_name='age_stats', verbose_name='이정표'
+    )
+    sample_size = models.IntegerField(default=0, verbose_name='표본 수')
+    p10 = models.FloatField(blank=True, null=True, verbose_name='10% 달성 월령')
+    p25 = models.FloatField(blank=True, null=True, verbose_name='25% 달성 월령')
+    p50 = models.FloatField(blank=True, null=True, verbose_name='50% 달성 월령')
+    p75 = models.FloatField(blank=True, null=True, verbose_name='75% 달성 월령')
+    p90 = models.FloatField(blank=True, null=True, verbose_name='90% 달성 월령')
+    # 만 개월 수별 달성 자녀 수 ([0개월, 1개월, ...], 마지막 칸은 그 이상 전부)
+    histogram = models.JSONField(default=list, verbose_name='월령별 달성 수')
+    source_count = models.IntegerField(default=0, verbose_name='원본 행 수')
+    source_updated_at = models.DateTimeField(blank=True, null=True, verbose_name='원본 최근 수정 시간')
+    computed_at = models.DateTimeField(auto_now=True, verbose_name='계산 시간')
+
+    class Meta:
+        db_table = 'milestone_age_stats'
+        verbose_name = '이정표 달성 월령 통계'
+        verbose_name_plural = '이정표 달성 월령 통계들'
+
+    def __str__(self):
+        return f"{self.milestone.title} - 중앙값 {self.p50}개월 ({self.sample_size}명)"
+
+    def share_achieved_by(self, months):
+        """만 months개월까지 달성한 자녀 비율 (0~1, 표본이 없으면 None)"""
+        if not self.sample_size:
+            return None
+        if months < 0:
+            return 0.0
+        return sum(self.histogram[:months + 1]) / self.sample_size
@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from .models import DevelopmentMilestone, DevelopmentRecord, DevelopmentRecordImage
+
+class DevelopmentRecordImageSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DevelopmentRecordImage
+        fields = ['id', 'image_url', 'order', 'variants']
+
+    def get_variants(self, obj):
+        return obj.image.variant_urls() if obj.image else []
+
+class DevelopmentRecordSerializer(serializers.ModelSerializer):
+    images = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DevelopmentRecord
+        fields = [
+            'id', 'child', 'date', 'age_group', 'development_area', 'record_type',
+            'title', 'description', 'images', 'created_at', 'updated_at'
+        ]
+
+    def get_images(self, obj):
+        # 미리 가져온 삭제되지 않은 이미지가 있으면 추가 쿼리 없이 사용 (timeline.record_queryset 참고)
+        images = getattr(obj, 'live_images', None)
+        if images is None:
+            images = obj.images.filter(deleted_at__isnull=True).select_related('image')
+        return DevelopmentRecordImageSerializer(images, many=True).data
+
+class DevelopmentMilestoneSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DevelopmentMilestone
+        fields = ['id', 'title', 'description', 'age_group', 'development_area']
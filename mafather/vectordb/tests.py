@@ -1,3 +1,236 @@
-from django.test import TestCase
+import datetime
+import io
+import uuid
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api_service.models import User, UserChild
+from . import analytics
+from .models import ChildMilestone, DevelopmentMilestone, DevelopmentRecord, DevelopmentRecordImage, MilestoneAgeStats
+
+
+@override_settings(DEVELOPMENT_TIMELINE_PAGE_SIZE=2)
+class DevelopmentTimelineTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User'
+        )
+        self.child = UserChild.objects.create(user=self.user, name='첫째', birth_date=datetime.date(2024, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.records = [
+            self._record(datetime.date(2025, 3, 10), 'physical'),
+            self._record(datetime.date(2025, 3, 10), 'language'),
+            self._record(datetime.date(2025, 3, 2), 'language', record_type='observation'),
+            self._record(datetime.date(2025, 2, 20), None),
+            self._record(datetime.date(2025, 1, 5), 'physical'),
+        ]
+        deleted = self._record(datetime.date(2025, 3, 11), 'physical')
+        deleted.soft_delete()
+        DevelopmentRecordImage.objects.create(record=self.records[0], image_url='https://example.com/1.jpg', order=1)
+        DevelopmentRecordImage.objects.create(record=self.records[0], image_url='https://example.com/0.jpg', order=0)
+        DevelopmentRecordImage.objects.create(
+            record=self.records[0], image_url='https://example.com/x.jpg', deleted_at=timezone.now()
+        )
+
+    def _record(self, date, area, record_type='development_record'):
+        return DevelopmentRecord.objects.create(
+            user=self.user, child=self.child, date=date, age_group='12-18months',
+            development_area=area, record_type=record_type, title=f'{date} 기록', description='내용',
+        )
+
+    def _expected_order(self, records):
+        return [str(record.id) for record in sorted(records, key=lambda r: (r.date, r.id), reverse=True)]
+
+    def test_timeline_pages(self):
+        """최신순 keyset 페이지네이션과 삭제된 기록/이미지 제외 테스트"""
+        url = reverse('development-timeline', args=[self.child.id])
+        ids = []
+        cursor = None
+        while True:
+            # 자녀 확인 + 기록 + 이미지 prefetch
+            with self.assertNumQueries(3):
+                response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            ids += [item['id'] for item in data['results']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(ids, self._expected_order(self.records))
+
+        first = next(item for item in self.client.get(url).json()['results'] if item['id'] == str(self.records[0].id))
+        self.assertEqual([image['image_url'] for image in first['images']],
+                         ['https://example.com/0.jpg', 'https://example.com/1.jpg'])
+
+    def test_timeline_filters(self):
+        """발달 영역/기록 유형 필터 테스트"""
+        url = reverse('development-timeline', args=[self.child.id])
+        response = self.client.get(url, {'development_area': 'language'})
+        self.assertEqual([item['id'] for item in response.json()['results']],
+                         self._expected_order(self.records[1:3]))
+        response = self.client.get(url, {'record_type': 'observation'})
+        self.assertEqual([item['id'] for item in response.json()['results']], [str(self.records[2].id)])
+
+        for params in ({'development_area': 'unknown'}, {'record_type': 'unknown'}, {'cursor': 'invalid'}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_monthly_area_counts(self):
+        """월별/영역별 집계 테스트"""
+        url = reverse('development-summary', args=[self.child.id])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['months'], [
+            {'month': '2025-03', 'total': 3, 'areas': {'language': 2, 'physical': 1}},
+            {'month': '2025-02', 'total': 1, 'areas': {'unspecified': 1}},
+            {'month': '2025-01', 'total': 1, 'areas': {'physical': 1}},
+        ])
+        response = self.client.get(url, {'record_type': 'observation'})
+        self.assertEqual(response.json()['months'], [{'month': '2025-03', 'total': 1, 'areas': {'language': 1}}])
+
+    def test_other_users_child(self):
+        """다른 사용자의 자녀 기록은 조회할 수 없는지 테스트"""
+        other_user = User.objects.create_user(email='other@example.com', password='x', name='다른 사용자')
+        self.client.force_authenticate(user=other_user)
+        for name in ('development-timeline', 'development-summary'):
+            for child_id in (self.child.id, uuid.uuid4()):
+                response = self.client.get(reverse(name, args=[child_id]))
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AgeGroupTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.child = UserChild.objects.create(user=self.user, name='첫째', birth_date=datetime.date(2024, 1, 31))
+
+    def _record(self, date, **kwargs):
+        return DevelopmentRecord.objects.create(
+            user=self.user, child=self.child, date=date, title='기록', description='내용', **kwargs
+        )
+
+    def test_age_group_derived_on_save(self):
+        """저장할 때 생년월일과 기록 날짜로 연령 그룹을 계산하는지 테스트"""
+        record = self._record(datetime.date(2024, 4, 29), age_group='60months+')
+        self.assertEqual(record.age_group, '0-3months')
+        record.refresh_from_db()
+        self.assertEqual(record.age_group, '0-3months')
+
+        record.date = datetime.date(2025, 2, 1)
+        record.save(update_fields=['date'])
+        record.refresh_from_db()
+        self.assertEqual(record.age_group, '12-18months')
+
+        record = self._record('2024-04-30')
+        self.assertEqual(record.age_group, '3-6months')
+
+    def test_backfill(self):
+        """기존 기록의 연령 그룹 일괄 수정 테스트"""
+        records = [self._record(datetime.date(2024, 1, 31) + datetime.timedelta(days=40 * i)) for i in range(7)]
+        expected = {record.id: record.age_group for record in records}
+        DevelopmentRecord.objects.update(age_group='0-3months')
+
+        out = io.StringIO()
+        call_command('backfill_age_groups', '--batch-size', '3', '--dry-run', stdout=out)
+        self.assertIn('기록 7건 중 연령 그룹이 다른 기록 4건', out.getvalue())
+        self.assertEqual(set(DevelopmentRecord.objects.values_list('age_group', flat=True)), {'0-3months'})
+
+        call_command('backfill_age_groups', '--batch-size', '3', stdout=io.StringIO())
+        self.assertEqual(dict(DevelopmentRecord.objects.values_list('id', 'age_group')), expected)
+
+
+@override_settings(MILESTONE_STATS_MIN_SAMPLE=3)
+class MilestoneStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123', name='Test User')
+        self.milestone = DevelopmentMilestone.objects.create(
+            age_group='9-12months', development_area='physical', title='혼자 걷기', description='내용'
+        )
+        self.other_milestone = DevelopmentMilestone.objects.create(
+            age_group='9-12months', development_area='language', title='첫 단어', description='내용'
+        )
+        birth_date = datetime.date(2023, 1, 1)
+        # 10, 11, 11, 12, 14개월에 달성
+        self.children = []
+        for months in (10, 11, 11, 12, 14):
+            child = UserChild.objects.create(user=self.user, name=f'{months}개월', birth_date=birth_date)
+            achieved_date = datetime.date(2023 + (months // 12), months % 12 + 1, 5)
+            ChildMilestone.objects.create(child=child, milestone=self.milestone, achieved_date=achieved_date)
+            self.children.append(child)
+        # 출생 전 날짜는 잘못된 기록으로 제외
+        wrong = UserChild.objects.create(user=self.user, name='잘못된 기록', birth_date=birth_date)
+        ChildMilestone.objects.create(child=wrong, milestone=self.milestone, achieved_date=datetime.date(2022, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_summarize(self):
+        """백분위/히스토그램 계산 테스트"""
+        self.assertEqual(analytics.refresh_milestone_stats(), 2)
+        stats = MilestoneAgeStats.objects.get(milestone=self.milestone)
+        self.assertEqual(stats.sample_size, 5)
+        self.assertEqual(stats.source_count, 6)
+        self.assertEqual(stats.histogram[10:15], [1, 2, 1, 0, 1])
+        self.assertEqual(len(stats.histogram), 73)
+        self.assertTrue(10 <= stats.p10 <= stats.p50 <= stats.p90 <= 15)
+        self.assertAlmostEqual(stats.p50, 11.14, places=1)
+        self.assertEqual(stats.share_achieved_by(11), 0.6)
+        self.assertEqual(stats.share_achieved_by(-1), 0.0)
+
+        empty = MilestoneAgeStats.objects.get(milestone=self.other_milestone)
+        self.assertEqual((empty.sample_size, empty.p50, empty.histogram), (0, None, []))
+        self.assertIsNone(empty.share_achieved_by(11))
+
+    def test_incremental_refresh(self):
+        """바뀐 이정표만 다시 계산하는지 테스트"""
+        analytics.refresh_milestone_stats()
+        self.assertEqual(analytics.refresh_milestone_stats(), 0)
+
+        ChildMilestone.objects.filter(child=self.children[0]).delete()
+        self.assertEqual(analytics.refresh_milestone_stats(), 1)
+        self.assertEqual(MilestoneAgeStats.objects.get(milestone=self.milestone).sample_size, 4)
+
+        self.children[1].soft_delete()
+        self.assertEqual(analytics.refresh_milestone_stats(), 1)
+        self.assertEqual(MilestoneAgeStats.objects.get(milestone=self.milestone).sample_size, 3)
+
+        # 생년월일만 고쳐도 달성 월령이 바뀌므로 다시 계산
+        child = self.children[4]
+        child.birth_date = datetime.date(2023, 3, 1)
+        child.save()
+        self.assertEqual(analytics.refresh_milestone_stats(), 1)
+        self.assertEqual(MilestoneAgeStats.objects.get(milestone=self.milestone).histogram[12], 2)
+
+        out = io.StringIO()
+        call_command('compute_milestone_stats', '--full', stdout=out)
+        self.assertIn('이정표 2개 통계 갱신', out.getvalue())
+
+    def test_child_milestones_api(self):
+        """자녀 이정표 현황 API의 또래 통계 테스트"""
+        analytics.refresh_milestone_stats()
+        child = self.children[1]  # 11개월에 달성
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('child-milestones', args=[child.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['title']: item for item in response.json()['results']}
+
+        walking = results['혼자 걷기']
+        self.assertTrue(walking['achieved'])
+        self.assertEqual(walking['achieved_age_months'], 11)
+        self.assertEqual(walking['cohort']['sample_size'], 5)
+        self.assertEqual(walking['cohort']['achieved_by_age'], 0.6)
+
+        word = results['첫 단어']
+        self.assertFalse(word['achieved'])
+        self.assertIsNone(word['cohort'])  # 표본 부족
+
+        response = self.client.get(reverse('child-milestones', args=[child.id]), {'development_area': 'language'})
+        self.assertEqual([item['title'] for item in response.json()['results']], ['첫 단어'])
+        response = self.client.get(reverse('child-milestones', args=[child.id]), {'age_group': 'wrong'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
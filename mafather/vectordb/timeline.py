@@ -0,0 +1,74 @@
+# vectordb/timeline.py
+"""
+자녀별 발달 기록 타임라인
+
+목록은 (child, deleted_at, -date, -id) 복합 인덱스(dev_records_timeline_idx) 순서 그대로 읽는다.
+OFFSET 대신 마지막 행의 (date, id)를 커서로 넘겨서 페이지가 깊어져도 인덱스에서 바로 이어 읽는다.
+"""
+import datetime
+
+from django.db.models import Count, Prefetch, Q
+from django.db.models.functions import TruncMonth
+
+from mafather import cursors
+
+from .models import DevelopmentRecord, DevelopmentRecordImage
+
+UNSPECIFIED_AREA = 'unspecified'
+
+
+def record_queryset(child_id):
+    """자녀의 삭제되지 않은 기록 (이미지는 삭제되지 않은 것만 한 번에 미리 가져옴)"""
+    images = DevelopmentRecordImage.objects.filter(deleted_at__isnull=True).select_related('image')
+    return (
+        DevelopmentRecord.objects
+        .filter(child_id=child_id, deleted_at__isnull=True)
+        .prefetch_related(Prefetch('images', queryset=images, to_attr='live_images'))
+    )
+
+
+def filter_records(records, params):
+    """development_area / record_type 필터 (잘못된 값이면 ValueError)"""
+    area = params.get('development_area')
+    if area:
+        if area not in dict(DevelopmentRecord.DEVELOPMENT_AREA_CHOICES):
+            raise ValueError('잘못된 발달 영역입니다.')
+        records = records.filter(development_area=area)
+    record_type = params.get('record_type')
+    if record_type:
+        if record_type not in dict(DevelopmentRecord.RECORD_TYPE_CHOICES):
+            raise ValueError('잘못된 기록 유형입니다.')
+        records = records.filter(record_type=record_type)
+    return records
+
+
+def page(records, cursor, page_size):
+    """최신순 한 페이지 → (기록 목록, 다음 커서)"""
+    records = records.order_by('-date', '-id')
+    if cursor:
+        date, record_id = cursors.decode(cursor, datetime.date.fromisoformat)
+        records = records.filter(Q(date__lt=date) | Q(date=date, id__lt=record_id))
+    items = list(records[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        last = items[page_size - 1]
+        next_cursor = cursors.encode(last.date, last.id)
+    return items[:page_size], next_cursor
+
+
+def monthly_area_counts(records):
+    """월별/발달 영역별 기록 수 (GROUP BY 쿼리 한 번, 최신 월부터)"""
+    rows = (
+        records
+        .prefetch_related(None)
+        .annotate(month=TruncMonth('date'))
+        .values('month', 'development_area')
+        .annotate(count=Count('id'))
+        .order_by('-month', 'development_area')
+    )
+    months = {}
+    for row in rows:
+        month = months.setdefault(row['month'], {'month': row['month'].strftime('%Y-%m'), 'total': 0, 'areas': {}})
+        month['areas'][row['development_area'] or UNSPECIFIED_AREA] = row['count']
+        month['total'] += row['count']
+    return list(months.values())
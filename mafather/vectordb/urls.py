@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('children/<uuid:child_id>/records/', views.get_timeline, name='development-timeline'),
+    path('children/<uuid:child_id>/records/summary/', views.get_timeline_summary, name='development-summary'),
+    path('children/<uuid:child_id>/milestones/', views.get_child_milestones, name='child-milestones'),
+]
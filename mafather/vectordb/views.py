@@ -1,3 +1,97 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from api_service import age
+from api_service.models import UserChild
+from mafather.db_router import read_from_replica
+from . import timeline
+from .models import ChildMilestone, DevelopmentMilestone
+from .serializers import DevelopmentMilestoneSerializer, DevelopmentRecordSerializer
 
-# Create your views here.
+
+def _own_child_exists(request, child_id):
+    return UserChild.objects.filter(id=child_id, user=request.user, deleted_at__isnull=True).exists()
+
+# 자녀 발달 기록 타임라인 API (최신순, keyset 커서 페이지네이션)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_timeline(request, child_id):
+    if not _own_child_exists(request, child_id):
+        return Response({"error": "자녀 정보를 찾을 수 없습니다."}, status=404)
+    try:
+        records = timeline.filter_records(timeline.record_queryset(child_id), request.query_params)
+        items, next_cursor = timeline.page(
+            records, request.query_params.get('cursor'), settings.DEVELOPMENT_TIMELINE_PAGE_SIZE
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response({"results": DevelopmentRecordSerializer(items, many=True).data, "next_cursor": next_cursor})
+
+# 자녀 발달 기록 월별/영역별 집계 API
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_timeline_summary(request, child_id):
+    if not _own_child_exists(request, child_id):
+        return Response({"error": "자녀 정보를 찾을 수 없습니다."}, status=404)
+    try:
+        records = timeline.filter_records(timeline.record_queryset(child_id), request.query_params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response({"months": timeline.monthly_area_counts(records)})
+
+
+def _cohort_context(milestone, months):
+    """이정표 통계 요약과 months개월까지 달성한 자녀 비율 (표본이 적으면 None)"""
+    stats = getattr(milestone, 'age_stats', None)
+    if stats is None or stats.sample_size < settings.MILESTONE_STATS_MIN_SAMPLE:
+        return None
+    return {
+        "sample_size": stats.sample_size,
+        "p25": stats.p25,
+        "p50": stats.p50,
+        "p75": stats.p75,
+        "p90": stats.p90,
+        "achieved_by_age": round(stats.share_achieved_by(months), 3),
+    }
+
+# 자녀 이정표 달성 현황 API (또래 달성 월령 통계 포함, vectordb.analytics 참고)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@read_from_replica
+def get_child_milestones(request, child_id):
+    child = UserChild.objects.filter(id=child_id, user=request.user, deleted_at__isnull=True).first()
+    if child is None:
+        return Response({"error": "자녀 정보를 찾을 수 없습니다."}, status=404)
+
+    milestones = DevelopmentMilestone.objects.filter(is_active=True).select_related('age_stats')
+    for field in ('age_group', 'development_area'):
+        value = request.query_params.get(field)
+        if value:
+            if value not in dict(DevelopmentMilestone._meta.get_field(field).choices):
+                return Response({"error": f"잘못된 {field} 값입니다."}, status=400)
+            milestones = milestones.filter(**{field: value})
+
+    achieved = {
+        milestone_id: achieved_date
+        for milestone_id, achieved_date in ChildMilestone.objects.filter(child=child).values_list(
+            'milestone_id', 'achieved_date'
+        )
+    }
+    current_months = age.age_in_months(child.birth_date, timezone.localdate())
+    results = []
+    for milestone in milestones:
+        achieved_date = achieved.get(milestone.id)
+        # 달성했으면 달성 당시 월령, 아니면 현재 월령 기준으로 또래와 비교
+        months = age.age_in_months(child.birth_date, achieved_date) if achieved_date else current_months
+        results.append({
+            **DevelopmentMilestoneSerializer(milestone).data,
+            "achieved": achieved_date is not None,
+            "achieved_date": achieved_date,
+            "achieved_age_months": months if achieved_date else None,
+            "cohort": _cohort_context(milestone, months),
+        })
+    return Response({"age_months": current_months, "results": results})